@@ -12,33 +12,66 @@ Godot AI 游戏客户端 - HTTP REST API 网关
     # 指定场景
     python3 ai_game_client.py --scene res://src/Scenes/UI/MainGUI.tscn
 
+    # 实例池模式（一个网关管理 4 个 headless Godot 实例）
+    python3 ai_game_client.py --pool-size 4
+
+    # 快进模式（24 波回归测试：8 倍速，物理帧率同步提高，跳过视觉效果）
+    python3 ai_game_client.py --fast-forward 8
+
 HTTP API:
     POST /action
         请求: {"actions": [{"type": "start_wave"}]}
-        响应: {"event": "WaveStarted", ...} 或 {"event": "SystemCrash", ...}
+        响应: {"status": "ok", "action_id": "..."} 或 {"event": "SystemCrash", ...}
+
+        请求: {"actions": [...], "wait": true, "timeout": 5}
+        响应: {"status": "ok", "action_id": "...", "all_success": true,
+               "results": [{"type": "buy_unit", "success": true, ...}]}
+
+        请求: {"actions": [{"type": "set_game_speed", "time_scale": 8, "fast_forward": true}]}
+        运行中调整当前会话的游戏速度/快进
 
     GET /status
         响应: {"godot_running": true, "ws_connected": true, ...}
+
+    GET /observations?wait=5&min=1
+        长轮询: 有新观测立即返回，最多等待 wait 秒
+
+    GET /observations/stream
+        Server-Sent Events: 观测到达即推送
+
+    GET /events?wait=5  (需 --events)
+        响应: {"events": [{"event_type": "ShopRefreshed", "data": {...}, "text": "...", ...}]}
+
+    GET /state  (需 --state-block)
+        响应: {"gold": 150, "wave": 1, "core_hp": 500.0, "shop": [...], "bench": [...], "grid": {...}, ...}
+
+    实例池模式下，通过 ?session=<id> 或请求体 "session_id" 指定会话:
+    GET  /sessions                    列出所有会话
+    POST /sessions/acquire            租用一个空闲会话
+    POST /sessions/<id>/release       归还会话
+    POST /sessions/<id>/recycle       重启会话的 Godot 实例
+    POST /sessions/<id>/reset         测试场景之间复位游戏（原地 reset_game，必要时重启）
 """
 
 import asyncio
 import argparse
-import json
 import logging
+import os
 import sys
 import signal
 from pathlib import Path
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator
+from dataclasses import dataclass, field
 from datetime import datetime
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import websockets
-
-from ai_client.utils import find_two_free_ports
-from ai_client.godot_process import GodotProcess, CrashInfo
+from ai_client.utils import PortReservation, reserve_ports
+from ai_client.godot_pool import GodotPool
+from ai_client.obs_buffer import DropPolicy
+from ai_client.session_log import LogCompression
+from ai_client.state_block import HAS_NUMPY
 from ai_client.http_server import AIHTTPServer
 
 # 配置日志
@@ -57,6 +90,43 @@ class ClientConfig:
     visual_mode: bool
     godot_ws_port: int
     http_port: int
+    pool_size: int = 1
+    # 实例池模式下崩溃实例保留多少秒后自动回收
+    recycle_delay: float = 5.0
+    # 订阅 Godot 的结构化事件通道（GET /events）
+    structured_events: bool = False
+    # 每个会话观测缓冲区容量与溢出丢弃策略
+    obs_buffer_size: int = 10000
+    obs_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    # 是否把每条观测回显到 stdout
+    echo_observations: bool = True
+    # 会话日志目录（相对路径按当前工作目录解析）
+    log_dir: str = "logs"
+    # 会话日志轮转：单文件上限字节数、轮转间隔秒数（0=不按时间轮转）、保留分段数、压缩方式
+    log_max_bytes: int = 50 * 1024 * 1024
+    log_rotate_interval: float = 0
+    log_backups: int = 10
+    log_compression: LogCompression = LogCompression.GZIP
+    # Godot stdout 在内存中保留的行数；是否把更早的行溢出到磁盘
+    godot_output_lines: int = 20000
+    godot_output_spill: bool = False
+    # 同一 Godot 进程原地复位多少次后重启一次（0 表示不限）
+    max_resets: int = 20
+    # 快进倍率（0 表示不快进）：同步提高物理帧率，headless 下跳过视觉效果
+    fast_forward: float = 0.0
+    # AILogger 分类级别（如 "combat:off,net:warn"，空表示全部输出）与无颜色紧凑格式
+    godot_log_levels: str = ""
+    godot_log_compact: bool = False
+    # 共享内存状态块：Godot 每帧写入 tmpfs 上的定长文件，网关 mmap 后通过 GET /state 提供
+    state_block: bool = False
+    # 实例池中其余实例的 WebSocket 端口（不含 godot_ws_port）
+    extra_ws_ports: List[int] = field(default_factory=list)
+    # 解析参数时预留的端口 -> 占位套接字，对应服务完成绑定后释放
+    port_reservations: Dict[int, PortReservation] = field(default_factory=dict)
+
+    @property
+    def godot_ws_ports(self) -> List[int]:
+        return [self.godot_ws_port] + self.extra_ws_ports
 
 
 class AIGameClient:
@@ -64,52 +134,40 @@ class AIGameClient:
     AI 游戏客户端 - HTTP 网关 + WebSocket 桥接
 
     架构:
-    1. 启动 Godot 子进程（headless 或 GUI）
-    2. 建立 WebSocket 连接到 Godot
+    1. 启动 Godot 实例池（默认 1 个实例，headless 或 GUI）
+    2. 每个实例建立独立的 WebSocket 连接
     3. 启动 HTTP 服务器接收外部请求
-    4. 将 HTTP 请求转发到 WebSocket
-    5. 监控 Godot 崩溃，返回 SystemCrash 事件
+    4. 按 session_id 将 HTTP 请求转发到对应实例的 WebSocket
+    5. 监控各实例崩溃，返回 SystemCrash 事件；实例池模式下自动回收崩溃实例
     """
 
     def __init__(self, config: ClientConfig):
         self.config = config
-        self.godot: Optional[GodotProcess] = None
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.pool: Optional[GodotPool] = None
         self.http_server: Optional[AIHTTPServer] = None
         self._shutdown_event = asyncio.Event()
-        self._pending_response: Optional[asyncio.Future] = None
-        self._last_state: Optional[Dict] = None
-        self._ws_connected = False
-        self._obs_queue = asyncio.Queue()
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
-
-        # 初始化日志文件
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._log_dir = Path("logs")
-        self._log_dir.mkdir(exist_ok=True)
-        self._log_file = self._log_dir / f"ai_session_{timestamp}.log"
+
+        # 日志目录，每个会话一个日志文件
+        self._log_dir = Path(config.log_dir)
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        # 带上 PID：同一秒内启动的多个网关不会共用（并交错写入、互相轮转）同一个日志文件
+        self._log_prefix = f"ai_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
 
     async def run(self):
         """主运行循环"""
-        self._loop = asyncio.get_running_loop()
         try:
-            # 1. 启动 Godot
-            if not await self._start_godot():
+            # 1. 启动 Godot 实例池（含 WebSocket 连接）
+            if not await self._start_pool():
                 return False
 
-            # 2. 连接 WebSocket
-            if self.godot and not self.godot.has_crashed():
-                if not await self._connect_websocket():
-                    return False
-
-            # 3. 启动 HTTP 服务器
+            # 2. 启动 HTTP 服务器
             if not await self._start_http_server():
                 return False
 
-            # 4. 打印使用信息
+            # 3. 打印使用信息
             self._print_usage()
 
-            # 5. 等待关闭信号
+            # 4. 等待关闭信号
             await self._shutdown_event.wait()
 
             return True
@@ -122,75 +180,47 @@ class AIGameClient:
         finally:
             await self.cleanup()
 
-    async def _start_godot(self) -> bool:
-        """启动 Godot 进程"""
-        logger.info("启动 Godot 进程...")
+    async def _start_pool(self) -> bool:
+        """启动 Godot 实例池"""
+        # 单实例保持旧行为：崩溃后保留现场，不自动回收
+        recycle_delay = self.config.recycle_delay if self.config.pool_size > 1 else None
 
-        self.godot = GodotProcess(
+        self.pool = GodotPool(
+            size=self.config.pool_size,
             project_path=self.config.project_path,
             scene_path=self.config.scene_path,
-            ai_port=self.config.godot_ws_port,
+            godot_ws_ports=self.config.godot_ws_ports,
+            log_dir=self._log_dir,
+            log_prefix=self._log_prefix,
             visual_mode=self.config.visual_mode,
-            on_crash=self._on_godot_crash
+            recycle_delay=recycle_delay,
+            structured_events=self.config.structured_events,
+            buffer_size=self.config.obs_buffer_size,
+            drop_policy=self.config.obs_drop_policy,
+            echo=self.config.echo_observations,
+            log_options={
+                "max_bytes": self.config.log_max_bytes,
+                "rotate_interval": self.config.log_rotate_interval,
+                "backup_count": self.config.log_backups,
+                "compression": self.config.log_compression,
+            },
+            output_lines=self.config.godot_output_lines,
+            spill_output=self.config.godot_output_spill,
+            max_resets=self.config.max_resets,
+            fast_forward=self.config.fast_forward,
+            log_levels=self.config.godot_log_levels,
+            log_compact=self.config.godot_log_compact,
+            port_reservations=self.config.port_reservations,
+            state_block=self.config.state_block
         )
 
-        if not self.godot.start():
-            logger.error("Godot 进程启动失败")
+        if not await self.pool.start():
+            logger.error("Godot 实例池启动失败")
             return False
 
-        logger.info(f"Godot PID: {self.godot.process.pid}")
-        logger.info("等待 Godot 就绪...")
-
-        # 等待 WebSocket 服务器启动
-        if not self.godot.wait_for_ready(timeout=30):
-            # Check if it crashed instead of timing out
-            if self.godot.has_crashed():
-                logger.error("Godot 启动时崩溃")
-                # Do not return False immediately, so HTTP server can start and serve the crash
-            else:
-                logger.error("Godot 启动超时")
-                self.godot.kill()
-                return False
-
-        logger.info("Godot 已就绪")
+        logger.info(f"Godot 实例池已就绪 ({self.pool.size} 个实例)")
         return True
 
-    async def _connect_websocket(self) -> bool:
-        """建立 WebSocket 连接"""
-        uri = f"ws://127.0.0.1:{self.config.godot_ws_port}"
-        logger.info(f"连接 WebSocket: {uri}")
-
-        try:
-            self.websocket = await websockets.connect(uri)
-            self._ws_connected = True
-            logger.info("WebSocket 连接成功")
-
-            # 启动消息接收任务
-            asyncio.create_task(self._ws_receive_loop())
-
-            return True
-
-        except Exception as e:
-            logger.error(f"WebSocket 连接失败: {e}")
-            return False
-
-    async def _ws_receive_loop(self):
-        """WebSocket 消息接收循环"""
-        try:
-            async for message in self.websocket:
-                # 直接将所有收到的内容视为自然语言文本处理
-                print(message, flush=True)
-
-                # 放入文本流缓冲队列供轮询读取
-                self._obs_queue.put_nowait(message)
-
-        except websockets.exceptions.ConnectionClosed:
-            logger.info("WebSocket 连接已关闭")
-            self._ws_connected = False
-        except Exception as e:
-            logger.error(f"WebSocket 接收错误: {e}")
-            self._ws_connected = False
-
     async def _start_http_server(self) -> bool:
         """启动 HTTP 服务器"""
         self.http_server = AIHTTPServer(
@@ -198,105 +228,138 @@ class AIGameClient:
             port=self.config.http_port,
             action_handler=self._handle_action_request,
             status_handler=self._handle_status_request,
-            observations_handler=self._handle_observations_request
+            observations_handler=self._handle_observations_request,
+            sessions_handler=self._handle_sessions_request,
+            stream_handler=self._handle_stream_request,
+            events_handler=self._handle_events_request,
+            state_handler=self._handle_state_request
         )
 
-        if not await self.http_server.start():
+        started = await self.http_server.start()
+        # aiohttp 以 SO_REUSEADDR 绑定，可以在占位期间直接监听；绑定后不再需要占位
+        reservation = self.config.port_reservations.pop(self.config.http_port, None)
+        if reservation:
+            reservation.release()
+        if not started:
             return False
 
         logger.info(f"HTTP API: http://127.0.0.1:{self.config.http_port}")
         return True
 
-    async def _handle_action_request(self, actions: list) -> Dict[str, Any]:
-        """处理 HTTP action 请求"""
-        # 检查 Godot 是否已崩溃
-        if self.godot and self.godot.has_crashed():
-            crash_info = self.godot.get_crash_info()
-            return {
-                "event": "SystemCrash",
-                "error_type": crash_info.error_type,
-                "stack_trace": crash_info.stack_trace
-            }
-
-        # 检查 WebSocket 连接
-        if not self._ws_connected or not self.websocket:
-            return {
-                "event": "Error",
-                "error_message": "WebSocket not connected"
-            }
-
-        # 发送动作到 Godot
-        try:
-            message = {"actions": actions}
-            await self.websocket.send(json.dumps(message))
-            logger.info(f"发送动作: {len(actions)} 个")
-
-            # 立即返回成功，不等待游戏状态（状态由下行链路实时推送）
-            return {
-                "status": "ok",
-                "message": "Actions sent"
-            }
-
-        except Exception as e:
-            logger.error(f"发送动作失败: {e}")
-            return {
-                "event": "Error",
-                "error_message": str(e)
-            }
-
-    async def _handle_status_request(self) -> Dict[str, Any]:
-        """处理 HTTP status 请求"""
+    def _unknown_session(self, session_id: Optional[str]) -> Dict[str, Any]:
         return {
-            "godot_running": self.godot.is_running() if self.godot else False,
-            "ws_connected": self._ws_connected,
-            "http_port": self.config.http_port,
-            "godot_ws_port": self.config.godot_ws_port,
-            "visual_mode": self.config.visual_mode,
-            "crashed": self.godot.has_crashed() if self.godot else False
+            "event": "Error",
+            "error_message": f"未知会话: {session_id}"
         }
 
-    async def _handle_observations_request(self) -> Dict[str, Any]:
-        """处理 HTTP observations 请求"""
-        observations = []
-        while not self._obs_queue.empty():
-            try:
-                obs = self._obs_queue.get_nowait()
-                observations.append(obs)
-            except asyncio.QueueEmpty:
-                break
-
-        # 写入日志文件，保证日志文件里只有纯净的自然语言记录
-        if observations:
-            try:
-                with open(self._log_file, "a", encoding="utf-8") as f:
-                    for obs in observations:
-                        f.write(str(obs) + "\n")
-            except Exception as e:
-                logger.error(f"写入日志文件失败: {e}")
+    async def _handle_action_request(
+        self,
+        actions: list,
+        session_id: Optional[str] = None,
+        action_id: Optional[str] = None,
+        wait: bool = False,
+        timeout: float = 10.0
+    ) -> Dict[str, Any]:
+        """处理 HTTP action 请求（wait=True 时同步等待逐条执行结果）"""
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
+        return await session.send_actions(actions, action_id=action_id, wait=wait, timeout=timeout)
+
+    async def _handle_status_request(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """处理 HTTP status 请求"""
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
 
+        status = session.get_status()
+        status.update({
+            "http_port": self.config.http_port,
+            "visual_mode": self.config.visual_mode,
+            "pool_size": self.pool.size,
+        })
+        return status
+
+    async def _handle_observations_request(
+        self,
+        session_id: Optional[str] = None,
+        wait: float = 0.0,
+        min_count: int = 1
+    ) -> Dict[str, Any]:
+        """处理 HTTP observations 请求（wait > 0 时为长轮询）"""
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
+
+        if wait > 0:
+            observations = await session.wait_observations(wait, min_count)
+        else:
+            observations = session.drain_observations()
         return {
             "observations": observations
         }
 
-    def _on_godot_crash(self, crash_info: CrashInfo):
-        """Godot 崩溃回调"""
-        logger.error(f"Godot 崩溃: {crash_info.error_type}")
-
-        # 将错误信息格式化并推入队列
-        error_msg = (
-            f"【系统严重报错】检测到 Godot 引擎崩溃：\n"
-            f"错误类型：{crash_info.error_type}\n"
-            f"堆栈：\n{crash_info.stack_trace}"
-        )
-
-        # 因为在其它线程中调用，需要通过 call_soon_threadsafe 放入队列
-        if self._loop and not self._loop.is_closed():
-            self._loop.call_soon_threadsafe(self._obs_queue.put_nowait, error_msg)
+    async def _handle_events_request(
+        self,
+        session_id: Optional[str] = None,
+        wait: float = 0.0,
+        min_count: int = 1
+    ) -> Dict[str, Any]:
+        """处理 HTTP events 请求（wait > 0 时为长轮询）"""
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
+
+        if wait > 0:
+            events = await session.wait_events(wait, min_count)
         else:
-            self._obs_queue.put_nowait(error_msg)
+            events = session.drain_events()
+        return {
+            "events": [e.to_dict() for e in events]
+        }
 
-        # 这里不触发关闭，让外部可以通过 HTTP 获取到崩溃信息
-        # self._shutdown_event.set()
+    async def _handle_state_request(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """处理 HTTP state 请求：直接读取共享内存，不经过 Godot"""
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
+        return session.get_state()
+
+    def _handle_stream_request(self, session_id: Optional[str] = None) -> Optional[AsyncIterator[str]]:
+        """处理 SSE 观测流请求"""
+        session = self.pool.get(session_id)
+        if not session:
+            return None
+        return session.stream_observations()
+
+    async def _handle_sessions_request(self, op: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """处理实例池会话管理请求"""
+        if op == "list":
+            return {"sessions": self.pool.get_status()}
+
+        if op == "acquire":
+            session = self.pool.acquire()
+            if not session:
+                return {"event": "Error", "error_message": "没有空闲会话"}
+            return session.get_status()
+
+        session = self.pool.get(session_id)
+        if not session:
+            return self._unknown_session(session_id)
+
+        if op == "release":
+            self.pool.release(session.session_id)
+            return session.get_status()
+
+        if op == "recycle":
+            if not await session.recycle():
+                return {"event": "Error", "error_message": f"会话 {session.session_id} 重启失败"}
+            return session.get_status()
+
+        if op == "reset":
+            return await session.reset()
+
+        return {"event": "Error", "error_message": f"未知操作: {op}"}
 
     def _print_usage(self):
         """打印使用说明"""
@@ -306,12 +369,21 @@ class AIGameClient:
         print("=" * 60)
         print(f"【重要】外部 AI 交互端口配置：")
         print(f"HTTP 控制端口 (用于发送动作): {self.config.http_port}")
-        print(f"Godot WebSocket 端口 (内部使用): {self.config.godot_ws_port}")
-        print(f"\n日志文件已创建: {self._log_file}")
+        if self.pool.size == 1:
+            session = self.pool.default_session
+            print(f"Godot WebSocket 端口 (内部使用): {session.godot_ws_port}")
+            print(f"\n日志文件已创建: {session.log_file}")
+        else:
+            print(f"实例池大小: {self.pool.size}")
+            for session in self.pool.sessions.values():
+                print(f"  会话 {session.session_id}: WebSocket 端口 {session.godot_ws_port}，日志 {session.log_file}")
         print("\n使用示例:")
         print(f'  curl -X POST http://127.0.0.1:{self.config.http_port}/action \\')
         print('       -H "Content-Type: application/json" \\')
         print('       -d \'{"actions": [{"type": "start_wave"}]}\'')
+        if self.pool.size > 1:
+            print(f'  curl -X POST http://127.0.0.1:{self.config.http_port}/sessions/acquire')
+            print(f'  curl http://127.0.0.1:{self.config.http_port}/observations?session=1')
         print("\n按 Ctrl+C 停止")
         print("=" * 60 + "\n")
 
@@ -322,11 +394,12 @@ class AIGameClient:
         if self.http_server:
             await self.http_server.stop()
 
-        if self.websocket:
-            await self.websocket.close()
+        if self.pool:
+            await self.pool.stop()
 
-        if self.godot:
-            self.godot.kill()
+        for reservation in self.config.port_reservations.values():
+            reservation.release()
+        self.config.port_reservations.clear()
 
         logger.info("已清理")
 
@@ -365,27 +438,187 @@ def parse_args() -> ClientConfig:
     parser.add_argument(
         "--godot-port",
         type=int,
-        default=0,  # 0 表示自动分配
-        help="Godot WebSocket 端口 (0=自动分配)"
+        # 0 表示自动分配；并行运行器通过 AI_GODOT_PORT 为自行启动网关的脚本指定端口
+        default=int(os.environ.get("AI_GODOT_PORT", "0")),
+        help="Godot WebSocket 端口 (0=自动分配，默认取环境变量 AI_GODOT_PORT)"
+    )
+
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="订阅结构化 JSON 事件通道，通过 GET /events 读取"
+    )
+
+    parser.add_argument(
+        "--state-block",
+        action="store_true",
+        help="开启共享内存状态块：Godot 每帧写入定长二进制状态，通过 GET /state 或 StateBlock 零拷贝读取（需要 NumPy）"
+    )
+
+    parser.add_argument(
+        "--obs-buffer-size",
+        type=int,
+        default=10000,
+        help="每个会话观测缓冲区的最大条数，满后按丢弃策略处理 (默认: 10000)"
+    )
+
+    parser.add_argument(
+        "--obs-drop-policy",
+        choices=[p.value for p in DropPolicy],
+        default=DropPolicy.DROP_OLDEST.value,
+        help="观测缓冲区满时的丢弃策略 (默认: drop_oldest)"
+    )
+
+    parser.add_argument(
+        "--no-echo",
+        action="store_true",
+        help="不把收到的观测回显到 stdout（长时间无人值守运行时推荐）"
+    )
+
+    parser.add_argument(
+        "--log-dir",
+        # 并行运行器通过 AI_LOG_DIR 把自行启动网关的脚本的会话日志引到场景目录
+        default=os.environ.get("AI_LOG_DIR", "logs"),
+        help="会话日志目录 (默认取环境变量 AI_LOG_DIR，未设置时为 logs)"
+    )
+
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=50,
+        help="会话日志单文件大小上限（MB），超过后轮转 (默认: 50)"
+    )
+
+    parser.add_argument(
+        "--log-rotate-interval",
+        type=float,
+        default=0,
+        help="会话日志按时间轮转的间隔秒数，0 表示只按大小轮转 (默认: 0)"
+    )
+
+    parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=10,
+        help="每个会话保留的历史日志分段数 (默认: 10)"
+    )
+
+    parser.add_argument(
+        "--log-compress",
+        choices=[c.value for c in LogCompression],
+        default=LogCompression.GZIP.value,
+        help="历史日志分段的压缩方式，zstd 需安装 zstandard (默认: gzip)"
+    )
+
+    parser.add_argument(
+        "--godot-output-lines",
+        type=int,
+        default=20000,
+        help="每个 Godot 实例在内存中保留的最近输出行数，用于崩溃上下文 (默认: 20000)"
+    )
+
+    parser.add_argument(
+        "--godot-output-spill",
+        action="store_true",
+        help="把挤出内存窗口的 Godot 输出追加到 logs/<会话日志名>.godot.log"
+    )
+
+    parser.add_argument(
+        "--max-resets",
+        type=int,
+        default=20,
+        help="POST /sessions/<id>/reset 原地复位多少次后重启一次 Godot，0 表示不限 (默认: 20)"
+    )
+
+    parser.add_argument(
+        "--fast-forward",
+        type=float,
+        nargs="?",
+        const=8.0,
+        default=0.0,
+        metavar="SCALE",
+        help="快进模式：游戏速度与物理帧率同步提高 SCALE 倍，headless 下跳过视觉效果 (不带值时为 8，最大 32)"
+    )
+
+    parser.add_argument(
+        "--ai-log",
+        default="",
+        metavar="SPEC",
+        help="Godot 端 AILogger 分类级别，如 combat:off,net:warn；级别为 off/error/warn/info/debug，* 表示全部分类"
+    )
+
+    parser.add_argument(
+        "--ai-log-compact",
+        action="store_true",
+        help="Godot 端日志使用无 ANSI 颜色的紧凑格式（headless 长跑推荐）"
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=1,
+        help="Godot 实例池大小，>1 时启用实例池模式 (默认: 1)"
+    )
+
+    parser.add_argument(
+        "--recycle-delay",
+        type=float,
+        default=5.0,
+        help="实例池模式下崩溃实例保留多少秒后自动回收重启 (默认: 5.0)"
     )
 
     args = parser.parse_args()
 
-    # 分配端口
-    if args.http_port == 0 or args.godot_port == 0:
-        port1, port2 = find_two_free_ports()
-        http_port = args.http_port or port1
-        godot_port = args.godot_port or port2
-    else:
-        http_port = args.http_port
-        godot_port = args.godot_port
+    if args.pool_size < 1:
+        parser.error("--pool-size 必须 >= 1")
+    if args.obs_buffer_size < 1:
+        parser.error("--obs-buffer-size 必须 >= 1")
+    if args.godot_output_lines < 1:
+        parser.error("--godot-output-lines 必须 >= 1")
+    if args.max_resets < 0:
+        parser.error("--max-resets 必须 >= 0")
+    if args.fast_forward < 0 or args.fast_forward > 32:
+        parser.error("--fast-forward 必须在 0 到 32 之间")
+    if args.state_block and not HAS_NUMPY:
+        parser.error("--state-block 需要 NumPy (pip install numpy)")
+
+    # 分配端口：未指定的端口与实例池其余实例的端口一次性由内核分配，
+    # 并保持占位直到对应的 HTTP 服务 / Godot 完成绑定
+    needed = (args.http_port == 0) + (args.godot_port == 0) + (args.pool_size - 1)
+    reserved = reserve_ports(needed) if needed else []
+    port_reservations = {r.port: r for r in reserved}
+    free_ports = iter(r.port for r in reserved)
+
+    http_port = args.http_port or next(free_ports)
+    godot_port = args.godot_port or next(free_ports)
+    extra_ws_ports = list(free_ports)
 
     return ClientConfig(
         project_path=args.project,
         scene_path=args.scene,
         visual_mode=args.visual,
         godot_ws_port=godot_port,
-        http_port=http_port
+        http_port=http_port,
+        pool_size=args.pool_size,
+        recycle_delay=args.recycle_delay,
+        structured_events=args.events,
+        obs_buffer_size=args.obs_buffer_size,
+        obs_drop_policy=DropPolicy(args.obs_drop_policy),
+        echo_observations=not args.no_echo,
+        log_dir=args.log_dir,
+        log_max_bytes=int(args.log_max_mb * 1024 * 1024),
+        log_rotate_interval=args.log_rotate_interval,
+        log_backups=args.log_backups,
+        log_compression=LogCompression(args.log_compress),
+        godot_output_lines=args.godot_output_lines,
+        godot_output_spill=args.godot_output_spill,
+        max_resets=args.max_resets,
+        fast_forward=args.fast_forward,
+        godot_log_levels=args.ai_log,
+        godot_log_compact=args.ai_log_compact,
+        state_block=args.state_block,
+        extra_ws_ports=extra_ws_ports,
+        port_reservations=port_reservations
     )
 
 
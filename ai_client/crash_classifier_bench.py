@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+崩溃行分类器微基准
+
+在一份 Godot verbose 日志上逐行运行 stdout 监控线程使用的分类函数，
+统计每行平均耗时，用于跟踪 is_error_line 的开销。
+
+用法:
+    # 使用仓库自带的样本日志
+    python ai_client/crash_classifier_bench.py
+
+    # 使用自己录制的日志（godot --verbose --log-file <path>）
+    python ai_client/crash_classifier_bench.py --log logs/godot_verbose.log --lines 500000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client.utils import GODOT_ERROR_PATTERNS, classify_line, is_error_line
+
+DEFAULT_LOG = Path(__file__).parent / "fixtures" / "godot_verbose_sample.log"
+
+
+def load_lines(path: Path, target: int) -> List[str]:
+    """读取日志并循环复制到 target 行"""
+    lines = [line.rstrip("\n") for line in path.read_text(encoding="utf-8", errors="replace").splitlines()]
+    if not lines:
+        raise ValueError(f"日志为空: {path}")
+    if target <= len(lines):
+        return lines[:target] if target > 0 else lines
+    repeats = target // len(lines) + 1
+    return (lines * repeats)[:target]
+
+
+def legacy_is_error_line(line: str):
+    """旧实现：逐条尝试全部正则（作为对照）"""
+    for pattern, crash_type in GODOT_ERROR_PATTERNS:
+        if pattern.search(line):
+            return True, crash_type
+    return False, None
+
+
+def bench(name: str, fn: Callable[[str], object], lines: List[str], rounds: int) -> float:
+    """返回最快一轮的每行耗时（纳秒）"""
+    best: Optional[float] = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_line_ns = best / len(lines) * 1e9
+    print(f"  {name:<22} {per_line_ns:8.1f} ns/行   ({best * 1000:.1f} ms / {len(lines)} 行)")
+    return per_line_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="崩溃行分类器微基准")
+    parser.add_argument("--log", type=Path, default=DEFAULT_LOG, help="Godot verbose 日志路径")
+    parser.add_argument("--lines", type=int, default=200000, help="基准行数（日志不足时循环复制）")
+    parser.add_argument("--rounds", type=int, default=5, help="重复轮数，取最快一轮")
+    args = parser.parse_args()
+
+    lines = load_lines(args.log, args.lines)
+    hits = sum(1 for line in lines if classify_line(line) is not None)
+
+    print(f"日志: {args.log}")
+    print(f"行数: {len(lines)}，命中错误行: {hits}")
+    print()
+
+    legacy = bench("逐条正则 (旧)", legacy_is_error_line, lines, args.rounds)
+    current = bench("is_error_line", is_error_line, lines, args.rounds)
+    bench("classify_line", classify_line, lines, args.rounds)
+
+    print()
+    print(f"加速比: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
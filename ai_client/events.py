@@ -0,0 +1,103 @@
+"""结构化游戏事件 - 与自然语言文本流并行的 JSON 事件通道
+
+Godot 端 NarrativeLogger / AIManager 在广播战报文本的同时，若客户端订阅了事件，
+还会发送一个 JSON 帧：
+
+    {"type": "event", "event_type": "ShopRefreshed", "data": {...}, "text": "【商店刷新】..."}
+
+消费方直接读取 data 字段，不再需要用正则解析中文文本。
+"""
+import time
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+
+class EventType(Enum):
+    """已知的事件类型（与 Godot 端 event_type 字符串一一对应）"""
+    WAVE_STARTED = "WaveStarted"            # data: wave
+    WAVE_ENDED = "WaveEnded"                # data: wave
+    CORE_DAMAGED = "CoreDamaged"            # data: damage, health, max_health
+    CORE_HEALTH_LOW = "CoreHealthLow"       # data: health, max_health
+    STATE_SYNC = "StateSync"                # data: health, max_health
+    ENEMY_DIED = "EnemyDied"                # data: enemy_type, max_hp
+    BOSS_SPAWNED = "BossSpawned"            # data: enemy_type
+    SHOP_REFRESHED = "ShopRefreshed"        # data: shop_units, shop_costs
+    UNIT_PURCHASED = "UnitPurchased"        # data: unit_key, zone, pos
+    UNIT_DEPLOYED = "UnitDeployed"          # data: unit_key, pos
+    UNIT_MOVED = "UnitMoved"                # data: unit_key, pos
+    UNIT_TRANSFERRED = "UnitTransferred"    # data: unit_key, from, to
+    UNIT_SOLD = "UnitSold"                  # data: zone, pos, gold_refund
+    UNIT_DEVOURED = "UnitDevoured"          # data: eater, eaten
+    GAME_OVER = "GameOver"                  # data: wave
+    UNKNOWN = "Unknown"
+
+
+@dataclass
+class GameEvent:
+    """一条结构化游戏事件"""
+    event_type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    text: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def type(self) -> EventType:
+        """事件类型枚举，未知类型返回 EventType.UNKNOWN"""
+        try:
+            return EventType(self.event_type)
+        except ValueError:
+            return EventType.UNKNOWN
+
+    @classmethod
+    def from_frame(cls, frame: Dict[str, Any]) -> "GameEvent":
+        """从 Godot 发来的 {"type": "event", ...} 帧构建事件"""
+        data = frame.get("data")
+        return cls(
+            event_type=str(frame.get("event_type", "")),
+            data=data if isinstance(data, dict) else {},
+            text=str(frame.get("text", "")),
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GameEvent":
+        """从 to_dict() / GET /events 的返回值还原事件"""
+        return cls(
+            event_type=d.get("event_type", ""),
+            data=d.get("data") or {},
+            text=d.get("text", ""),
+            timestamp=d.get("timestamp", time.time()),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "event_type": self.event_type,
+            "data": self.data,
+            "text": self.text,
+            "timestamp": self.timestamp,
+        }
+
+
+def filter_events(events: List[GameEvent], event_type: EventType) -> List[GameEvent]:
+    """按类型筛选事件"""
+    return [e for e in events if e.type == event_type]
+
+
+def latest_core_health(events: List[GameEvent]) -> Optional[float]:
+    """从事件中取最近一次的核心血量（替代对【核心受击】/【状态同步】文本的正则解析）"""
+    for event in reversed(events):
+        if event.type in (EventType.CORE_DAMAGED, EventType.CORE_HEALTH_LOW, EventType.STATE_SYNC):
+            health = event.data.get("health")
+            if health is not None:
+                return float(health)
+    return None
+
+
+def latest_wave(events: List[GameEvent]) -> Optional[int]:
+    """从事件中取最近一次的波次号"""
+    for event in reversed(events):
+        if event.type in (EventType.WAVE_STARTED, EventType.WAVE_ENDED, EventType.GAME_OVER):
+            wave = event.data.get("wave")
+            if wave is not None:
+                return int(wave)
+    return None
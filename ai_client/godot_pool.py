@@ -0,0 +1,767 @@
+"""Godot 实例池 - 单个 HTTP 网关管理多个 Godot 会话"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any, List, AsyncIterator
+
+import websockets
+
+from ai_client.utils import PortReservation, reserve_port
+from ai_client.godot_process import GodotProcess, CrashInfo
+from ai_client.events import GameEvent
+from ai_client.obs_buffer import ObservationBuffer, DropPolicy, observation_priority
+from ai_client.session_log import SessionLogWriter
+from ai_client.state_block import StateBlock, default_state_dir
+
+logger = logging.getLogger(__name__)
+
+
+class GodotSession:
+    """
+    单个 Godot 会话
+
+    每个会话独占：
+    - 一个 GodotProcess（独立的 ai_port）
+    - 一条到 Godot 的 WebSocket 连接
+    - 一个观测队列、一个结构化事件队列和一个会话日志文件
+
+    会话之间互不共享状态，某个实例崩溃只影响它自己。
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        project_path: str,
+        scene_path: str,
+        godot_ws_port: int,
+        log_file: Path,
+        visual_mode: bool = False,
+        ready_timeout: float = 30.0,
+        structured_events: bool = False,
+        buffer_size: int = 10000,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        echo: bool = True,
+        log_options: Optional[Dict[str, Any]] = None,
+        output_lines: int = GodotProcess.OUTPUT_BUFFER_LINES,
+        spill_output: bool = False,
+        max_resets: int = 0,
+        fast_forward: float = 0.0,
+        log_levels: str = "",
+        log_compact: bool = False,
+        port_reservation: Optional[PortReservation] = None,
+        state_block: bool = False
+    ):
+        self.session_id = session_id
+        self.project_path = project_path
+        self.scene_path = scene_path
+        self.godot_ws_port = godot_ws_port
+        # godot_ws_port 的占位套接字，Godot 开始监听（或启动失败）后释放
+        self.port_reservation = port_reservation
+        self.log_file = log_file
+        # 日志由后台任务批量写盘，log_options 透传给 SessionLogWriter（轮转/压缩参数）
+        self.log_writer = SessionLogWriter(log_file, **(log_options or {}))
+        self.visual_mode = visual_mode
+        self.ready_timeout = ready_timeout
+        self.structured_events = structured_events
+        # 快进倍率（0 表示不快进）；每次连上 Godot 时下发，重启后同样生效
+        self.fast_forward = fast_forward
+        # AILogger 分类级别与紧凑格式，作为启动参数传给 Godot
+        self.log_levels = log_levels
+        self.log_compact = log_compact
+        # 共享内存状态块：Godot 每帧写入 state_file，网关 mmap 后通过 GET /state 提供
+        self.state_file: Optional[Path] = (
+            default_state_dir() / f"tower-ai-{os.getpid()}-s{session_id}.state" if state_block else None
+        )
+        self.state_block: Optional[StateBlock] = None
+        # 是否把收到的每条观测回显到 stdout（长时间无人值守运行时建议关闭）
+        self.echo = echo
+        # Godot stdout 内存窗口行数；spill_output 时被挤出窗口的行写入 <日志名>.godot.log
+        self.output_lines = output_lines
+        self.spill_path = log_file.with_name(f"{log_file.stem}.godot.log") if spill_output else None
+
+        self.godot: Optional[GodotProcess] = None
+        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.ws_connected = False
+        # 有界缓冲：客户端长时间不读取时按 drop_policy 丢弃，内存保持平稳
+        self.obs_queue = ObservationBuffer(buffer_size, drop_policy)
+        # 结构化事件（仅 structured_events=True 时由 Godot 推送）
+        self.events_queue = ObservationBuffer(
+            buffer_size, drop_policy, priority_fn=lambda e: observation_priority(e.text)
+        )
+
+        # 原地复位：同一进程复位 max_resets 次后重启一次（0 表示不限）
+        self.max_resets = max_resets
+        self.resets_since_start = 0
+        self.reset_count = 0
+
+        # 池管理状态
+        self.leased = False
+        self.restart_count = 0
+        # 崩溃或（重新）启动失败的时间；非 None 时不出租，由监督循环回收
+        self.crash_time: Optional[float] = None
+        # 连续启动失败次数，监督循环据此退避重试
+        self.start_failures = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._receive_task: Optional[asyncio.Task] = None
+        # action_id -> 等待 action_result 帧的 Future（仅 wait=true 的请求）
+        self._pending_actions: Dict[str, asyncio.Future] = {}
+
+    async def start(self) -> bool:
+        """启动 Godot 进程并建立 WebSocket 连接"""
+        self._loop = asyncio.get_running_loop()
+        self.resets_since_start = 0
+        logger.info(f"[会话 {self.session_id}] 启动 Godot 进程 (ai_port={self.godot_ws_port})...")
+
+        if self.state_file:
+            # 每次拉起 Godot 前原地清零，避免读到上一个进程留下的帧
+            if self.state_block:
+                self.state_block.close()
+            self.state_block = StateBlock.create(self.state_file)
+
+        self.godot = GodotProcess(
+            project_path=self.project_path,
+            scene_path=self.scene_path,
+            ai_port=self.godot_ws_port,
+            visual_mode=self.visual_mode,
+            on_crash=self._on_godot_crash,
+            output_buffer_lines=self.output_lines,
+            spill_path=str(self.spill_path) if self.spill_path else None,
+            log_levels=self.log_levels,
+            log_compact=self.log_compact,
+            state_file=str(self.state_file) if self.state_file else None
+        )
+
+        # start/wait_for_ready 是阻塞调用，放到线程池中避免卡住其它会话
+        started = await self._loop.run_in_executor(None, self.godot.start)
+        if not started:
+            self._release_port()
+            logger.error(f"[会话 {self.session_id}] Godot 进程启动失败")
+            return False
+
+        logger.info(f"[会话 {self.session_id}] Godot PID: {self.godot.process.pid}")
+
+        try:
+            ready = await self._loop.run_in_executor(
+                None, self.godot.wait_for_ready, self.ready_timeout
+            )
+        finally:
+            # Godot 的 TCPServer 以 SO_REUSEADDR 监听，就绪后占位已无必要
+            self._release_port()
+        if not ready:
+            if self.godot.has_crashed():
+                # 不返回 False，保留会话以便通过 HTTP 读取崩溃信息
+                logger.error(f"[会话 {self.session_id}] Godot 启动时崩溃")
+                return True
+            logger.error(f"[会话 {self.session_id}] Godot 启动超时")
+            self.godot.kill()
+            return False
+
+        logger.info(f"[会话 {self.session_id}] Godot 已就绪")
+        return await self._connect_websocket()
+
+    async def _connect_websocket(self) -> bool:
+        """建立 WebSocket 连接"""
+        uri = f"ws://127.0.0.1:{self.godot_ws_port}"
+        logger.info(f"[会话 {self.session_id}] 连接 WebSocket: {uri}")
+
+        try:
+            self.websocket = await websockets.connect(uri)
+            self.ws_connected = True
+            logger.info(f"[会话 {self.session_id}] WebSocket 连接成功")
+
+            # 启动消息接收任务
+            self._receive_task = asyncio.create_task(self._ws_receive_loop())
+
+            # 订阅结构化事件通道
+            if self.structured_events:
+                await self.websocket.send(json.dumps({"type": "subscribe_events", "enabled": True}))
+
+            # 快进：提高游戏速度与物理帧率，headless 下跳过视觉效果
+            if self.fast_forward > 0:
+                await self.websocket.send(json.dumps({
+                    "type": "set_game_speed",
+                    "time_scale": self.fast_forward,
+                    "fast_forward": True
+                }))
+            return True
+
+        except Exception as e:
+            logger.error(f"[会话 {self.session_id}] WebSocket 连接失败: {e}")
+            return False
+
+    async def _ws_receive_loop(self):
+        """WebSocket 消息接收循环"""
+        try:
+            async for message in self.websocket:
+                # 结构化控制帧（JSON 对象）不进入自然语言文本流
+                frame = self._parse_control_frame(message)
+                if frame is not None:
+                    self._handle_control_frame(frame)
+                    continue
+
+                # 其余内容视为自然语言文本处理
+                if self.echo:
+                    print(message, flush=True)
+
+                # 放入文本流缓冲队列供轮询读取
+                self.obs_queue.put_nowait(message)
+
+        except websockets.exceptions.ConnectionClosed:
+            logger.info(f"[会话 {self.session_id}] WebSocket 连接已关闭")
+            self.ws_connected = False
+        except Exception as e:
+            logger.error(f"[会话 {self.session_id}] WebSocket 接收错误: {e}")
+            self.ws_connected = False
+        finally:
+            self._fail_pending_actions({
+                "event": "Error",
+                "error_message": "WebSocket connection closed"
+            })
+
+    @staticmethod
+    def _parse_control_frame(message) -> Optional[Dict[str, Any]]:
+        """识别 Godot 发来的 JSON 控制帧，自然语言文本返回 None"""
+        if not isinstance(message, str) or not message.startswith("{"):
+            return None
+        try:
+            frame = json.loads(message)
+        except ValueError:
+            return None
+        if not isinstance(frame, dict) or "type" not in frame:
+            return None
+        return frame
+
+    def _handle_control_frame(self, frame: Dict[str, Any]):
+        """分发控制帧"""
+        if frame["type"] == "action_result":
+            future = self._pending_actions.pop(str(frame.get("action_id", "")), None)
+            if future and not future.done():
+                future.set_result(frame.get("results", []))
+        elif frame["type"] == "event":
+            self.events_queue.put_nowait(GameEvent.from_frame(frame))
+
+    def _fail_pending_actions(self, response: Dict[str, Any]):
+        """唤醒所有等待中的同步动作请求（崩溃或断线时）"""
+        pending, self._pending_actions = self._pending_actions, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result(response)
+
+    def has_crashed(self) -> bool:
+        """检查会话的 Godot 实例是否已崩溃"""
+        return bool(self.godot and self.godot.has_crashed())
+
+    @property
+    def available(self) -> bool:
+        """可以出租：未崩溃，且没有等待回收的启动失败"""
+        return self.crash_time is None and not self.has_crashed()
+
+    def mark_start_failed(self):
+        """启动或回收失败：保留 crash_time，交给监督循环按退避间隔重试"""
+        self.start_failures += 1
+        self.crash_time = time.time()
+
+    async def send_actions(
+        self,
+        actions: list,
+        action_id: Optional[str] = None,
+        wait: bool = False,
+        timeout: float = 10.0
+    ) -> Dict[str, Any]:
+        """发送动作到本会话的 Godot
+
+        Args:
+            actions: 动作列表
+            action_id: 请求关联 ID，未指定时自动生成；Godot 执行完毕后随 action_result 帧回传
+            wait: 为 True 时等待 Godot 回传逐条执行结果再返回
+            timeout: wait 模式下的最长等待时间（秒）
+        """
+        # 检查 Godot 是否已崩溃
+        if self.has_crashed():
+            return self._crash_response()
+
+        # 检查 WebSocket 连接
+        if not self.ws_connected or not self.websocket:
+            return {
+                "event": "Error",
+                "error_message": "WebSocket not connected"
+            }
+
+        action_id = str(action_id) if action_id else uuid.uuid4().hex[:12]
+        future = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_actions[action_id] = future
+
+        try:
+            message = {"actions": actions, "action_id": action_id}
+            await self.websocket.send(json.dumps(message))
+            logger.info(f"[会话 {self.session_id}] 发送动作: {len(actions)} 个 (action_id={action_id})")
+
+        except Exception as e:
+            self._pending_actions.pop(action_id, None)
+            logger.error(f"[会话 {self.session_id}] 发送动作失败: {e}")
+            return {
+                "event": "Error",
+                "error_message": str(e)
+            }
+
+        if future is None:
+            # 立即返回成功，不等待游戏状态（状态由下行链路实时推送）
+            return {
+                "status": "ok",
+                "message": "Actions sent",
+                "action_id": action_id
+            }
+
+        try:
+            results = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._pending_actions.pop(action_id, None)
+            return {
+                "event": "Error",
+                "error_message": f"等待动作结果超时 ({timeout}s)",
+                "action_id": action_id
+            }
+
+        # 崩溃或断线时 Future 的结果是错误响应而不是结果列表
+        if isinstance(results, dict):
+            return dict(results, action_id=action_id)
+
+        return {
+            "status": "ok",
+            "action_id": action_id,
+            "all_success": all(r.get("success", False) for r in results),
+            "results": results
+        }
+
+    def _crash_response(self) -> Dict[str, Any]:
+        crash_info = self.godot.get_crash_info()
+        return {
+            "event": "SystemCrash",
+            "session_id": self.session_id,
+            "error_type": crash_info.error_type,
+            "stack_trace": crash_info.stack_trace
+        }
+
+    @staticmethod
+    def _take_queued(queue: ObservationBuffer) -> list:
+        """非阻塞地取出队列中当前全部元素"""
+        items = []
+        while not queue.empty():
+            try:
+                items.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    @classmethod
+    async def _wait_queued(cls, queue: ObservationBuffer, wait: float, min_count: int) -> list:
+        """等待至少 min_count 个元素或超时，然后返回已到达的全部元素
+
+        新元素到达时立即唤醒，不需要客户端按固定间隔轮询。
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        items = cls._take_queued(queue)
+
+        while len(items) < min_count:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            # 同一批次到达的其余元素一并取出
+            items.extend(cls._take_queued(queue))
+
+        return items
+
+    def _append_log(self, observations: List[str]):
+        """追加到会话日志（只写内存缓冲，由后台任务批量刷盘）"""
+        self.log_writer.write(observations)
+
+    def drain_observations(self) -> List[str]:
+        """取出当前队列中全部观测，并追加到会话日志"""
+        observations = self._take_queued(self.obs_queue)
+        self._append_log(observations)
+        return observations
+
+    async def wait_observations(self, wait: float, min_count: int = 1) -> List[str]:
+        """长轮询：等待至少 min_count 条观测或超时"""
+        observations = await self._wait_queued(self.obs_queue, wait, min_count)
+        self._append_log(observations)
+        return observations
+
+    def drain_events(self) -> List[GameEvent]:
+        """取出当前队列中全部结构化事件"""
+        return self._take_queued(self.events_queue)
+
+    async def wait_events(self, wait: float, min_count: int = 1) -> List[GameEvent]:
+        """长轮询：等待至少 min_count 个结构化事件或超时"""
+        return await self._wait_queued(self.events_queue, wait, min_count)
+
+    async def stream_observations(self) -> AsyncIterator[str]:
+        """持续产出观测（供 SSE 推送使用），与轮询接口共享同一队列"""
+        while True:
+            obs = await self.obs_queue.get()
+            self._append_log([obs])
+            yield obs
+
+    def get_status(self) -> Dict[str, Any]:
+        """会话状态"""
+        return {
+            "session_id": self.session_id,
+            "godot_running": self.godot.is_running() if self.godot else False,
+            "ws_connected": self.ws_connected,
+            "godot_ws_port": self.godot_ws_port,
+            "structured_events": self.structured_events,
+            "fast_forward": self.fast_forward,
+            "crashed": self.has_crashed(),
+            "leased": self.leased,
+            "restart_count": self.restart_count,
+            "start_failures": self.start_failures,
+            "reset_count": self.reset_count,
+            "resets_since_start": self.resets_since_start,
+            "log_file": str(self.log_file),
+            "log_lines_written": self.log_writer.lines_written,
+            "log_rotations": self.log_writer.rotations,
+            "obs_buffer": self.obs_queue.stats(),
+            "events_buffer": self.events_queue.stats(),
+            "state_file": str(self.state_file) if self.state_file else None,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """从共享内存状态块读取一帧一致的棋盘状态"""
+        if not self.state_block:
+            return {"event": "Error", "error_message": "状态块未开启（网关需以 --state-block 启动）"}
+        state = self.state_block.to_dict()
+        state["session_id"] = self.session_id
+        return state
+
+    def _on_godot_crash(self, crash_info: CrashInfo):
+        """Godot 崩溃回调（在 GodotProcess 的收敛线程中调用）"""
+        logger.error(f"[会话 {self.session_id}] Godot 崩溃: {crash_info.error_type}")
+
+        # 将错误信息格式化并推入队列
+        error_msg = (
+            f"【系统严重报错】检测到 Godot 引擎崩溃：\n"
+            f"错误类型：{crash_info.error_type}\n"
+            f"堆栈：\n{crash_info.stack_trace}"
+        )
+
+        # 因为在其它线程中调用，需要通过 call_soon_threadsafe 放入队列
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._record_crash, error_msg)
+        else:
+            self._record_crash(error_msg)
+
+    def _record_crash(self, error_msg: str):
+        self.crash_time = time.time()
+        self.obs_queue.put_nowait(error_msg)
+        self._fail_pending_actions(self._crash_response())
+
+    async def stop(self):
+        """关闭 WebSocket 并终止 Godot 进程"""
+        if self._receive_task and not self._receive_task.done():
+            self._receive_task.cancel()
+        self._receive_task = None
+
+        if self.websocket:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+            self.websocket = None
+        self.ws_connected = False
+
+        if self.godot:
+            # kill 内部会 wait，放到线程池执行
+            await asyncio.get_running_loop().run_in_executor(None, self.godot.kill)
+
+    async def shutdown(self):
+        """永久关闭会话：停止实例并写出剩余日志"""
+        await self.stop()
+        self._release_port()
+        if self.state_block:
+            self.state_block.unlink()
+            self.state_block = None
+        await self.log_writer.close()
+
+    async def reset(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """在场景之间复位游戏
+
+        优先让 Godot 原地执行 reset_game（只需一次往返）；实例已崩溃、未连接、
+        复位失败或已复位 max_resets 次时，改为重启进程。
+        上一个场景遗留的观测和事件会先写入日志并清空。
+
+        Returns:
+            {"status": "ok", "mode": "reset" | "restart", ...} 或错误响应
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.drain_observations()
+        self._take_queued(self.events_queue)
+
+        if self.has_crashed():
+            reason = "实例已崩溃"
+        elif not self.ws_connected or not self.godot or not self.godot.is_running():
+            reason = "实例未连接"
+        elif self.max_resets and self.resets_since_start >= self.max_resets:
+            reason = f"已原地复位 {self.resets_since_start} 次"
+        else:
+            result = await self.send_control({"type": "reset_game"}, timeout)
+            results = result.get("results") or [{}]
+            if result.get("status") == "ok" and results[0].get("success"):
+                self.resets_since_start += 1
+                self.reset_count += 1
+                return {
+                    "status": "ok",
+                    "mode": "reset",
+                    "session_id": self.session_id,
+                    "resets_since_start": self.resets_since_start,
+                    "elapsed": round(loop.time() - started, 3),
+                }
+            reason = results[0].get("error_message") or result.get("error_message") or "原地复位失败"
+
+        logger.info(f"[会话 {self.session_id}] 重启实例代替复位: {reason}")
+        if not await self.recycle():
+            return {"event": "Error", "error_message": f"会话 {self.session_id} 重启失败"}
+        self.reset_count += 1
+        return {
+            "status": "ok",
+            "mode": "restart",
+            "session_id": self.session_id,
+            "reason": reason,
+            "restart_count": self.restart_count,
+            "elapsed": round(loop.time() - started, 3),
+        }
+
+    async def send_control(self, message: Dict[str, Any], timeout: float = 10.0) -> Dict[str, Any]:
+        """发送一条控制消息并等待 Godot 以 action_result 帧回传结果"""
+        if not self.ws_connected or not self.websocket:
+            return {"event": "Error", "error_message": "WebSocket not connected"}
+
+        action_id = uuid.uuid4().hex[:12]
+        future = asyncio.get_running_loop().create_future()
+        self._pending_actions[action_id] = future
+        try:
+            await self.websocket.send(json.dumps(dict(message, action_id=action_id)))
+            results = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return {"event": "Error", "error_message": f"等待控制消息结果超时 ({timeout}s)"}
+        except Exception as e:
+            return {"event": "Error", "error_message": str(e)}
+        finally:
+            self._pending_actions.pop(action_id, None)
+
+        # 崩溃或断线时 Future 的结果是错误响应而不是结果列表
+        if isinstance(results, dict):
+            return results
+        return {"status": "ok", "action_id": action_id, "results": results}
+
+    def _release_port(self):
+        if self.port_reservation:
+            self.port_reservation.release()
+            self.port_reservation = None
+
+    async def recycle(self) -> bool:
+        """回收会话：终止旧进程，在新端口上重新拉起 Godot
+
+        观测队列保留，客户端可以依次读到崩溃报告和重启提示。
+        """
+        logger.info(f"[会话 {self.session_id}] 回收实例...")
+        await self.stop()
+
+        # 旧端口可能仍处于 TIME_WAIT，换一个新端口
+        self._release_port()
+        self.port_reservation = reserve_port()
+        self.godot_ws_port = self.port_reservation.port
+        self.restart_count += 1
+
+        # 启动时崩溃 start() 也返回 True，此时同样视为失败
+        ok = await self.start() and not self.has_crashed()
+        if ok:
+            self.crash_time = None
+            self.start_failures = 0
+            self.obs_queue.put_nowait(
+                f"【系统提示】会话 {self.session_id} 已回收并重新启动（第 {self.restart_count} 次）。"
+            )
+        else:
+            self.mark_start_failed()
+            logger.error(f"[会话 {self.session_id}] 回收后启动失败（连续 {self.start_failures} 次）")
+        return ok
+
+
+class GodotPool:
+    """
+    Godot 实例池
+
+    - 启动 N 个 Godot 会话，按 session_id 路由请求
+    - 会话租约：acquire 分配一个空闲会话，release 归还
+    - 崩溃隔离：崩溃实例保留 recycle_delay 秒供客户端读取崩溃信息，之后自动回收重启
+    """
+
+    # 监督循环检查间隔（秒）
+    SUPERVISE_INTERVAL = 1.0
+    # 连续启动失败时的重试退避：RECYCLE_BACKOFF * 2^(失败次数-1)，最长 RECYCLE_BACKOFF_MAX 秒
+    RECYCLE_BACKOFF = 5.0
+    RECYCLE_BACKOFF_MAX = 300.0
+
+    def __init__(
+        self,
+        size: int,
+        project_path: str,
+        scene_path: str,
+        godot_ws_ports: List[int],
+        log_dir: Path,
+        log_prefix: str,
+        visual_mode: bool = False,
+        recycle_delay: Optional[float] = None,
+        structured_events: bool = False,
+        buffer_size: int = 10000,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        echo: bool = True,
+        log_options: Optional[Dict[str, Any]] = None,
+        output_lines: int = GodotProcess.OUTPUT_BUFFER_LINES,
+        spill_output: bool = False,
+        max_resets: int = 0,
+        fast_forward: float = 0.0,
+        log_levels: str = "",
+        log_compact: bool = False,
+        port_reservations: Optional[Dict[int, PortReservation]] = None,
+        state_block: bool = False
+    ):
+        if size < 1:
+            raise ValueError("实例池大小必须 >= 1")
+        if len(godot_ws_ports) != size:
+            raise ValueError("godot_ws_ports 数量必须与实例池大小一致")
+
+        self.recycle_delay = recycle_delay
+        self.sessions: Dict[str, GodotSession] = {}
+        for i in range(size):
+            session_id = str(i)
+            # 单实例时保持旧的日志文件名
+            suffix = "" if size == 1 else f"_s{session_id}"
+            self.sessions[session_id] = GodotSession(
+                session_id=session_id,
+                project_path=project_path,
+                scene_path=scene_path,
+                godot_ws_port=godot_ws_ports[i],
+                log_file=log_dir / f"{log_prefix}{suffix}.log",
+                visual_mode=visual_mode,
+                structured_events=structured_events,
+                buffer_size=buffer_size,
+                drop_policy=drop_policy,
+                echo=echo,
+                log_options=log_options,
+                output_lines=output_lines,
+                spill_output=spill_output,
+                max_resets=max_resets,
+                fast_forward=fast_forward,
+                log_levels=log_levels,
+                log_compact=log_compact,
+                # 占位的所有权转交给会话
+                port_reservation=(port_reservations or {}).pop(godot_ws_ports[i], None),
+                state_block=state_block
+            )
+
+        self._supervise_task: Optional[asyncio.Task] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def default_session(self) -> GodotSession:
+        return self.sessions["0"]
+
+    async def start(self) -> bool:
+        """启动所有会话
+
+        第一个会话单独启动（可能触发资源导入），其余会话并发启动。
+        至少一个会话启动成功即视为成功。
+        """
+        sessions = list(self.sessions.values())
+        results = [await sessions[0].start()]
+        if len(sessions) > 1:
+            results.extend(await asyncio.gather(*(s.start() for s in sessions[1:])))
+
+        for session, ok in zip(sessions, results):
+            if not ok:
+                logger.error(f"[会话 {session.session_id}] 启动失败")
+                # 交给监督循环重试，期间不会被 acquire 租出
+                session.mark_start_failed()
+
+        if self.recycle_delay is not None:
+            self._supervise_task = asyncio.create_task(self._supervise_loop())
+
+        return any(results)
+
+    def get(self, session_id: Optional[str] = None) -> Optional[GodotSession]:
+        """按 ID 获取会话，未指定时返回默认会话"""
+        if session_id is None or session_id == "":
+            return self.default_session
+        return self.sessions.get(str(session_id))
+
+    def acquire(self) -> Optional[GodotSession]:
+        """租用一个空闲且未崩溃的会话"""
+        for session in self.sessions.values():
+            if not session.leased and session.available:
+                session.leased = True
+                return session
+        return None
+
+    def release(self, session_id: str) -> bool:
+        """归还会话租约"""
+        session = self.sessions.get(str(session_id))
+        if not session:
+            return False
+        session.leased = False
+        return True
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        return [s.get_status() for s in self.sessions.values()]
+
+    def _recycle_due(self, session: GodotSession, now: float) -> bool:
+        if session.crash_time is None:
+            return False
+        delay = self.recycle_delay
+        if session.start_failures:
+            delay += min(self.RECYCLE_BACKOFF * 2 ** (session.start_failures - 1), self.RECYCLE_BACKOFF_MAX)
+        return now - session.crash_time >= delay
+
+    async def _recycle(self, session: GodotSession):
+        try:
+            await session.recycle()
+        except Exception as e:
+            session.mark_start_failed()
+            logger.error(f"[会话 {session.session_id}] 回收失败: {e}")
+
+    async def _supervise_loop(self):
+        """监督循环：回收崩溃超过 recycle_delay 秒的会话；启动失败的会话按退避间隔重试
+
+        到期的会话并发回收，单个实例等待就绪超时不会拖住其它会话。
+        """
+        while True:
+            await asyncio.sleep(self.SUPERVISE_INTERVAL)
+            now = time.time()
+            due = [s for s in self.sessions.values() if self._recycle_due(s, now)]
+            if due:
+                await asyncio.gather(*(self._recycle(s) for s in due))
+
+    async def stop(self):
+        """停止所有会话"""
+        if self._supervise_task:
+            self._supervise_task.cancel()
+            self._supervise_task = None
+        await asyncio.gather(
+            *(s.shutdown() for s in self.sessions.values()),
+            return_exceptions=True
+        )
@@ -3,15 +3,18 @@ import subprocess
 import threading
 import time
 import signal
+import socket
 import os
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Deque, TextIO
 from dataclasses import dataclass, field
 
 from ai_client.utils import (
     is_error_line, extract_stack_trace, classify_crash_type,
     CrashType, extract_crash_details, find_related_context,
-    is_engine_error_line
+    ENGINE_CRASH_TYPES
 )
 
 
@@ -46,28 +49,70 @@ class GodotProcess:
     # 崩溃检测到后等待进程继续吐栈信息的时长（秒）
     CRASH_GRACE_SECONDS = 0.8
 
+    # Godot 输出中表示 AI WebSocket 服务器已就绪的标记
+    READY_MARKERS = ("服务器已启动", "STATE_OPEN")
+
+    # TCP 探测重试间隔（秒）
+    PROBE_INTERVAL = 0.05
+
+    # 内存中保留的最近输出行数（崩溃上下文只需要错误行附近的几百行）
+    OUTPUT_BUFFER_LINES = 20000
+
+    # 崩溃上下文：错误行前后各取多少行；崩溃报告附带的原始输出行数
+    CRASH_CONTEXT_LINES = 150
+    RAW_OUTPUT_LINES = 500
+
+    # 溢出文件单个分段的大小上限（字节），超过后轮转为 <name>.1
+    SPILL_MAX_BYTES = 100 * 1024 * 1024
+
     def __init__(
         self,
         project_path: str,
         scene_path: str,
         ai_port: int,
         visual_mode: bool = False,
-        on_crash: Optional[Callable[[CrashInfo], None]] = None
+        on_crash: Optional[Callable[[CrashInfo], None]] = None,
+        output_buffer_lines: int = OUTPUT_BUFFER_LINES,
+        spill_path: Optional[str] = None,
+        log_levels: str = "",
+        log_compact: bool = False,
+        state_file: Optional[str] = None
     ):
+        """
+        Args:
+            output_buffer_lines: 内存中保留的最近输出行数，更早的行被丢弃
+            spill_path: 可选的溢出文件；被挤出内存窗口的行追加写入该文件
+            log_levels: AILogger 分类级别，如 "combat:off,net:warn"（透传为 --ai-log）
+            log_compact: AILogger 使用无颜色的紧凑格式（透传为 --ai-log-compact）
+            state_file: 共享内存状态块文件，Godot 每帧写入（透传为 --ai-state-file）
+        """
         self.project_path = Path(project_path)
         self.scene_path = scene_path
         self.ai_port = ai_port
         self.visual_mode = visual_mode
         self.on_crash = on_crash
+        self.log_levels = log_levels
+        self.log_compact = log_compact
+        self.state_file = state_file
 
         self.process: Optional[subprocess.Popen] = None
         self._monitor_thread: Optional[threading.Thread] = None
         self._stop_monitoring = threading.Event()
-        self._output_lines: List[str] = []
+        # 有界输出窗口：长时间 verbose 运行时内存保持平稳
+        self._output_lines: Deque[str] = deque(maxlen=output_buffer_lines)
+        self._output_total = 0  # 累计输出行数，用于换算窗口内行的绝对行号
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._spill_file: Optional[TextIO] = None
+        self._spill_bytes = 0
         self._lock = threading.Lock()
         self._crashed = False
         self._crash_info: Optional[CrashInfo] = None
 
+        # 就绪信号：监控线程看到就绪标记时置位，进程输出结束时置位 _monitor_done
+        self._ready_event = threading.Event()
+        self._monitor_done = threading.Event()
+        self._state_changed = threading.Event()
+
         # 崩溃收敛状态：先检测，再延迟收集并终止
         self._crash_error_line: Optional[str] = None
         self._crash_type: Optional[CrashType] = None
@@ -158,6 +203,14 @@ class GodotProcess:
         if not self.visual_mode:
             cmd.append("--headless")
 
+        # AILogger 级别与格式：stdout 量是 headless 会话吞吐的主要瓶颈
+        if self.log_levels:
+            cmd.append(f"--ai-log={self.log_levels}")
+        if self.log_compact:
+            cmd.append("--ai-log-compact")
+        if self.state_file:
+            cmd.append(f"--ai-state-file={self.state_file}")
+
         # 可选参数
         if verbose:
             cmd.append("--verbose")
@@ -182,6 +235,8 @@ class GodotProcess:
 
             # 启动监控线程
             self._stop_monitoring.clear()
+            self._ready_event.clear()
+            self._monitor_done.clear()
             self._monitor_thread = threading.Thread(target=self._monitor_output)
             self._monitor_thread.daemon = True
             self._monitor_thread.start()
@@ -194,6 +249,16 @@ class GodotProcess:
 
     def _monitor_output(self):
         """后台线程：监控 Godot 输出"""
+        try:
+            self._read_output()
+        finally:
+            with self._lock:
+                self._close_spill()
+            # 输出结束（进程退出或停止监控），唤醒 wait_for_ready
+            self._monitor_done.set()
+            self._state_changed.set()
+
+    def _read_output(self):
         if not self.process or not self.process.stdout:
             return
 
@@ -203,10 +268,18 @@ class GodotProcess:
 
             line = line.rstrip()
             with self._lock:
+                if self.spill_path and len(self._output_lines) == self._output_lines.maxlen:
+                    self._spill_line(self._output_lines[0])
                 self._output_lines.append(line)
+                self._output_total += 1
                 # 更新游戏状态追踪
                 self._update_game_state(line)
 
+            # 就绪检测：只检查新到达的这一行
+            if not self._ready_event.is_set() and any(m in line for m in self.READY_MARKERS):
+                self._ready_event.set()
+                self._state_changed.set()
+
             # 实时打印（调试用）
             print(f"[Godot] {line}")
 
@@ -215,6 +288,35 @@ class GodotProcess:
             if is_error:
                 self._mark_crash_detected(line, crash_type)
 
+    def _spill_line(self, line: str):
+        """把即将被挤出内存窗口的一行追加到溢出文件（调用方持有 _lock）"""
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+                self._spill_bytes = self._spill_file.tell()
+
+            self._spill_file.write(line + "\n")
+            self._spill_bytes += len(line) + 1  # 按字符数估算即可
+
+            if self._spill_bytes >= self.SPILL_MAX_BYTES:
+                # 只保留上一个分段，磁盘占用同样有界
+                self._spill_file.close()
+                self._spill_file = None
+                os.replace(self.spill_path, self.spill_path.with_name(self.spill_path.name + ".1"))
+        except OSError as e:
+            print(f"[GodotProcess] 写入溢出文件失败，停止溢出: {e}")
+            self._close_spill()
+            self.spill_path = None
+
+    def _close_spill(self):
+        if self._spill_file is not None:
+            try:
+                self._spill_file.close()
+            except OSError:
+                pass
+            self._spill_file = None
+
     def _update_game_state(self, line: str):
         """从输出中更新游戏状态追踪
 
@@ -314,21 +416,29 @@ class GodotProcess:
             error_line = self._crash_error_line or "UNKNOWN ERROR"
             crash_type = self._crash_type or CrashType.UNKNOWN
 
-            # 找到错误行索引
-            error_idx = len(self._output_lines) - 1
-            for i in range(len(self._output_lines) - 1, -1, -1):
-                if self._output_lines[i] == error_line:
-                    error_idx = i
+            # 在输出窗口中从后往前找到错误行索引
+            window_size = len(self._output_lines)
+            error_idx = window_size - 1
+            for i, line in enumerate(reversed(self._output_lines)):
+                if line == error_line:
+                    error_idx = window_size - 1 - i
                     break
 
+            # 只拷贝错误行附近的上下文，不复制整个输出窗口
+            ctx_start = max(0, error_idx - self.CRASH_CONTEXT_LINES)
+            ctx_lines = list(islice(self._output_lines, ctx_start, error_idx + self.CRASH_CONTEXT_LINES + 1))
+            ctx_error_idx = error_idx - ctx_start
+            # 上下文首行的绝对行号（含已被挤出窗口的行），与溢出文件对得上
+            line_offset = self._output_total - window_size + ctx_start
+
             # 提取崩溃详情
             crash_details = extract_crash_details(error_line)
 
             # 收集相关上下文
-            related_context = find_related_context(self._output_lines, error_idx)
+            related_context = find_related_context(ctx_lines, ctx_error_idx, line_offset=line_offset)
 
-            # 判断是否是引擎错误
-            is_engine_err = is_engine_error_line(error_line)
+            # 判断是否是引擎错误（复用上面的分类结果，不再重复扫描）
+            is_engine_err = crash_details.get('crash_type') in ENGINE_CRASH_TYPES
 
             # 确定错误分类
             if crash_type == CrashType.SCRIPT_ERROR:
@@ -342,16 +452,19 @@ class GodotProcess:
 
             # 提取栈跟踪（使用更大的上下文范围）
             stack_trace = extract_stack_trace(
-                self._output_lines,
-                error_idx,
-                before=150,  # 增加上下文范围
-                after=150,
+                ctx_lines,
+                ctx_error_idx,
+                before=self.CRASH_CONTEXT_LINES,  # 增加上下文范围
+                after=self.CRASH_CONTEXT_LINES,
                 include_context=True,
-                is_engine_error=is_engine_err
+                is_engine_error=is_engine_err,
+                line_offset=line_offset
             )
 
-            # 保存原始输出用于调试
-            raw_output = self._output_lines.copy()
+            # 保存最近的原始输出用于调试
+            raw_output = list(islice(
+                self._output_lines, max(0, window_size - self.RAW_OUTPUT_LINES), None
+            ))
 
         # 构建崩溃信息
         self._crash_info = CrashInfo(
@@ -364,7 +477,7 @@ class GodotProcess:
             error_message=crash_details.get('error_message'),
             is_engine_internal=crash_details.get('is_engine_internal', False),
             related_context=related_context,
-            raw_output=raw_output[-500:] if len(raw_output) > 500 else raw_output,  # 保留最近500行
+            raw_output=raw_output,
             game_state=self._game_state.copy(),
         )
 
@@ -471,21 +584,41 @@ class GodotProcess:
     def get_recent_output(self, lines: int = 50) -> List[str]:
         """获取最近的输出"""
         with self._lock:
-            return self._output_lines[-lines:]
+            return list(islice(self._output_lines, max(0, len(self._output_lines) - lines), None))
 
-    def wait_for_ready(self, timeout: float = 30.0) -> bool:
-        """等待 Godot 就绪（WebSocket 服务器启动）"""
-        start = time.time()
-        while time.time() - start < timeout:
-            if not self.is_running():
+    def wait_for_ready(self, timeout: float = 30.0, probe_port: bool = False) -> bool:
+        """等待 Godot 就绪（WebSocket 服务器启动）
+
+        由监控线程在就绪标记行到达时立即唤醒，不再轮询扫描全部输出。
+
+        Args:
+            timeout: 最长等待时间（秒）
+            probe_port: 看到就绪标记后，是否再对 ai_port 做 TCP 连接探测确认端口已可连接
+        """
+        deadline = time.time() + timeout
+        while True:
+            if self._ready_event.is_set():
+                return not probe_port or self._probe_ai_port(deadline)
+
+            if self._monitor_done.is_set() or not self.is_running():
                 return False
 
-            # 检查输出中是否有 "服务器已启动" 字样
-            with self._lock:
-                for line in self._output_lines:
-                    if "服务器已启动" in line or "STATE_OPEN" in line:
-                        return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
 
-            time.sleep(0.1)
+            # 持久状态在循环开头重新检查，这里清除不会丢失唤醒
+            self._state_changed.wait(remaining)
+            self._state_changed.clear()
 
+    def _probe_ai_port(self, deadline: float) -> bool:
+        """对 ai_port 做 TCP 连接探测，直到连接成功或超时"""
+        while time.time() < deadline:
+            if not self.is_running():
+                return False
+            try:
+                with socket.create_connection(("127.0.0.1", self.ai_port), timeout=self.PROBE_INTERVAL * 4):
+                    return True
+            except OSError:
+                time.sleep(self.PROBE_INTERVAL)
         return False
@@ -2,16 +2,27 @@
 import asyncio
 import json
 import logging
-from typing import Optional, Callable, Awaitable, Dict, Any
+import math
+from typing import Optional, Callable, Awaitable, Dict, Any, AsyncIterator
 from aiohttp import web
 
 logger = logging.getLogger(__name__)
 
 
-# 类型定义
-ActionHandler = Callable[[list], Awaitable[Dict[str, Any]]]
-StatusHandler = Callable[[], Awaitable[Dict[str, Any]]]
-ObservationsHandler = Callable[[], Awaitable[Dict[str, Any]]]
+# 类型定义（第二个参数为 session_id，未指定时为 None，路由到默认会话）
+# 关键字参数: action_id (Optional[str]), wait (bool), timeout (float)
+ActionHandler = Callable[..., Awaitable[Dict[str, Any]]]
+StatusHandler = Callable[[Optional[str]], Awaitable[Dict[str, Any]]]
+# (session_id, wait 秒, min 条数)；wait=0 时立即返回
+ObservationsHandler = Callable[[Optional[str], float, int], Awaitable[Dict[str, Any]]]
+# (session_id, wait 秒, min 条数) -> {"events": [...]}
+EventsHandler = Callable[[Optional[str], float, int], Awaitable[Dict[str, Any]]]
+# session_id -> 共享内存状态块中的最新一帧
+StateHandler = Callable[[Optional[str]], Awaitable[Dict[str, Any]]]
+# session_id -> 观测异步迭代器；会话不存在时返回 None
+StreamHandler = Callable[[Optional[str]], Optional[AsyncIterator[str]]]
+# (操作名, session_id) -> 结果；操作名: list | acquire | release | recycle | reset
+SessionsHandler = Callable[[str, Optional[str]], Awaitable[Dict[str, Any]]]
 
 
 class AIHTTPServer:
@@ -19,23 +30,52 @@ class AIHTTPServer:
     HTTP REST API 服务器
 
     端点：
-    - POST /action - 发送动作，返回游戏状态
+    - POST /action - 发送动作；"wait": true 时返回逐条执行结果
     - GET  /status - 获取服务器状态
+    - GET  /observations - 读取观测文本流（?wait=秒&min=条数 为长轮询）
+    - GET  /observations/stream - 以 Server-Sent Events 持续推送观测
+    - GET  /events - 读取结构化事件（需网关以 --events 启动，同样支持 wait/min）
+    - GET  /state - 读取共享内存状态块中的最新一帧（需网关以 --state-block 启动）
+    - GET  /sessions - 列出实例池中的会话
+    - POST /sessions/acquire - 租用一个空闲会话
+    - POST /sessions/{session_id}/release - 归还会话
+    - POST /sessions/{session_id}/recycle - 重启会话的 Godot 实例
+    - POST /sessions/{session_id}/reset - 在测试场景之间复位游戏（优先原地复位，必要时重启）
+
+    会话路由：通过查询参数 ?session=<id> 或请求体中的 "session_id" 指定，
+    未指定时使用默认会话 "0"。
     """
 
+    # 长轮询 / 同步动作最长等待时间（秒）
+    MAX_LONG_POLL_SECONDS = 60.0
+    # 同步动作默认等待时间（秒）
+    DEFAULT_ACTION_TIMEOUT = 10.0
+    # SSE 保活注释的发送间隔（秒）
+    SSE_KEEPALIVE_SECONDS = 15.0
+    # SSE 连接断开检测间隔（秒）
+    SSE_DISCONNECT_CHECK_SECONDS = 0.5
+
     def __init__(
         self,
         host: str = "127.0.0.1",
         port: int = 8080,
         action_handler: Optional[ActionHandler] = None,
         status_handler: Optional[StatusHandler] = None,
-        observations_handler: Optional[ObservationsHandler] = None
+        observations_handler: Optional[ObservationsHandler] = None,
+        sessions_handler: Optional[SessionsHandler] = None,
+        stream_handler: Optional[StreamHandler] = None,
+        events_handler: Optional[EventsHandler] = None,
+        state_handler: Optional[StateHandler] = None
     ):
         self.host = host
         self.port = port
         self.action_handler = action_handler
         self.status_handler = status_handler
         self.observations_handler = observations_handler
+        self.sessions_handler = sessions_handler
+        self.stream_handler = stream_handler
+        self.events_handler = events_handler
+        self.state_handler = state_handler
 
         self.app = web.Application()
         self.runner: Optional[web.AppRunner] = None
@@ -46,6 +86,14 @@ class AIHTTPServer:
         self.app.router.add_get("/status", self._handle_status)
         self.app.router.add_get("/health", self._handle_health)
         self.app.router.add_get("/observations", self._handle_observations)
+        self.app.router.add_get("/observations/stream", self._handle_observations_stream)
+        self.app.router.add_get("/events", self._handle_events)
+        self.app.router.add_get("/state", self._handle_state)
+        self.app.router.add_get("/sessions", self._handle_sessions_list)
+        self.app.router.add_post("/sessions/acquire", self._handle_sessions_acquire)
+        self.app.router.add_post("/sessions/{session_id}/release", self._handle_sessions_release)
+        self.app.router.add_post("/sessions/{session_id}/recycle", self._handle_sessions_recycle)
+        self.app.router.add_post("/sessions/{session_id}/reset", self._handle_sessions_reset)
 
     async def start(self) -> bool:
         """启动 HTTP 服务器"""
@@ -67,11 +115,28 @@ class AIHTTPServer:
             logger.info("HTTP 服务器已停止")
 
     async def _handle_action(self, request: web.Request) -> web.Response:
-        """处理 POST /action 请求"""
+        """处理 POST /action 请求
+
+        请求体可选字段:
+        - action_id: 请求关联 ID，会原样回传（未指定时由网关生成）
+        - wait: 为 true 时等待 Godot 执行完毕，返回每个动作的 success/error_message
+        - timeout: wait 模式下的最长等待秒数（默认 10）
+        """
         try:
             # 解析请求体
             body = await request.json()
             actions = body.get("actions", [])
+            session_id = request.query.get("session") or body.get("session_id")
+            wait = body.get("wait", request.query.get("wait", "false"))
+            if isinstance(wait, str):
+                wait = wait.lower() in ("1", "true", "yes")
+            try:
+                timeout = self._parse_action_timeout(body)
+            except (TypeError, ValueError):
+                return web.json_response(
+                    {"error": "timeout must be a number"},
+                    status=400
+                )
 
             if not isinstance(actions, list):
                 return web.json_response(
@@ -81,7 +146,13 @@ class AIHTTPServer:
 
             # 调用处理器（由主程序注入）
             if self.action_handler:
-                result = await self.action_handler(actions)
+                result = await self.action_handler(
+                    actions,
+                    session_id,
+                    action_id=body.get("action_id"),
+                    wait=bool(wait),
+                    timeout=timeout
+                )
                 return web.json_response(result)
             else:
                 return web.json_response(
@@ -104,7 +175,7 @@ class AIHTTPServer:
     async def _handle_status(self, request: web.Request) -> web.Response:
         """处理 GET /status 请求"""
         if self.status_handler:
-            status = await self.status_handler()
+            status = await self.status_handler(request.query.get("session"))
             return web.json_response(status)
         else:
             return web.json_response({
@@ -117,11 +188,152 @@ class AIHTTPServer:
         return web.json_response({"status": "ok"})
 
     async def _handle_observations(self, request: web.Request) -> web.Response:
-        """处理 GET /observations 请求"""
+        """处理 GET /observations 请求
+
+        查询参数:
+        - wait: 没有新观测时最多等待的秒数（默认 0，立即返回）
+        - min: 至少凑齐多少条观测才提前返回（默认 1）
+        """
+        try:
+            wait, min_count = self._parse_long_poll_params(request)
+        except ValueError:
+            return web.json_response(
+                {"error": "wait/min must be numbers"},
+                status=400
+            )
+
         if self.observations_handler:
-            observations = await self.observations_handler()
+            observations = await self.observations_handler(
+                request.query.get("session"), wait, min_count
+            )
             return web.json_response(observations)
         else:
             return web.json_response({
                 "observations": []
             })
+
+    async def _handle_state(self, request: web.Request) -> web.Response:
+        """处理 GET /state 请求"""
+        if self.state_handler:
+            state = await self.state_handler(request.query.get("session"))
+            return web.json_response(state)
+        else:
+            return web.json_response({
+                "event": "Error",
+                "error_message": "状态块未开启"
+            })
+
+    def _parse_action_timeout(self, body: dict) -> float:
+        """解析 /action 的 timeout；null、非数字或非有限值抛出 ValueError / TypeError"""
+        timeout = float(body.get("timeout", self.DEFAULT_ACTION_TIMEOUT))
+        if not math.isfinite(timeout):
+            raise ValueError("timeout must be finite")
+        return max(0.1, min(timeout, self.MAX_LONG_POLL_SECONDS))
+
+    def _parse_long_poll_params(self, request: web.Request) -> tuple[float, int]:
+        """解析长轮询参数 wait / min"""
+        wait = float(request.query.get("wait", 0))
+        min_count = int(request.query.get("min", 1))
+        return max(0.0, min(wait, self.MAX_LONG_POLL_SECONDS)), max(1, min_count)
+
+    async def _handle_events(self, request: web.Request) -> web.Response:
+        """处理 GET /events 请求（参数同 /observations）"""
+        try:
+            wait, min_count = self._parse_long_poll_params(request)
+        except ValueError:
+            return web.json_response(
+                {"error": "wait/min must be numbers"},
+                status=400
+            )
+
+        if self.events_handler:
+            events = await self.events_handler(request.query.get("session"), wait, min_count)
+            return web.json_response(events)
+        else:
+            return web.json_response({
+                "events": []
+            })
+
+    async def _handle_observations_stream(self, request: web.Request) -> web.StreamResponse:
+        """处理 GET /observations/stream 请求（Server-Sent Events）
+
+        每条观测作为一个 data 帧推送，内容为 JSON 编码的字符串（多行崩溃堆栈也只占一行）。
+        流与 /observations 共享同一个读后即焚队列，同一会话同时只应使用一种读取方式。
+        """
+        if not self.stream_handler:
+            return web.json_response(
+                {"error": "Stream handler not configured"},
+                status=503
+            )
+
+        stream = self.stream_handler(request.query.get("session"))
+        if stream is None:
+            return web.json_response(
+                {"error": f"未知会话: {request.query.get('session')}"},
+                status=404
+            )
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+        })
+        await response.prepare(request)
+
+        loop = asyncio.get_running_loop()
+        last_write = loop.time()
+        next_obs = None
+        try:
+            while True:
+                if next_obs is None:
+                    next_obs = asyncio.ensure_future(stream.__anext__())
+                done, _ = await asyncio.wait({next_obs}, timeout=self.SSE_DISCONNECT_CHECK_SECONDS)
+                if not done:
+                    # 客户端断开后尽快停止消费队列，避免后续观测被这个流吞掉
+                    if request.transport is None or request.transport.is_closing():
+                        break
+                    if loop.time() - last_write >= self.SSE_KEEPALIVE_SECONDS:
+                        await response.write(b": keepalive\n\n")
+                        last_write = loop.time()
+                    continue
+                obs = next_obs.result()
+                next_obs = None
+                await response.write(f"data: {json.dumps(obs, ensure_ascii=False)}\n\n".encode("utf-8"))
+                last_write = loop.time()
+        except (ConnectionResetError, asyncio.CancelledError, StopAsyncIteration):
+            pass
+        finally:
+            if next_obs is not None:
+                next_obs.cancel()
+                await asyncio.gather(next_obs, return_exceptions=True)
+            await stream.aclose()
+
+        return response
+
+    async def _call_sessions_handler(self, op: str, session_id: Optional[str]) -> web.Response:
+        if not self.sessions_handler:
+            return web.json_response(
+                {"error": "Sessions handler not configured"},
+                status=503
+            )
+        result = await self.sessions_handler(op, session_id)
+        return web.json_response(result)
+
+    async def _handle_sessions_list(self, request: web.Request) -> web.Response:
+        """处理 GET /sessions 请求"""
+        return await self._call_sessions_handler("list", None)
+
+    async def _handle_sessions_acquire(self, request: web.Request) -> web.Response:
+        """处理 POST /sessions/acquire 请求"""
+        return await self._call_sessions_handler("acquire", None)
+
+    async def _handle_sessions_release(self, request: web.Request) -> web.Response:
+        """处理 POST /sessions/{session_id}/release 请求"""
+        return await self._call_sessions_handler("release", request.match_info["session_id"])
+
+    async def _handle_sessions_recycle(self, request: web.Request) -> web.Response:
+        """处理 POST /sessions/{session_id}/recycle 请求"""
+        return await self._call_sessions_handler("recycle", request.match_info["session_id"])
+
+    async def _handle_sessions_reset(self, request: web.Request) -> web.Response:
+        """处理 POST /sessions/{session_id}/reset 请求"""
+        return await self._call_sessions_handler("reset", request.match_info["session_id"])
@@ -110,12 +110,13 @@ class MultiWaveDeepTester:
             self.log(f"发送动作失败: {e}", "ERROR")
             return {"error": str(e)}
 
-    async def get_observations(self):
-        """获取游戏观测数据"""
+    async def get_observations(self, wait: float = 0.0):
+        """获取游戏观测数据（wait > 0 时长轮询，有新观测立即返回）"""
         try:
             async with self.session.get(
                 f"{self.base_url}/observations",
-                timeout=aiohttp.ClientTimeout(total=10)
+                params={"wait": wait} if wait > 0 else None,
+                timeout=aiohttp.ClientTimeout(total=10 + wait)
             ) as resp:
                 data = await resp.json()
                 obs_list = data.get("observations", [])
@@ -136,11 +137,13 @@ class MultiWaveDeepTester:
     async def poll_observations(self, duration: float = 2.0) -> List[str]:
         """轮询观测数据一段时间"""
         all_obs = []
-        start = time.time()
-        while time.time() - start < duration:
-            obs = await self.get_observations()
+        deadline = time.time() + duration
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            obs = await self.get_observations(wait=remaining)
             all_obs.extend(obs)
-            await asyncio.sleep(0.2)
         return all_obs
 
     async def wait_for_game_ready(self, timeout: float = 30.0) -> bool:
@@ -0,0 +1,167 @@
+"""有界观测缓冲区 - 环形缓冲 + 丢弃策略 + 统计指标
+
+替代无界的 asyncio.Queue：客户端长时间不读取时内存保持平稳，
+溢出时按策略丢弃旧消息，并记录丢弃计数供 /status 查询。
+"""
+import asyncio
+from collections import deque
+from enum import Enum, IntEnum
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+
+class DropPolicy(Enum):
+    """缓冲区满时的丢弃策略"""
+    DROP_OLDEST = "drop_oldest"      # 丢弃最旧的一条
+    DROP_PRIORITY = "drop_priority"  # 丢弃优先级最低的最旧一条；新消息优先级更低时丢弃新消息
+
+
+class ObsPriority(IntEnum):
+    """观测优先级（数值越大越重要）"""
+    LOW = 0        # 心跳/状态同步
+    NORMAL = 1     # 普通战报
+    HIGH = 2       # 波次、Boss、危险警告、游戏结束
+    CRITICAL = 3   # 崩溃报告、系统提示
+
+
+# 叙事文本前缀 -> 优先级
+_PRIORITY_PREFIXES: List[Tuple[str, ObsPriority]] = [
+    ("【系统严重报错】", ObsPriority.CRITICAL),
+    ("【系统提示】", ObsPriority.CRITICAL),
+    ("【错误】", ObsPriority.CRITICAL),
+    ("【游戏结束】", ObsPriority.HIGH),
+    ("【波次事件】", ObsPriority.HIGH),
+    ("【Boss出现】", ObsPriority.HIGH),
+    ("【危险警告】", ObsPriority.HIGH),
+    ("【状态同步】", ObsPriority.LOW),
+]
+
+
+def observation_priority(text: Any) -> ObsPriority:
+    """按叙事文本前缀判断观测优先级"""
+    text = str(text)
+    for prefix, priority in _PRIORITY_PREFIXES:
+        if text.startswith(prefix):
+            return priority
+    return ObsPriority.NORMAL
+
+
+class ObservationBuffer:
+    """
+    有界环形缓冲区，接口与 asyncio.Queue 的常用子集兼容
+    （put_nowait / get_nowait / get / empty / qsize）
+
+    内部按优先级分桶存放 (序号, 元素)，出队时按全局到达顺序返回。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        priority_fn: Callable[[Any], ObsPriority] = observation_priority
+    ):
+        if maxsize < 1:
+            raise ValueError("缓冲区大小必须 >= 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.priority_fn = priority_fn
+
+        self._buckets: Dict[ObsPriority, Deque[Tuple[int, Any]]] = {p: deque() for p in ObsPriority}
+        self._size = 0
+        self._seq = 0
+        self._getters: Deque[asyncio.Future] = deque()
+
+        # 统计指标
+        self.received = 0
+        self.dropped = 0
+        self.dropped_by_priority: Dict[ObsPriority, int] = {p: 0 for p in ObsPriority}
+        self.high_water = 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def put_nowait(self, item: Any):
+        """放入一条观测，缓冲区满时按策略丢弃，永不阻塞"""
+        self.received += 1
+        priority = self.priority_fn(item) if self.policy == DropPolicy.DROP_PRIORITY else ObsPriority.NORMAL
+
+        if self._size >= self.maxsize:
+            if self.policy == DropPolicy.DROP_PRIORITY:
+                lowest = min(p for p, bucket in self._buckets.items() if bucket)
+                if priority < lowest:
+                    # 新消息比缓冲区里的都不重要，直接丢弃新消息
+                    self._record_drop(priority)
+                    return
+                self._drop_head(lowest)
+            else:
+                self._drop_head(self._oldest_bucket())
+
+        self._buckets[priority].append((self._seq, item))
+        self._seq += 1
+        self._size += 1
+        self.high_water = max(self.high_water, self._size)
+        self._wakeup_next()
+
+    def get_nowait(self) -> Any:
+        """按到达顺序取出一条观测，为空时抛出 asyncio.QueueEmpty"""
+        if self._size == 0:
+            raise asyncio.QueueEmpty
+        _, item = self._buckets[self._oldest_bucket()].popleft()
+        self._size -= 1
+        return item
+
+    async def get(self) -> Any:
+        """取出一条观测，为空时等待"""
+        while self.empty():
+            waiter = asyncio.get_running_loop().create_future()
+            self._getters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    self._getters.remove(waiter)
+                except ValueError:
+                    pass
+                # 被取消前已被唤醒，把唤醒机会让给下一个等待者
+                if not self.empty() and not waiter.cancelled():
+                    self._wakeup_next()
+                raise
+        return self.get_nowait()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓冲区指标（用于 /status）"""
+        return {
+            "size": self._size,
+            "capacity": self.maxsize,
+            "policy": self.policy.value,
+            "received": self.received,
+            "dropped": self.dropped,
+            "dropped_by_priority": {p.name.lower(): n for p, n in self.dropped_by_priority.items()},
+            "high_water": self.high_water,
+        }
+
+    def _oldest_bucket(self) -> ObsPriority:
+        """头部元素序号最小（最早到达）的非空桶"""
+        return min(
+            (p for p, bucket in self._buckets.items() if bucket),
+            key=lambda p: self._buckets[p][0][0]
+        )
+
+    def _drop_head(self, priority: ObsPriority):
+        self._buckets[priority].popleft()
+        self._size -= 1
+        self._record_drop(priority)
+
+    def _record_drop(self, priority: ObsPriority):
+        self.dropped += 1
+        self.dropped_by_priority[priority] += 1
+
+    def _wakeup_next(self):
+        while self._getters:
+            waiter = self._getters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
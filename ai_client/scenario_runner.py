@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+场景回归并行运行器 - 在进程池中并发执行 ai_client 下的测试/验证脚本
+
+以前 80 个左右的 *_test.py / *_verify_*.py 只能逐个手动运行，且各自写死端口。
+本模块自动发现这些脚本，用 utils.reserve_ports 为每个场景预留互不重叠的
+HTTP / Godot 端口，在 N 个工作进程中并发运行，最后把通过/失败与耗时汇总为一份
+JSON 报告和一份 JUnit XML 报告。
+
+按脚本源码把场景分为三类：
+- self_hosted: 脚本自己启动 ai_game_client.py，运行器把 HTTP 端口作为 argv[1] 传入，
+               Godot 端口和会话日志目录通过环境变量 AI_GODOT_PORT / AI_LOG_DIR 传给网关
+- attached:    脚本连接已运行的网关，由工作进程先启动一个独占的 AIGameClient，
+               等 /status 就绪后再运行脚本
+- offline:     不连接网关（配置/数据检查），直接运行
+
+不从 argv[1] 读取 HTTP 端口的脚本只能使用写死的端口，这些场景放在同一条串行通道中依次执行。
+
+脚本按相对路径读取 src/、data/ 并写出 logs/、docs/player_reports/ 下的报告，
+因此每个场景在日志目录下的独立工作目录中运行（src/、data/ 以符号链接指向项目），
+生成的文件不会落进源码树。
+
+用法:
+    # 全部场景，默认工作进程数为 CPU 核数的一半
+    python3 ai_client/scenario_runner.py
+
+    # 8 个工作进程，只跑名称包含 eagle 或 viper 的场景
+    python3 ai_client/scenario_runner.py -j 8 -k eagle -k viper
+
+    # 只列出发现的场景及其分类
+    python3 ai_client/scenario_runner.py --list
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Dict, Any
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client.utils import PortReservation, reserve_ports
+
+CLIENT_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = CLIENT_DIR.parent
+
+# 场景按相对路径读取的项目目录，在工作目录中以符号链接提供
+SCENARIO_INPUT_DIRS = ("src", "data")
+
+SCENARIO_PATTERNS = ("*_test.py", "*_test_*.py", "*_verify_*.py")
+
+# 写死端口的识别：http_port=9998 / HTTP_PORT = 8080
+_FIXED_PORT_RE = re.compile(r"\b(?:http_port|HTTP_PORT)\s*(?::\s*int\s*)?=\s*(\d{4,5})\b")
+# 只有把 argv[1] 当作 HTTP 端口的脚本才能接收运行器分配的端口；
+# 读取 sys.argv 的其它脚本（task_id、单位名等位置参数）仍按写死端口处理
+_ARGV_PORT_RE = re.compile(r"\bhttp_port\s*=\s*int\(\s*sys\.argv\[1\]\s*\)")
+# 继承其它脚本中的测试器类：from ai_client.eagle_totem_test import EagleTester
+_TESTER_IMPORT_RE = re.compile(r"^\s*from\s+(?:ai_client\.)?(\w+)\s+import\s+[^\n]*\b\w*Tester\b", re.M)
+
+# 网关就绪等待与收尾
+GATEWAY_READY_TIMEOUT = 120.0
+GATEWAY_STOP_TIMEOUT = 10.0
+
+
+@dataclass
+class Scenario:
+    """一个待运行的场景脚本"""
+    name: str
+    path: str
+    mode: str                 # self_hosted / attached / offline
+    accepts_port: bool        # 是否从 argv[1] 读取 HTTP 端口
+    http_port: int = 0
+    godot_port: int = 0
+
+    @property
+    def serial(self) -> bool:
+        """写死端口的联网场景只能串行"""
+        return self.mode != "offline" and not self.accepts_port
+
+
+@dataclass
+class ScenarioResult:
+    """单个场景的运行结果"""
+    name: str
+    path: str
+    mode: str
+    status: str               # passed / failed / timeout / error
+    returncode: Optional[int]
+    duration: float
+    http_port: int
+    log_file: str
+    message: str = ""
+
+
+def _detect_mode(source: str, seen: frozenset = frozenset()) -> str:
+    """按源码判断联网方式；导入的测试器类沿用其所在脚本的方式"""
+    if "ai_game_client" in source:
+        return "self_hosted"
+    if "127.0.0.1" in source or "localhost" in source:
+        return "attached"
+    for module in _TESTER_IMPORT_RE.findall(source):
+        base = CLIENT_DIR / f"{module}.py"
+        if module in seen or not base.exists():
+            # 找不到来源时按联网处理，宁可串行也不要无网关并行
+            return "attached"
+        mode = _detect_mode(base.read_text(encoding="utf-8", errors="replace"), seen | {module})
+        return mode if mode != "offline" else "attached"
+    return "offline"
+
+
+def _fixed_port(source: str) -> int:
+    """写死的 HTTP 端口；测试器类的默认端口写在被导入的脚本里"""
+    match = _FIXED_PORT_RE.search(source)
+    if match:
+        return int(match.group(1))
+    for module in _TESTER_IMPORT_RE.findall(source):
+        base = CLIENT_DIR / f"{module}.py"
+        if base.exists():
+            match = _FIXED_PORT_RE.search(base.read_text(encoding="utf-8", errors="replace"))
+            if match:
+                return int(match.group(1))
+    return 8080
+
+
+def classify(path: Path) -> Scenario:
+    """按脚本源码判断场景类型与端口"""
+    source = path.read_text(encoding="utf-8", errors="replace")
+    scenario = Scenario(
+        name=path.stem,
+        path=str(path),
+        mode=_detect_mode(source),
+        accepts_port=bool(_ARGV_PORT_RE.search(source))
+    )
+    if scenario.serial:
+        scenario.http_port = _fixed_port(source)
+    return scenario
+
+
+def discover(client_dir: Path = CLIENT_DIR, keywords: Optional[List[str]] = None) -> List[Scenario]:
+    """发现场景脚本；keywords 非空时只保留名称包含任一关键字的脚本"""
+    paths = set()
+    for pattern in SCENARIO_PATTERNS:
+        paths.update(client_dir.glob(pattern))
+
+    scenarios = []
+    for path in sorted(paths):
+        if keywords and not any(k in path.stem for k in keywords):
+            continue
+        scenarios.append(classify(path))
+    return scenarios
+
+
+def assign_ports(scenarios: List[Scenario]) -> List[PortReservation]:
+    """为联网场景预留端口
+
+    返回的占位套接字需保持到全部场景结束：网关和 Godot 以 SO_REUSEADDR 绑定，
+    不受占位影响，而其它进程在此期间不会再分到这些端口。
+    """
+    networked = [s for s in scenarios if s.mode != "offline"]
+    # 写死 HTTP 端口的场景只需要 Godot 端口
+    needed = sum(1 if s.serial else 2 for s in networked)
+    reservations = reserve_ports(needed) if needed else []
+    ports = iter(r.port for r in reservations)
+    for scenario in networked:
+        if not scenario.serial:
+            scenario.http_port = next(ports)
+        scenario.godot_port = next(ports)
+    return reservations
+
+
+# ===== 工作进程 =====
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    """结束进程及其派生的网关/Godot 子进程"""
+    if hasattr(os, "killpg"):
+        # 脚本正常退出后其进程组里仍可能残留网关/Godot
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    elif proc.poll() is None:
+        proc.kill()
+    try:
+        proc.wait(timeout=GATEWAY_STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def _prepare_workdir(scenario: Scenario, log_dir: Path) -> Path:
+    """场景的工作目录：脚本写出的日志和报告留在这里，而不是项目的 docs/、logs/"""
+    workdir = log_dir / "workdir" / scenario.name
+    workdir.mkdir(parents=True, exist_ok=True)
+    for name in SCENARIO_INPUT_DIRS:
+        link = workdir / name
+        if not link.exists() and not link.is_symlink():
+            try:
+                link.symlink_to(PROJECT_DIR / name, target_is_directory=True)
+            except OSError:
+                # 不支持符号链接时，依赖这些目录的脚本会自行报错
+                pass
+    return workdir
+
+
+def _popen(cmd: List[str], log, env: Dict[str, str], cwd: Path) -> subprocess.Popen:
+    # 独立进程组，超时或收尾时可以连同孙进程一起结束
+    return subprocess.Popen(
+        cmd,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        cwd=str(cwd),
+        env=env,
+        start_new_session=True
+    )
+
+
+def _wait_gateway_ready(http_port: int, gateway: subprocess.Popen, timeout: float) -> bool:
+    """轮询网关 /status，直到 Godot 运行且 WebSocket 已连接"""
+    deadline = time.monotonic() + timeout
+    url = f"http://127.0.0.1:{http_port}/status"
+    while time.monotonic() < deadline:
+        if gateway.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=3) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+                if data.get("godot_running") and data.get("ws_connected"):
+                    return True
+        except (OSError, ValueError):
+            pass
+        time.sleep(1.0)
+    return False
+
+
+def _start_gateway(scenario: Scenario, log_path: Path, env: Dict[str, str], cwd: Path) -> subprocess.Popen:
+    """为 attached 场景启动独占的 AIGameClient"""
+    with open(log_path, "w", encoding="utf-8") as log:
+        return _popen([
+            sys.executable, str(CLIENT_DIR / "ai_game_client.py"),
+            "--project", str(PROJECT_DIR),
+            "--http-port", str(scenario.http_port),
+            "--godot-port", str(scenario.godot_port),
+            "--no-echo"
+        ], log, env, cwd)
+
+
+def run_scenario(scenario: Scenario, log_dir: str, timeout: float) -> ScenarioResult:
+    """在当前工作进程中运行一个场景（供 ProcessPoolExecutor 调用）"""
+    log_path = Path(log_dir).resolve() / f"{scenario.name}.log"
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+    if scenario.godot_port:
+        env["AI_GODOT_PORT"] = str(scenario.godot_port)
+
+    cmd = [sys.executable, scenario.path]
+    if scenario.accepts_port and scenario.mode != "offline":
+        cmd.append(str(scenario.http_port))
+
+    start = time.monotonic()
+    gateway = None
+    status, returncode, message = "error", None, ""
+
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            workdir = _prepare_workdir(scenario, log_path.parent)
+            # 自带网关的脚本以项目目录为 cwd 启动 ai_game_client.py，会话日志目录须显式指定
+            env["AI_LOG_DIR"] = str(workdir / "logs")
+            if scenario.mode == "attached":
+                gateway = _start_gateway(scenario, log_path.with_suffix(".gateway.log"), env, workdir)
+                if not _wait_gateway_ready(scenario.http_port, gateway, GATEWAY_READY_TIMEOUT):
+                    message = "网关未就绪"
+
+            if not message:
+                proc = _popen(cmd, log, env, workdir)
+                try:
+                    returncode = proc.wait(timeout=timeout)
+                    status = "passed" if returncode == 0 else "failed"
+                    if returncode != 0:
+                        message = f"退出码 {returncode}"
+                except subprocess.TimeoutExpired:
+                    status = "timeout"
+                    message = f"超过 {timeout:.0f} 秒未结束"
+                finally:
+                    _kill_group(proc)
+        except OSError as e:
+            message = f"启动失败: {e}"
+        finally:
+            if gateway is not None:
+                _kill_group(gateway)
+
+    return ScenarioResult(
+        scenario.name, scenario.path, scenario.mode, status, returncode,
+        time.monotonic() - start, scenario.http_port, str(log_path), message
+    )
+
+
+def run_serial(scenarios: List[Scenario], log_dir: str, timeout: float) -> List[ScenarioResult]:
+    """依次运行写死端口的场景"""
+    return [run_scenario(s, log_dir, timeout) for s in scenarios]
+
+
+# ===== 调度与报告 =====
+
+def run_all(scenarios: List[Scenario], workers: int, log_dir: Path, timeout: float) -> List[ScenarioResult]:
+    """可并行的场景各占一个任务，串行场景合并为一个任务，共用同一个进程池"""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    parallel = [s for s in scenarios if not s.serial]
+    serial = [s for s in scenarios if s.serial]
+
+    results: List[ScenarioResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_scenario, s, str(log_dir), timeout): [s] for s in parallel}
+        if serial:
+            futures[pool.submit(run_serial, serial, str(log_dir), timeout)] = serial
+
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = [
+                    ScenarioResult(s.name, s.path, s.mode, "error", None, 0.0, s.http_port, "", str(e))
+                    for s in futures[future]
+                ]
+            for result in outcome if isinstance(outcome, list) else [outcome]:
+                print(f"[{result.status.upper():7}] {result.name} ({result.duration:.1f}s)"
+                      + (f" - {result.message}" if result.message else ""), flush=True)
+                results.append(result)
+
+    results.sort(key=lambda r: r.name)
+    return results
+
+
+def summarize(results: List[ScenarioResult]) -> Dict[str, Any]:
+    summary = {"total": len(results), "passed": 0, "failed": 0, "timeout": 0, "error": 0}
+    for result in results:
+        summary[result.status] += 1
+    return summary
+
+
+def write_json_report(path: Path, results: List[ScenarioResult], workers: int, wall_time: float) -> None:
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "wall_time": round(wall_time, 3),
+        # 各场景耗时之和；与 wall_time 之比即并行加速比
+        "total_scenario_time": round(sum(r.duration for r in results), 3),
+        "summary": summarize(results),
+        "results": [asdict(r) for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _log_tail(log_file: str, lines: int = 50) -> str:
+    try:
+        return "\n".join(Path(log_file).read_text(encoding="utf-8", errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def write_junit_report(path: Path, results: List[ScenarioResult], wall_time: float) -> None:
+    summary = summarize(results)
+    suite = ET.Element("testsuite", {
+        "name": "ai_client.scenarios",
+        "tests": str(summary["total"]),
+        "failures": str(summary["failed"]),
+        "errors": str(summary["timeout"] + summary["error"]),
+        "time": f"{wall_time:.3f}",
+    })
+    for result in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"ai_client.{result.mode}",
+            "name": result.name,
+            "time": f"{result.duration:.3f}",
+        })
+        if result.status == "failed":
+            ET.SubElement(case, "failure", {"message": result.message}).text = _log_tail(result.log_file)
+        elif result.status in ("timeout", "error"):
+            ET.SubElement(case, "error", {"type": result.status, "message": result.message}).text = _log_tail(result.log_file)
+        ET.SubElement(case, "system-out").text = result.log_file
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="并行运行 ai_client 场景回归脚本")
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="工作进程数，每个进程同一时间运行一个网关 + Godot (默认: CPU 核数的一半)"
+    )
+    parser.add_argument(
+        "-k", "--keyword",
+        action="append",
+        default=[],
+        help="只运行名称包含该关键字的场景，可重复"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=1800.0,
+        help="单个场景的超时秒数 (默认: 1800)"
+    )
+    parser.add_argument(
+        "--log-dir",
+        default="logs/scenarios",
+        help="每个场景的输出日志目录 (默认: logs/scenarios)"
+    )
+    parser.add_argument(
+        "--json",
+        default="logs/scenarios/report.json",
+        help="JSON 汇总报告路径 (默认: logs/scenarios/report.json)"
+    )
+    parser.add_argument(
+        "--junit",
+        default="logs/scenarios/report.xml",
+        help="JUnit XML 报告路径 (默认: logs/scenarios/report.xml)"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="只列出发现的场景及其分类，不运行"
+    )
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers 必须 >= 1")
+
+    scenarios = discover(keywords=args.keyword)
+    if args.list:
+        for s in scenarios:
+            print(f"{s.name:45} {s.mode:12} {'串行(端口 %d)' % s.http_port if s.serial else '并行'}")
+        print(f"共 {len(scenarios)} 个场景")
+        return 0
+
+    if not scenarios:
+        print("没有匹配的场景")
+        return 1
+
+    reservations = assign_ports(scenarios)
+    print(f"发现 {len(scenarios)} 个场景，{args.workers} 个工作进程"
+          f"（其中 {sum(s.serial for s in scenarios)} 个写死端口的场景串行执行）")
+
+    start = time.monotonic()
+    try:
+        results = run_all(scenarios, args.workers, Path(args.log_dir), args.timeout)
+    finally:
+        for reservation in reservations:
+            reservation.release()
+    wall_time = time.monotonic() - start
+
+    write_json_report(Path(args.json), results, args.workers, wall_time)
+    write_junit_report(Path(args.junit), results, wall_time)
+
+    summary = summarize(results)
+    print(f"\n通过 {summary['passed']}/{summary['total']}，失败 {summary['failed']}，"
+          f"超时 {summary['timeout']}，错误 {summary['error']}，总耗时 {wall_time:.1f}s")
+    print(f"报告: {args.json} / {args.junit}")
+    return 0 if summary["passed"] == summary["total"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""会话日志异步写入器 - 批量刷盘、按大小/时间轮转、压缩历史分段
+
+HTTP 处理函数只把观测追加到内存缓冲，由后台任务定期在线程池中批量写盘，
+磁盘 I/O 不会阻塞事件循环。
+"""
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import time
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class LogCompression(Enum):
+    """轮转后历史分段的压缩方式"""
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"  # 需要安装 zstandard，未安装时退回 gzip
+
+
+class SessionLogWriter:
+    """
+    会话日志写入器
+
+    - write() 只追加到内存，立即返回
+    - 后台任务每 flush_interval 秒（或缓冲超过 flush_lines 行时）批量写入
+    - 当前文件超过 max_bytes 或存在超过 rotate_interval 秒后轮转为
+      <stem>.<n>.log，并按 compression 压缩；最多保留 backup_count 个历史分段
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = 0.5,
+        flush_lines: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+        rotate_interval: float = 0,
+        backup_count: int = 10,
+        compression: LogCompression = LogCompression.GZIP
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+
+        if compression == LogCompression.ZSTD and zstandard is None:
+            logger.warning("未安装 zstandard，日志压缩退回 gzip")
+            compression = LogCompression.GZIP
+        self.compression = compression
+
+        self._pending: List[str] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._segment = 0
+        self._opened_at = time.time()
+
+        # 统计指标
+        self.lines_written = 0
+        self.rotations = 0
+
+    def write(self, lines: List[str]):
+        """追加若干行到写缓冲（非阻塞）"""
+        if not lines or self._closed:
+            return
+        self._pending.extend(str(line) for line in lines)
+
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+        if len(self._pending) >= self.flush_lines:
+            self._wakeup.set()
+
+    async def _flush_loop(self):
+        """后台刷盘循环"""
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """把当前缓冲批量写入磁盘（在线程池中执行）"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_batch, batch)
+        except Exception as e:
+            logger.error(f"写入日志文件失败: {e}")
+
+    def _write_batch(self, batch: List[str]):
+        """线程池中执行：写入一批行并按需轮转"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(batch) + "\n")
+        self.lines_written += len(batch)
+
+        if self._should_rotate():
+            self._rotate()
+
+    def _should_rotate(self) -> bool:
+        if self.max_bytes > 0 and self.path.stat().st_size >= self.max_bytes:
+            return True
+        if self.rotate_interval > 0 and time.time() - self._opened_at >= self.rotate_interval:
+            return True
+        return False
+
+    def _rotate(self):
+        """轮转当前文件：重命名为历史分段、压缩、清理过旧分段"""
+        self._segment += 1
+        segment = self.path.with_name(f"{self.path.stem}.{self._segment}{self.path.suffix}")
+        os.replace(self.path, segment)
+        self._opened_at = time.time()
+        self.rotations += 1
+
+        if self.compression == LogCompression.GZIP:
+            compressed = segment.with_name(segment.name + ".gz")
+            with open(segment, "rb") as src, gzip.open(compressed, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            segment.unlink()
+        elif self.compression == LogCompression.ZSTD:
+            compressed = segment.with_name(segment.name + ".zst")
+            with open(segment, "rb") as src, open(compressed, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+            segment.unlink()
+
+        self._prune_segments()
+
+    def _prune_segments(self):
+        """只保留最近 backup_count 个历史分段"""
+        if self.backup_count <= 0:
+            return
+        expired = self._segment - self.backup_count
+        if expired < 1:
+            return
+        for suffix in ("", ".gz", ".zst"):
+            old = self.path.with_name(f"{self.path.stem}.{expired}{self.path.suffix}{suffix}")
+            if old.exists():
+                old.unlink()
+
+    async def close(self):
+        """停止后台任务并写出剩余缓冲"""
+        self._closed = True
+        if self._task:
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
@@ -17,6 +17,8 @@ import time
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from ai_client.events import GameEvent, EventType
+
 
 @dataclass
 class ShopUnit:
@@ -132,6 +134,34 @@ class ShopHelper:
 
         return None
 
+    def update_from_events(self, events: List[GameEvent]) -> Optional[ShopState]:
+        """
+        从结构化事件中更新商店状态（网关以 --events 启动时可用，无需正则解析）
+
+        Args:
+            events: GameEvent 列表（GET /events 的结果可用 GameEvent.from_dict 还原）
+
+        Returns:
+            最近一次 ShopRefreshed 事件对应的商店状态，没有则返回None
+        """
+        for event in reversed(events):
+            if event.type != EventType.SHOP_REFRESHED:
+                continue
+
+            unit_keys = event.data.get("shop_units", [])
+            costs = event.data.get("shop_costs", [])
+            units = [
+                ShopUnit(index=idx, unit_key=key, cost=int(costs[idx]) if idx < len(costs) else 0)
+                for idx, key in enumerate(unit_keys)
+                if key
+            ]
+            shop = ShopState(units=units, timestamp=event.timestamp)
+            self._current_shop = shop
+            self._shop_history.append(shop)
+            return shop
+
+        return None
+
     def get_current_shop(self) -> Optional[ShopState]:
         """获取当前商店状态"""
         return self._current_shop
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+离线商店/经济模拟器 - 不启动 Godot，按 BoardController.refresh_shop 的规则批量模拟
+
+单位数据直接读取 data/units/*.json（与 DataManager 相同的加载方式），
+刷新逻辑与 BoardController.refresh_shop 保持一致：
+- 单位池按阵营划分：主阵营 / 次级图腾 / 第三图腾 / 通用
+- 混合比例：单阵营 主70% + 通用30%；双阵营 主40% + 次30% + 通用30%；
+  三阵营 主40% + 次25% + 第三20% + 通用15%；某个池为空时按相同的级联顺序落到下一个池
+- 锁定的槽位保留原单位
+- 每次刷新花费 shop_refresh_cost（默认 10 金币）
+- 两个同名同级单位合成为高一级单位；出售退款 = int(基础价格 × 等级 × 0.5)
+
+所有模拟都用 NumPy 按批向量化，百万次商店刷新在数秒内完成。
+
+用法:
+    # 狼图腾开局，平均刷新多少次能见到 wolf
+    python ai_client/shop_sim.py --totem wolf_totem --target wolf --trials 1000000
+
+    # 三图腾阵容凑齐 wolf 3级 + viper 2级 + butterfly 1级 需要花多少金币
+    python ai_client/shop_sim.py --totem wolf_totem --secondary viper_totem --third butterfly_totem \\
+        --build wolf:3,viper:2,butterfly:1
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+UNITS_DIR = Path(__file__).parent.parent / "data" / "units"
+
+# 与 Constants.gd / SessionData.gd 保持一致
+SHOP_SIZE = 4
+BENCH_SIZE = 8
+STARTING_GOLD = 150
+DEFAULT_REFRESH_COST = 10
+
+# 池编号
+POOL_MAIN, POOL_SECONDARY, POOL_THIRD, POOL_UNIVERSAL, POOL_ALL = range(5)
+
+
+def copies_for_level(level: int) -> int:
+    """合成到指定等级需要的 1 级单位数量（两两合成）"""
+    return 2 ** (max(1, level) - 1)
+
+
+def sell_refund(cost: int, level: int) -> int:
+    """出售退款：基础价格 × 等级 × 50%（与 BoardController.sell_unit 一致）"""
+    return int(cost * level * 0.5)
+
+
+def wave_income(wave: int) -> int:
+    """波次结束固定收入：20 + 波次 × 5（与 GameManager._finish_wave_process 一致）"""
+    return 20 + wave * 5
+
+
+@dataclass
+class UnitCatalog:
+    """单位目录：单位 key、阵营、1 级价格"""
+    keys: List[str]
+    factions: List[str]
+    costs: np.ndarray
+
+    @classmethod
+    def load(cls, units_dir: Path = UNITS_DIR) -> "UnitCatalog":
+        """读取 data/units/*.json；同名单位以后加载的文件为准（与 DataManager 一致）"""
+        units: Dict[str, dict] = {}
+        for path in sorted(Path(units_dir).glob("*.json")):
+            with open(path, encoding="utf-8") as f:
+                units.update(json.load(f))
+
+        keys = list(units)
+        factions = [units[k].get("faction", "universal") for k in keys]
+        # DataManager 把 levels["1"] 的属性复制到根级别，cost 以 1 级为准
+        costs = np.array([
+            units[k].get("levels", {}).get("1", {}).get("cost", units[k].get("cost", 0))
+            for k in keys
+        ], dtype=np.int64)
+        return cls(keys=keys, factions=factions, costs=costs)
+
+    def index(self, unit_key: str) -> int:
+        try:
+            return self.keys.index(unit_key)
+        except ValueError:
+            raise KeyError(f"未知单位: {unit_key}") from None
+
+    def cost(self, unit_key: str) -> int:
+        return int(self.costs[self.index(unit_key)])
+
+
+@dataclass
+class SimResult:
+    """一批模拟的结果（每个元素对应一次试验）"""
+    refreshes: np.ndarray
+    gold_spent: np.ndarray
+    completed: np.ndarray
+    elapsed: float = 0.0
+    rolls: int = 0
+
+    def summary(self) -> Dict[str, float]:
+        done = self.completed
+        refreshes = self.refreshes[done]
+        gold = self.gold_spent[done]
+        result = {
+            "trials": int(len(self.completed)),
+            "completion_rate": float(done.mean()) if len(done) else 0.0,
+            "shop_rolls": self.rolls,
+            "elapsed": round(self.elapsed, 3),
+        }
+        if len(refreshes):
+            result.update({
+                "refreshes_mean": float(refreshes.mean()),
+                "refreshes_p50": float(np.percentile(refreshes, 50)),
+                "refreshes_p90": float(np.percentile(refreshes, 90)),
+                "refreshes_p99": float(np.percentile(refreshes, 99)),
+                "gold_mean": float(gold.mean()),
+                "gold_p50": float(np.percentile(gold, 50)),
+                "gold_p90": float(np.percentile(gold, 90)),
+                "gold_p99": float(np.percentile(gold, 99)),
+            })
+        return result
+
+
+class ShopSimulator:
+    """
+    商店刷新模拟器
+
+    使用示例:
+        catalog = UnitCatalog.load()
+        sim = ShopSimulator(catalog, "wolf_totem", seed=42)
+
+        shops = sim.roll(1_000_000)                 # (1000000, 4) 单位索引
+        p = sim.slot_probabilities()["wolf"]         # 单个槽位出现 wolf 的概率
+        result = sim.refreshes_to_find("wolf", trials=100_000)
+        print(result.summary())
+    """
+
+    def __init__(
+        self,
+        catalog: UnitCatalog,
+        main_faction: str,
+        secondary_faction: str = "",
+        third_faction: str = "",
+        refresh_cost: int = DEFAULT_REFRESH_COST,
+        seed: Optional[int] = None
+    ):
+        self.catalog = catalog
+        self.main_faction = main_faction
+        self.secondary_faction = secondary_faction
+        self.third_faction = third_faction
+        self.refresh_cost = refresh_cost
+        self.rng = np.random.default_rng(seed)
+
+        self.pools = self._build_pools()
+        self.cascade = self._build_cascade()
+
+        # 把所有池拼成一个数组，按 (起始偏移, 大小) 索引，便于向量化抽取
+        self._pool_members = np.concatenate([self.pools[p] for p in range(5)])
+        sizes = np.array([len(self.pools[p]) for p in range(5)], dtype=np.int64)
+        self._pool_sizes = sizes
+        self._pool_starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    def _build_pools(self) -> Dict[int, np.ndarray]:
+        """按 refresh_shop 的 if/elif 顺序把单位划分到各个池"""
+        pools: Dict[int, List[int]] = {p: [] for p in range(5)}
+        for i, faction in enumerate(self.catalog.factions):
+            if faction == self.main_faction:
+                pools[POOL_MAIN].append(i)
+            elif faction == self.secondary_faction and self.secondary_faction != "":
+                pools[POOL_SECONDARY].append(i)
+            elif faction == self.third_faction and self.third_faction != "":
+                pools[POOL_THIRD].append(i)
+            elif faction == "universal":
+                pools[POOL_UNIVERSAL].append(i)
+            pools[POOL_ALL].append(i)
+        return {p: np.array(units, dtype=np.int64) for p, units in pools.items()}
+
+    def _build_cascade(self) -> List[Tuple[int, float]]:
+        """(池, 阈值) 级联：第一个 池非空 且 roll < 阈值 的分支胜出"""
+        inf = float("inf")
+        if self.third_faction != "" and len(self.pools[POOL_THIRD]) > 0:
+            return [
+                (POOL_MAIN, 0.4), (POOL_SECONDARY, 0.65), (POOL_THIRD, 0.85),
+                (POOL_UNIVERSAL, inf), (POOL_MAIN, inf), (POOL_SECONDARY, inf), (POOL_THIRD, inf),
+            ]
+        if self.secondary_faction != "" and len(self.pools[POOL_SECONDARY]) > 0:
+            return [
+                (POOL_MAIN, 0.4), (POOL_SECONDARY, 0.7),
+                (POOL_UNIVERSAL, inf), (POOL_MAIN, inf), (POOL_SECONDARY, inf),
+            ]
+        return [(POOL_MAIN, 0.7), (POOL_UNIVERSAL, inf), (POOL_MAIN, inf), (POOL_ALL, inf)]
+
+    def pool_probabilities(self) -> Dict[int, float]:
+        """单个槽位落入各个池的概率"""
+        probs: Dict[int, float] = {}
+        covered = 0.0
+        for pool, threshold in self.cascade:
+            if len(self.pools[pool]) == 0:
+                continue
+            upper = min(threshold, 1.0)
+            if upper > covered:
+                probs[pool] = probs.get(pool, 0.0) + upper - covered
+                covered = upper
+        return probs
+
+    def slot_probabilities(self) -> Dict[str, float]:
+        """单个未锁定槽位出现各单位的概率（解析解，可用于校验模拟结果）"""
+        probs: Dict[str, float] = {}
+        for pool, p in self.pool_probabilities().items():
+            members = self.pools[pool]
+            for i in members:
+                key = self.catalog.keys[i]
+                probs[key] = probs.get(key, 0.0) + p / len(members)
+        return probs
+
+    def roll(self, n: int, locked: Optional[Dict[int, str]] = None) -> np.ndarray:
+        """模拟 n 次商店刷新
+
+        Args:
+            n: 刷新次数
+            locked: {槽位: 单位 key}，锁定槽位保留原单位
+
+        Returns:
+            (n, SHOP_SIZE) 的单位索引数组
+        """
+        rolls = self.rng.random((n, SHOP_SIZE))
+        pool = np.full((n, SHOP_SIZE), -1, dtype=np.int64)
+        for pool_id, threshold in self.cascade:
+            if len(self.pools[pool_id]) == 0:
+                continue
+            mask = pool == -1
+            if threshold != float("inf"):
+                mask &= rolls < threshold
+            pool[mask] = pool_id
+
+        # pick_random：池内均匀抽取
+        picks = (self.rng.random((n, SHOP_SIZE)) * self._pool_sizes[pool]).astype(np.int64)
+        shops = self._pool_members[self._pool_starts[pool] + picks]
+
+        for slot, unit_key in (locked or {}).items():
+            shops[:, slot] = self.catalog.index(unit_key)
+        return shops
+
+    def refreshes_to_find(
+        self,
+        unit_key: str,
+        trials: int = 100000,
+        max_refreshes: int = 1000,
+        locked: Optional[Dict[int, str]] = None
+    ) -> SimResult:
+        """从当前商店开始，刷新多少次才能在商店中见到 unit_key
+
+        当前商店本身也算一次机会（第 0 次刷新），之后每次刷新花费 refresh_cost。
+        """
+        started = time.perf_counter()
+        target = self.catalog.index(unit_key)
+        refreshes = np.zeros(trials, dtype=np.int64)
+        completed = np.zeros(trials, dtype=bool)
+        active = np.arange(trials)
+        rolls = 0
+
+        for step in range(max_refreshes + 1):
+            if len(active) == 0:
+                break
+            shops = self.roll(len(active), locked)
+            rolls += len(active)
+            found = (shops == target).any(axis=1)
+            refreshes[active[found]] = step
+            completed[active[found]] = True
+            active = active[~found]
+        refreshes[active] = max_refreshes
+
+        return SimResult(
+            refreshes=refreshes,
+            gold_spent=refreshes * self.refresh_cost,
+            completed=completed,
+            elapsed=time.perf_counter() - started,
+            rolls=rolls,
+        )
+
+    def gold_to_collect(
+        self,
+        build: Dict[str, int],
+        trials: int = 100000,
+        max_refreshes: int = 2000
+    ) -> SimResult:
+        """凑齐一个阵容（{单位 key: 目标等级}）需要的刷新次数和总金币
+
+        策略：每次刷新后买下商店里所有仍然需要的单位，缺什么继续刷新。
+        金币按无限计算（统计的是总消耗），1 级单位两两合成到目标等级。
+        """
+        started = time.perf_counter()
+        targets = np.array([self.catalog.index(k) for k in build], dtype=np.int64)
+        target_costs = self.catalog.costs[targets]
+        need = np.tile([copies_for_level(lv) for lv in build.values()], (trials, 1)).astype(np.int64)
+
+        refreshes = np.zeros(trials, dtype=np.int64)
+        gold = np.zeros(trials, dtype=np.int64)
+        completed = np.zeros(trials, dtype=bool)
+        active = np.arange(trials)
+        rolls = 0
+
+        for step in range(max_refreshes + 1):
+            if len(active) == 0:
+                break
+            if step > 0:
+                gold[active] += self.refresh_cost
+                refreshes[active] = step
+
+            shops = self.roll(len(active))
+            rolls += len(active)
+            sub_need = need[active]
+            for slot in range(SHOP_SIZE):
+                # (n, 目标数)：该槽位是否是仍然需要的目标单位
+                buy = (shops[:, slot:slot + 1] == targets) & (sub_need > 0)
+                sub_need -= buy
+                gold[active] += buy @ target_costs
+            need[active] = sub_need
+
+            done = (sub_need == 0).all(axis=1)
+            completed[active[done]] = True
+            active = active[~done]
+
+        return SimResult(
+            refreshes=refreshes,
+            gold_spent=gold,
+            completed=completed,
+            elapsed=time.perf_counter() - started,
+            rolls=rolls,
+        )
+
+
+def _parse_build(text: str) -> Dict[str, int]:
+    """解析 "wolf:3,viper:2,butterfly" 形式的阵容"""
+    build: Dict[str, int] = {}
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key, _, level = part.partition(":")
+        build[key.strip()] = int(level) if level else 1
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线商店/经济模拟器")
+    parser.add_argument("--totem", required=True, help="主图腾（如 wolf_totem）")
+    parser.add_argument("--secondary", default="", help="次级图腾")
+    parser.add_argument("--third", default="", help="第三图腾")
+    parser.add_argument("--target", help="统计刷新多少次能见到该单位")
+    parser.add_argument("--build", help="统计凑齐阵容的花费，如 wolf:3,viper:2")
+    parser.add_argument("--trials", type=int, default=100000, help="试验次数 (默认: 100000)")
+    parser.add_argument("--refresh-cost", type=int, default=DEFAULT_REFRESH_COST, help="刷新费用 (默认: 10)")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    args = parser.parse_args()
+
+    catalog = UnitCatalog.load()
+    sim = ShopSimulator(
+        catalog, args.totem, args.secondary, args.third,
+        refresh_cost=args.refresh_cost, seed=args.seed
+    )
+
+    print(f"单位总数: {len(catalog.keys)}")
+    names = {POOL_MAIN: "主阵营", POOL_SECONDARY: "次级", POOL_THIRD: "第三", POOL_UNIVERSAL: "通用", POOL_ALL: "全部"}
+    for pool, p in sim.pool_probabilities().items():
+        print(f"  {names[pool]}池: {len(sim.pools[pool])} 个单位，单槽概率 {p:.0%}")
+
+    try:
+        if args.target:
+            p_slot = sim.slot_probabilities().get(args.target, 0.0)
+            p_shop = 1 - (1 - p_slot) ** SHOP_SIZE
+            print(f"\n{args.target}: 单槽概率 {p_slot:.4f}，每次刷新出现概率 {p_shop:.4f}")
+            result = sim.refreshes_to_find(args.target, trials=args.trials)
+            print(json.dumps(result.summary(), ensure_ascii=False, indent=2))
+
+        if args.build:
+            build = _parse_build(args.build)
+            print(f"\n阵容: {build}")
+            result = sim.gold_to_collect(build, trials=args.trials)
+            print(json.dumps(result.summary(), ensure_ascii=False, indent=2))
+    except KeyError as e:
+        print(f"错误: {e.args[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
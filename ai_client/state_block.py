@@ -0,0 +1,247 @@
+"""共享内存状态块 - Godot 每帧写入的定长二进制棋盘状态
+
+以前读取棋盘状态要发送 {"type": "observe"}，等 AIManager 拼出一段中文描述再用正则解析。
+网关以 --state-block 启动时，每个会话在 tmpfs（/dev/shm）上预先创建一个定长文件，
+通过 --ai-state-file=<路径> 交给 Godot；AIManager 的 StateBlockWriter 每帧原地覆写它。
+本模块 mmap 同一文件，StateBlock.view 是直接指向映射内存的 NumPy 结构化视图（零拷贝），
+snapshot() 按顺序锁取得一致的副本，to_dict() 解码为 GET /state 返回的 JSON。
+
+布局必须与 src/Scripts/Components/StateBlockWriter.gd 一致（小端）：
+
+    偏移  类型       字段
+    0     u32        magic "TAIS"
+    4     u32        version
+    8     u32        seq          顺序锁：写入中为奇数，写完为偶数
+    12    u32        frame        Godot 进程帧号
+    16    i32        gold
+    20    i32        wave
+    24    i32        enemy_count
+    28    u32        flags        bit0 波次进行中，bit1 游戏结束，bit2-5 商店槽位锁定
+    32    f32 x4     mana, max_mana, core_hp, max_core_hp
+    48    u16[4]     shop         商店单位编号
+    56    u16[8]     bench_unit   备战席单位编号
+    72    u8[8]      bench_level
+    80    u16[9,9]   grid_unit    网格单位编号（仅单位左上角格），[y + 4, x + 4]
+    242   u8[9,9]    grid_level
+    323   u8[9,9]    grid_state   GridCell
+
+单位编号为 unit_keys 中的下标 + 1，0 表示空；unit_keys 由 Godot 写入旁路文件 <路径>.json。
+
+用法:
+    block = StateBlock.attach("/dev/shm/tower-ai-1234-0.state")
+    gold = int(block.view["gold"])          # 零拷贝读取单个字段（可能读到写入中的帧）
+    state = block.snapshot()                # 一致的副本
+    print(block.to_dict(state)["grid"]["state"])
+"""
+import json
+import mmap
+import os
+import tempfile
+import time
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # 只有启用状态块时才需要 NumPy
+    np = None
+
+HAS_NUMPY = np is not None
+
+MAGIC = 0x53494154  # "TAIS"
+VERSION = 1
+GRID_SIZE = 9  # 与 Constants.MAP_WIDTH / MAP_HEIGHT 一致
+SHOP_SLOTS = 4
+BENCH_SLOTS = 8
+
+FLAG_WAVE_ACTIVE = 1 << 0
+FLAG_GAME_OVER = 1 << 1
+FLAG_SHOP_LOCKED_SHIFT = 2
+
+
+class GridCell(IntEnum):
+    """grid_state 的取值"""
+    LOCKED = 0    # 未解锁
+    EMPTY = 1     # 已解锁的空地
+    UNIT = 2      # 单位所在格（多格单位的左上角）
+    COVERED = 3   # 被多格单位覆盖
+    SPAWN = 4     # 敌人出生点
+    CORE = 5      # 核心
+
+
+if HAS_NUMPY:
+    STATE_DTYPE = np.dtype([
+        ("magic", "<u4"),
+        ("version", "<u4"),
+        ("seq", "<u4"),
+        ("frame", "<u4"),
+        ("gold", "<i4"),
+        ("wave", "<i4"),
+        ("enemy_count", "<i4"),
+        ("flags", "<u4"),
+        ("mana", "<f4"),
+        ("max_mana", "<f4"),
+        ("core_hp", "<f4"),
+        ("max_core_hp", "<f4"),
+        ("shop", "<u2", (SHOP_SLOTS,)),
+        ("bench_unit", "<u2", (BENCH_SLOTS,)),
+        ("bench_level", "u1", (BENCH_SLOTS,)),
+        ("grid_unit", "<u2", (GRID_SIZE, GRID_SIZE)),
+        ("grid_level", "u1", (GRID_SIZE, GRID_SIZE)),
+        ("grid_state", "u1", (GRID_SIZE, GRID_SIZE)),
+    ])
+    STATE_SIZE = STATE_DTYPE.itemsize
+else:
+    STATE_DTYPE = None
+    STATE_SIZE = 404
+
+# 读端遇到写入中的帧时的重试次数
+SNAPSHOT_RETRIES = 100
+
+
+def default_state_dir() -> Path:
+    """状态文件默认目录：优先 tmpfs，读写都不落盘"""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+class StateBlock:
+    """mmap 到状态文件的只读视图"""
+
+    def __init__(self, path: Path, mm: mmap.mmap):
+        self.path = Path(path)
+        self._mmap = mm
+        # 直接指向映射内存的 0 维结构化数组，字段访问不复制数据
+        self.view = np.ndarray((), dtype=STATE_DTYPE, buffer=mm)
+        self._unit_keys: Optional[List[str]] = None
+
+    @classmethod
+    def create(cls, path: Path) -> "StateBlock":
+        """创建（或清零）定长状态文件并映射
+
+        必须在启动 Godot 之前调用：Godot 以 READ_WRITE 打开已存在的文件，不会截断。
+        """
+        _require_numpy()
+        path = Path(path)
+        # 已存在时原地覆写而不是截断，其它进程的映射不会因文件变短而越界
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.write(bytes(STATE_SIZE))
+        return cls.attach(path)
+
+    @classmethod
+    def attach(cls, path: Path) -> "StateBlock":
+        """映射一个已存在的状态文件（其它进程也可以用它零拷贝读取同一会话的状态）"""
+        _require_numpy()
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), STATE_SIZE, access=mmap.ACCESS_READ)
+        return cls(path, mm)
+
+    @property
+    def sidecar_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".json")
+
+    @property
+    def ready(self) -> bool:
+        """Godot 是否已写入过至少一帧"""
+        return int(self.view["magic"]) == MAGIC and int(self.view["version"]) == VERSION
+
+    @property
+    def unit_keys(self) -> List[str]:
+        """单位编号 -> 单位 key（编号 0 为空，对应下标 编号 - 1）"""
+        if self._unit_keys is None and self.sidecar_path.exists():
+            with open(self.sidecar_path, encoding="utf-8") as f:
+                self._unit_keys = json.load(f).get("unit_keys", [])
+        return self._unit_keys or []
+
+    def snapshot(self) -> "np.ndarray":
+        """复制出一帧一致的状态
+
+        顺序锁：seq 为奇数表示 Godot 正在写入；复制前后 seq 相同且为偶数时副本一致。
+        重试耗尽时返回最后一次的副本。
+        """
+        copy = None
+        for _ in range(SNAPSHOT_RETRIES):
+            before = int(self.view["seq"])
+            if before % 2 == 0:
+                copy = self.view.copy()
+                if int(self.view["seq"]) == before:
+                    return copy
+            time.sleep(0)
+        return copy if copy is not None else self.view.copy()
+
+    def unit_key(self, unit_id: int) -> Optional[str]:
+        keys = self.unit_keys
+        if 0 < unit_id <= len(keys):
+            return keys[unit_id - 1]
+        return None
+
+    def to_dict(self, state: Optional["np.ndarray"] = None) -> Dict[str, Any]:
+        """把一帧状态解码为 JSON 友好的字典（单位编号换成 key）"""
+        if state is None:
+            state = self.snapshot()
+        flags = int(state["flags"])
+        half = GRID_SIZE // 2
+
+        units = []
+        for gy, gx in zip(*np.nonzero(state["grid_unit"])):
+            units.append({
+                "key": self.unit_key(int(state["grid_unit"][gy, gx])),
+                "level": int(state["grid_level"][gy, gx]),
+                "x": int(gx) - half,
+                "y": int(gy) - half,
+            })
+
+        return {
+            "ready": int(state["magic"]) == MAGIC,
+            "frame": int(state["frame"]),
+            "gold": int(state["gold"]),
+            "wave": int(state["wave"]),
+            "enemy_count": int(state["enemy_count"]),
+            "wave_active": bool(flags & FLAG_WAVE_ACTIVE),
+            "game_over": bool(flags & FLAG_GAME_OVER),
+            "mana": float(state["mana"]),
+            "max_mana": float(state["max_mana"]),
+            "core_hp": float(state["core_hp"]),
+            "max_core_hp": float(state["max_core_hp"]),
+            "shop": [
+                {
+                    "key": self.unit_key(int(unit_id)),
+                    "locked": bool(flags & (1 << (FLAG_SHOP_LOCKED_SHIFT + i))),
+                }
+                for i, unit_id in enumerate(state["shop"])
+            ],
+            "bench": [
+                {"key": self.unit_key(int(unit_id)), "level": int(level)} if unit_id else None
+                for unit_id, level in zip(state["bench_unit"], state["bench_level"])
+            ],
+            "grid": {
+                "origin": [-half, -half],
+                "state": state["grid_state"].tolist(),
+                "units": units,
+            },
+        }
+
+    def close(self) -> None:
+        # 先丢弃视图，否则仍有导出缓冲区时 mmap 无法关闭
+        self.view = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def unlink(self) -> None:
+        """关闭映射并删除状态文件及其旁路文件"""
+        self.close()
+        for path in (self.path, self.sidecar_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise RuntimeError("共享内存状态块需要 NumPy (pip install numpy)")
@@ -1,28 +1,156 @@
 """AI Client 工具函数"""
-import socket
+import json
 import re
-from typing import Optional, List, Dict, Any
+import socket
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, List, Dict, Any, NamedTuple
 from enum import Enum
 
+try:
+    import fcntl
+except ImportError:  # Windows：没有 flock，退化为仅依赖内核分配与占位套接字
+    fcntl = None
+
+
+# 跨进程端口分配：文件锁保护的租约表，记录最近分配出去的端口及其过期时间
+PORT_LOCK_FILE = Path(tempfile.gettempdir()) / "tower-ai-ports.lock"
+# 租约时长（秒）：覆盖从释放占位套接字到子进程完成绑定的窗口
+PORT_LEASE_SECONDS = 60.0
+# 单次分配最多尝试的次数（内核给出的端口恰好在租约表中时重试）
+_MAX_PORT_ATTEMPTS = 64
+
+
+class PortReservation:
+    """已预留的端口
+
+    持有一个绑定到该端口、开启 SO_REUSEADDR 但不监听的套接字：
+    内核在其它 bind(0) 时不会再分配这个端口，而同样开启 SO_REUSEADDR 的子进程
+    （aiohttp、Godot TCPServer）仍可绑定并监听它。子进程绑定后调用 release()。
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock: Optional[socket.socket] = sock
+        self.port: int = sock.getsockname()[1]
+
+    @property
+    def held(self) -> bool:
+        return self._sock is not None
+
+    def release(self) -> None:
+        """关闭占位套接字（可重复调用）"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "PortReservation":
+        return self
 
-def find_free_port(start: int = 10000, end: int = 60000) -> int:
-    """查找一个可用端口"""
-    for port in range(start, end):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"PortReservation(port={self.port}, held={self.held})"
+
+
+@contextmanager
+def _port_leases():
+    """在跨进程文件锁内读写端口租约表 {端口: 过期时间}，过期条目自动丢弃"""
+    with open(PORT_LOCK_FILE, "a+", encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
             try:
-                s.bind(('127.0.0.1', port))
-                return port
-            except OSError:
-                continue
-    raise RuntimeError(f"无法找到可用端口 (范围: {start}-{end})")
+                raw = json.loads(f.read() or "{}")
+            except ValueError:
+                raw = {}
+            now = time.time()
+            leases = {int(port): expires for port, expires in raw.items() if expires > now}
+            yield leases
+            f.seek(0)
+            f.truncate()
+            json.dump(leases, f)
+            # 必须在释放锁之前写出缓冲区
+            f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _bind_ephemeral() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('127.0.0.1', 0))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def reserve_ports(count: int = 1, lease: float = PORT_LEASE_SECONDS) -> List[PortReservation]:
+    """由内核分配 count 个互不相同的端口并保持占位
+
+    分配在跨进程文件锁内进行，并跳过其它进程租约中的端口，
+    因此并行启动的多个网关/runner 不会拿到同一个端口。
+
+    Raises:
+        RuntimeError: 多次尝试后仍无法分配
+    """
+    reservations: List[PortReservation] = []
+    skipped: List[socket.socket] = []
+    try:
+        with _port_leases() as leases:
+            for _ in range(count * _MAX_PORT_ATTEMPTS):
+                if len(reservations) == count:
+                    break
+                sock = _bind_ephemeral()
+                if sock.getsockname()[1] in leases:
+                    # 保持绑定，迫使内核下一次给出别的端口
+                    skipped.append(sock)
+                    continue
+                reservations.append(PortReservation(sock))
+            else:
+                if len(reservations) < count:
+                    raise RuntimeError(f"无法分配 {count} 个可用端口")
+
+            expires = time.time() + lease
+            for reservation in reservations:
+                leases[reservation.port] = expires
+    except BaseException:
+        for reservation in reservations:
+            reservation.release()
+        raise
+    finally:
+        for sock in skipped:
+            sock.close()
+    return reservations
+
+
+def reserve_port(lease: float = PORT_LEASE_SECONDS) -> PortReservation:
+    """预留一个端口"""
+    return reserve_ports(1, lease)[0]
+
+
+def find_free_port() -> int:
+    """查找一个可用端口
+
+    不保留占位套接字，只靠租约表防止其它进程在租约期内重复分配；
+    能持有到子进程绑定完成时应改用 reserve_port()。
+    """
+    with reserve_port() as reservation:
+        return reservation.port
 
 
 def find_two_free_ports() -> tuple[int, int]:
-    """查找两个连续可用端口"""
-    port1 = find_free_port()
-    # 第二个端口从 port1+1 开始找，避免冲突
-    port2 = find_free_port(start=port1 + 1)
-    return port1, port2
+    """查找两个互不相同的可用端口（同 find_free_port，不保留占位）"""
+    first, second = reserve_ports(2)
+    first.release()
+    second.release()
+    return first.port, second.port
 
 
 class CrashType(Enum):
@@ -35,31 +163,110 @@ class CrashType(Enum):
     UNKNOWN = "UNKNOWN"                    # 未知类型
 
 
-# Godot 错误检测模式 - 按优先级排序
-GODOT_ERROR_PATTERNS = [
+# Godot 错误检测规则 - 按优先级排序
+# (规则名, 正则, 是否忽略大小写, 崩溃类型)；(?P<msg>...) 标记要提取的错误消息
+_CRASH_RULES = [
     # CRASH-002 特定模式 - 最高优先级
-    (re.compile(r'Parameter\s+"t"\s+is\s+null', re.IGNORECASE), CrashType.PARAMETER_NULL),
-    (re.compile(r'Parameter\s+"[^"]*"\s+is\s+null', re.IGNORECASE), CrashType.ENGINE_ERROR),
+    ('param_t', r'Parameter\s+"t"\s+is\s+null', True, CrashType.PARAMETER_NULL),
+    ('param_null', r'Parameter\s+"[^"]*"\s+is\s+null', True, CrashType.ENGINE_ERROR),
 
     # 系统级崩溃
-    (re.compile(r'CrashHandlerException:.*'), CrashType.SYSTEM_CRASH),
-    (re.compile(r'Segmentation\s+fault', re.IGNORECASE), CrashType.SYSTEM_CRASH),
-    (re.compile(r'SIGSEGV'), CrashType.SYSTEM_CRASH),
-    (re.compile(r'SIGABRT'), CrashType.SYSTEM_CRASH),
+    ('crash_handler', r'CrashHandlerException:.*', False, CrashType.SYSTEM_CRASH),
+    ('segfault', r'Segmentation\s+fault', True, CrashType.SYSTEM_CRASH),
+    ('sigsegv', r'SIGSEGV', False, CrashType.SYSTEM_CRASH),
+    ('sigabrt', r'SIGABRT', False, CrashType.SYSTEM_CRASH),
 
     # 致命错误
-    (re.compile(r'FATAL:\s*(.+)', re.IGNORECASE), CrashType.FATAL_ERROR),
+    ('fatal', r'FATAL:\s*(?P<msg>.+)', True, CrashType.FATAL_ERROR),
 
     # GDScript 运行时错误
-    (re.compile(r'SCRIPT\s+ERROR:\s*(.+)', re.IGNORECASE), CrashType.SCRIPT_ERROR),
-    (re.compile(r'Invalid\s+get\s+index'), CrashType.SCRIPT_ERROR),
-    (re.compile(r'Invalid\s+call'), CrashType.SCRIPT_ERROR),
-    (re.compile(r'Attempt\s+to\s+call'), CrashType.SCRIPT_ERROR),
+    ('script_error', r'SCRIPT\s+ERROR:\s*(?P<msg>.+)', True, CrashType.SCRIPT_ERROR),
+    ('invalid_get', r'Invalid\s+get\s+index', False, CrashType.SCRIPT_ERROR),
+    ('invalid_call', r'Invalid\s+call', False, CrashType.SCRIPT_ERROR),
+    ('attempt_call', r'Attempt\s+to\s+call', False, CrashType.SCRIPT_ERROR),
 
     # Godot 引擎错误
-    (re.compile(r'ERROR:\s*(.+)', re.IGNORECASE), CrashType.ENGINE_ERROR),
+    ('engine_error', r'ERROR:\s*(?P<msg>.+)', True, CrashType.ENGINE_ERROR),
+]
+
+# 逐条匹配的模式列表（保留给外部调用方；热路径使用下面的合并分类器）
+GODOT_ERROR_PATTERNS = [
+    (re.compile(pattern.replace('(?P<msg>', '('), re.IGNORECASE if ignore_case else 0), crash_type)
+    for _, pattern, ignore_case, crash_type in _CRASH_RULES
 ]
 
+# 字面量预过滤：不含这些子串的行不可能命中任何规则，直接跳过正则
+# 忽略大小写的规则在小写化后的行上检查，其余在原始行上检查
+_PREFILTER_LOWER = ('error', 'parameter', 'fatal', 'segmentation')
+_PREFILTER_EXACT = ('SIG', 'CrashHandlerException', 'Invalid', 'Attempt')
+
+def _rule_alternative(name: str, pattern: str, ignore_case: bool) -> str:
+    """把一条规则转成合并正则中的一个分支：.*?(?P<name>...)"""
+    pattern = pattern.replace('(?P<msg>', f'(?P<{name}_msg>')
+    if ignore_case:
+        pattern = f'(?i:{pattern})'
+    return f'.*?(?P<{name}>{pattern})'
+
+
+# 合并分类器：所有规则拼成一条带命名分组的交替正则，从行首锚定，
+# 按规则顺序尝试，保证与逐条匹配相同的优先级语义（第一条命中的规则胜出）
+_CRASH_CLASSIFIER = re.compile(
+    '^(?:' + '|'.join(
+        _rule_alternative(name, pattern, ignore_case)
+        for name, pattern, ignore_case, _ in _CRASH_RULES
+    ) + ')',
+    re.DOTALL
+)
+_RULE_CRASH_TYPES = {name: crash_type for name, _, _, crash_type in _CRASH_RULES}
+_RULES_WITH_MESSAGE = {name for name, pattern, _, _ in _CRASH_RULES if '(?P<msg>' in pattern}
+
+# 属于引擎侧（非 GDScript）的崩溃类型
+ENGINE_CRASH_TYPES = (
+    CrashType.ENGINE_ERROR,
+    CrashType.PARAMETER_NULL,
+    CrashType.FATAL_ERROR,
+    CrashType.SYSTEM_CRASH,
+)
+
+
+class CrashMatch(NamedTuple):
+    """单行分类结果"""
+    crash_type: CrashType
+    message: str
+
+
+def _may_be_error_line(line: str) -> bool:
+    """字面量预过滤（显式循环比 any() + 生成器表达式快一倍左右）"""
+    lowered = line.lower()
+    for literal in _PREFILTER_LOWER:
+        if literal in lowered:
+            return True
+    for literal in _PREFILTER_EXACT:
+        if literal in line:
+            return True
+    return False
+
+
+def classify_line(line: str) -> Optional[CrashMatch]:
+    """单次扫描分类一行输出
+
+    先做字面量预过滤，再用合并正则一次匹配得到崩溃类型和错误消息。
+
+    Returns:
+        命中时返回 CrashMatch(崩溃类型, 错误消息)，否则返回 None
+    """
+    if not _may_be_error_line(line):
+        return None
+
+    match = _CRASH_CLASSIFIER.match(line)
+    if not match:
+        return None
+
+    name = match.lastgroup
+    message = match.group(f"{name}_msg" if name in _RULES_WITH_MESSAGE else name)
+    return CrashMatch(_RULE_CRASH_TYPES[name], message)
+
+
 # Godot C++ 栈跟踪模式
 GODOT_CPP_STACK_PATTERNS = [
     re.compile(r'at:\s+\([^)]+\)\s+'),           # at: (function) file:line
@@ -83,10 +290,10 @@ def is_error_line(line: str) -> tuple[bool, Optional[CrashType]]:
     Returns:
         (是否错误, 崩溃类型)
     """
-    for pattern, crash_type in GODOT_ERROR_PATTERNS:
-        if pattern.search(line):
-            return True, crash_type
-    return False, None
+    result = classify_line(line)
+    if result is None:
+        return False, None
+    return True, result.crash_type
 
 
 def is_engine_error_line(line: str) -> bool:
@@ -97,19 +304,13 @@ def is_engine_error_line(line: str) -> bool:
     Returns:
         是否是引擎内部错误
     """
-    crash_type = classify_crash_type(line)
-    return crash_type in (
-        CrashType.ENGINE_ERROR,
-        CrashType.PARAMETER_NULL,
-        CrashType.FATAL_ERROR,
-        CrashType.SYSTEM_CRASH,
-    )
+    return classify_crash_type(line) in ENGINE_CRASH_TYPES
 
 
 def classify_crash_type(line: str) -> CrashType:
     """根据错误行分类崩溃类型"""
-    _, crash_type = is_error_line(line)
-    return crash_type or CrashType.UNKNOWN
+    result = classify_line(line)
+    return result.crash_type if result else CrashType.UNKNOWN
 
 
 def extract_crash_details(line: str) -> Dict[str, Any]:
@@ -118,9 +319,10 @@ def extract_crash_details(line: str) -> Dict[str, Any]:
     Returns:
         包含 error_message, crash_type, is_engine_internal 等信息的字典
     """
-    is_error, crash_type = is_error_line(line)
-    if not is_error:
+    result = classify_line(line)
+    if result is None:
         return {}
+    crash_type = result.crash_type
 
     details = {
         'crash_type': crash_type,
@@ -132,18 +334,9 @@ def extract_crash_details(line: str) -> Dict[str, Any]:
         ),
         'is_script_error': crash_type == CrashType.SCRIPT_ERROR,
         'is_system_crash': crash_type == CrashType.SYSTEM_CRASH,
+        'error_message': result.message,
     }
 
-    # 提取错误消息
-    for pattern, _ in GODOT_ERROR_PATTERNS:
-        match = pattern.search(line)
-        if match:
-            if hasattr(match, 'lastindex') and match.lastindex:
-                details['error_message'] = match.group(1)
-            else:
-                details['error_message'] = match.group(0)
-            break
-
     # CRASH-002 特定标记
     if crash_type == CrashType.PARAMETER_NULL:
         details['crash_id'] = 'CRASH-002'
@@ -160,10 +353,15 @@ def is_cpp_stack_line(line: str) -> bool:
     return False
 
 
-def find_related_context(lines: List[str], error_idx: int) -> Dict[str, List[str]]:
+def find_related_context(lines: List[str], error_idx: int, line_offset: int = 0) -> Dict[str, List[str]]:
     """查找与错误相关的上下文信息
 
     搜索波次开始、图腾攻击、敌人生成等关键事件
+
+    Args:
+        lines: 输出行（可以只是错误行附近的窗口）
+        error_idx: 错误行在 lines 中的索引
+        line_offset: lines[0] 在完整输出中的行号，结果中的行号按此换算
     """
     context = {
         'wave_events': [],
@@ -182,7 +380,7 @@ def find_related_context(lines: List[str], error_idx: int) -> Dict[str, List[str
 
         # 检测 C++ 栈
         if is_cpp_stack_line(line):
-            context['cpp_stack'].append(f"[{i}] {line}")
+            context['cpp_stack'].append(f"[{i + line_offset}] {line}")
             continue
 
         # 检测关键事件
@@ -194,7 +392,7 @@ def find_related_context(lines: List[str], error_idx: int) -> Dict[str, List[str
                     'enemy_spawn': 'enemy_events',
                     'state_sync': 'state_syncs',
                 }[event_type]
-                context[context_key].append(f"[{i}] {line}")
+                context[context_key].append(f"[{i + line_offset}] {line}")
 
     return context
 
@@ -206,6 +404,7 @@ def extract_stack_trace(
     after: int = 100,
     include_context: bool = True,
     is_engine_error: bool = False,
+    line_offset: int = 0,
 ) -> str:
     """提取错误上下文（前后文），提高定位准确率。
 
@@ -222,6 +421,7 @@ def extract_stack_trace(
         after: 错误行后包含的行数
         include_context: 是否包含相关上下文分析
         is_engine_error: 是否是引擎错误（引擎错误通常没有GDScript栈，需要更多上下文）
+        line_offset: lines[0] 在完整输出中的行号（lines 只是输出窗口时使用）
     """
     if not lines:
         return ""
@@ -260,11 +460,11 @@ def extract_stack_trace(
     output_parts.append("【错误上下文】")
     for i, line in enumerate(context_lines, start=start):
         prefix = ">>> " if i == error_idx else "    "
-        output_parts.append(f"{prefix}[{i}] {line}")
+        output_parts.append(f"{prefix}[{i + line_offset}] {line}")
 
     # 3. 相关上下文分析
     if include_context:
-        related = find_related_context(lines, error_idx)
+        related = find_related_context(lines, error_idx, line_offset=line_offset)
 
         if related['wave_events']:
             output_parts.append("")
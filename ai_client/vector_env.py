@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+批量向量化环境 - 在 K 个 headless Godot 实例上提供 Gym 风格的 reset() / step()
+
+以前 RL 实验一次只能通过 HTTP 驱动一个 AIGameClient，机器的大部分核心闲置。
+VectorEnv 直接持有 K 个 GodotSession（各自一个 headless GodotProcess、一条 WebSocket
+和一个共享内存状态块），不经过 HTTP 网关：
+
+- step(actions_batch) 用 asyncio 并发地把第 i 组动作发给第 i 个实例，等待执行结果后
+  再等 frames_per_step 帧，然后从各自的状态块读取一帧；
+- 观测是 (K,) 的 NumPy 结构化数组，字段与 state_block.STATE_DTYPE 相同
+  （obs["gold"] 形状 (K,)，obs["grid_state"] 形状 (K, 9, 9)），
+  flatten_observations() 可展平为 (K, D) float32；
+- 某个实例游戏结束（状态块 game_over 标记或 GameOver 事件）或崩溃（has_crashed）时，
+  在同一次 step 中自动复位：终局观测放在 infos[i]["final_observation"]，
+  返回的观测已是复位后的第一帧（与 SB3 VecEnv 的约定一致）。崩溃的实例由
+  GodotSession.reset() 重启。
+
+每个实例是独立进程，Python 侧每步只有一次 WebSocket 往返和一次 mmap 读取，
+采样吞吐量随 CPU 核数近似线性增长（实例数不要超过核数）。
+
+用法:
+    env = VectorEnv(num_envs=4, setup_actions=[{"type": "select_totem", "totem_id": "wolf_totem"}])
+    obs = env.reset()
+    obs, rewards, terminated, truncated, infos = env.step([[{"type": "start_wave"}]] * 4)
+    env.close()
+
+    # 吞吐量基准：4 个实例，每个实例空跑 200 步
+    python3 ai_client/vector_env.py -n 4 --steps 200
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client.events import EventType
+from ai_client.godot_pool import GodotSession
+from ai_client.state_block import FLAG_GAME_OVER, STATE_DTYPE
+from ai_client.utils import reserve_ports
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_SCENE = "res://src/Scenes/UI/CoreSelection.tscn"
+# 逐次攻击/状态伤害日志对训练无用，却是 headless stdout 的主要来源；net 保持默认，就绪检测依赖它
+DEFAULT_LOG_LEVELS = "combat:off,status:off,buff:off"
+
+# (上一帧, 当前帧) -> 奖励；两者都是 STATE_DTYPE 的 0 维结构化数组
+RewardFn = Callable[[np.ndarray, np.ndarray], float]
+
+# flatten_observations 中按顺序展开的数值字段与数组字段
+SCALAR_FIELDS = ("gold", "wave", "enemy_count", "mana", "max_mana", "core_hp", "max_core_hp")
+ARRAY_FIELDS = ("shop", "bench_unit", "bench_level", "grid_unit", "grid_level", "grid_state")
+FLAG_BITS = 6
+
+
+def default_reward(prev: np.ndarray, curr: np.ndarray) -> float:
+    """默认奖励：每推进一波 +1，核心损失的血量按最大血量归一化后扣除"""
+    reward = float(int(curr["wave"]) - int(prev["wave"]))
+    max_hp = float(curr["max_core_hp"]) or 1.0
+    reward -= max(0.0, float(prev["core_hp"]) - float(curr["core_hp"])) / max_hp
+    return reward
+
+
+def flatten_observations(obs: np.ndarray) -> np.ndarray:
+    """把 (K,) 结构化观测展平为 (K, D) float32
+
+    依次为 SCALAR_FIELDS、flags 的 6 个比特、ARRAY_FIELDS 逐元素展开。
+    """
+    k = obs.shape[0]
+    parts = [np.stack([obs[name].astype(np.float32) for name in SCALAR_FIELDS], axis=1)]
+    parts.append(((obs["flags"][:, None] >> np.arange(FLAG_BITS)) & 1).astype(np.float32))
+    for name in ARRAY_FIELDS:
+        parts.append(obs[name].reshape(k, -1).astype(np.float32))
+    return np.concatenate(parts, axis=1)
+
+
+class VectorEnv:
+    """K 个 headless Godot 实例组成的同步向量化环境"""
+
+    # 等待状态块帧号推进时的轮询间隔（秒）
+    FRAME_POLL_INTERVAL = 0.002
+
+    def __init__(
+        self,
+        num_envs: int,
+        project_path: str = str(PROJECT_DIR),
+        scene_path: str = DEFAULT_SCENE,
+        frames_per_step: int = 6,
+        max_episode_steps: int = 0,
+        fast_forward: float = 8.0,
+        reward_fn: RewardFn = default_reward,
+        setup_actions: Optional[List[Dict[str, Any]]] = None,
+        action_timeout: float = 10.0,
+        frame_timeout: float = 10.0,
+        log_dir: Path = Path("logs"),
+        log_levels: str = DEFAULT_LOG_LEVELS
+    ):
+        """
+        Args:
+            num_envs: 实例数 K
+            frames_per_step: 每步执行完动作后等待的 Godot 帧数
+            max_episode_steps: 单局最大步数，超过时截断并复位（0 表示不限）
+            fast_forward: 快进倍率（0 表示常速）
+            reward_fn: 由前后两帧状态计算奖励
+            setup_actions: 每次启动/复位后先执行的动作（如 select_totem）
+            action_timeout: 等待一批动作执行结果的最长时间（秒）
+            frame_timeout: 等待状态块帧号推进的最长时间（秒）
+        """
+        if num_envs < 1:
+            raise ValueError("num_envs 必须 >= 1")
+
+        self.num_envs = num_envs
+        self.frames_per_step = max(1, frames_per_step)
+        self.max_episode_steps = max_episode_steps
+        self.reward_fn = reward_fn
+        self.setup_actions = list(setup_actions or [])
+        self.action_timeout = action_timeout
+        self.frame_timeout = frame_timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._started = False
+        self._last_states = np.zeros(num_envs, dtype=STATE_DTYPE)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.episode_returns = np.zeros(num_envs, dtype=np.float64)
+
+        log_dir.mkdir(exist_ok=True)
+        log_prefix = f"vector_env_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        reservations = reserve_ports(num_envs)
+        self.sessions: List[GodotSession] = [
+            GodotSession(
+                session_id=str(i),
+                project_path=project_path,
+                scene_path=scene_path,
+                godot_ws_port=reservation.port,
+                log_file=log_dir / f"{log_prefix}_e{i}.log",
+                structured_events=True,
+                echo=False,
+                fast_forward=fast_forward,
+                log_levels=log_levels,
+                log_compact=True,
+                port_reservation=reservation,
+                state_block=True
+            )
+            for i, reservation in enumerate(reservations)
+        ]
+
+    # ===== 同步接口 =====
+
+    def reset(self) -> np.ndarray:
+        """启动（首次调用时）或复位全部实例，返回 (K,) 结构化观测"""
+        return self._loop.run_until_complete(self.async_reset())
+
+    def step(
+        self, actions_batch: Sequence[Optional[List[Dict[str, Any]]]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """并发执行一步
+
+        Args:
+            actions_batch: 长度为 K，第 i 项是发给第 i 个实例的动作列表（None 或空列表表示不操作）
+
+        Returns:
+            (观测, 奖励 (K,), terminated (K,), truncated (K,), infos)
+        """
+        return self._loop.run_until_complete(self.async_step(actions_batch))
+
+    def close(self):
+        """关闭全部实例并释放事件循环"""
+        if self._loop.is_closed():
+            return
+        self._loop.run_until_complete(self.async_close())
+        self._loop.close()
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ===== 异步接口 =====
+
+    async def async_close(self):
+        await asyncio.gather(*(s.shutdown() for s in self.sessions), return_exceptions=True)
+
+    async def async_reset(self) -> np.ndarray:
+        if not self._started:
+            await self._start_all()
+            self._started = True
+            results = await asyncio.gather(*(self._after_reset(i) for i in range(self.num_envs)))
+        else:
+            results = await asyncio.gather(*(self._reset_one(i) for i in range(self.num_envs)))
+
+        observations = np.empty(self.num_envs, dtype=STATE_DTYPE)
+        for i, state in enumerate(results):
+            observations[i] = state
+        return observations
+
+    async def async_step(
+        self, actions_batch: Sequence[Optional[List[Dict[str, Any]]]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        if not self._started:
+            raise RuntimeError("step() 之前必须先调用 reset()")
+        if len(actions_batch) != self.num_envs:
+            raise ValueError(f"actions_batch 长度必须为 {self.num_envs}")
+
+        results = await asyncio.gather(
+            *(self._step_one(i, actions) for i, actions in enumerate(actions_batch))
+        )
+
+        observations = np.empty(self.num_envs, dtype=STATE_DTYPE)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for i, (state, reward, term, trunc, info) in enumerate(results):
+            observations[i] = state
+            rewards[i] = reward
+            terminated[i] = term
+            truncated[i] = trunc
+            infos.append(info)
+        return observations, rewards, terminated, truncated, infos
+
+    # ===== 单个实例 =====
+
+    async def _start_all(self):
+        """第一个实例单独启动（可能触发资源导入），其余并发启动"""
+        results = [await self.sessions[0].start()]
+        if self.num_envs > 1:
+            results.extend(await asyncio.gather(*(s.start() for s in self.sessions[1:])))
+        failed = [s.session_id for s, ok in zip(self.sessions, results) if not ok]
+        if failed:
+            raise RuntimeError(f"实例启动失败: {', '.join(failed)}")
+
+    async def _step_one(self, index: int, actions: Optional[List[Dict[str, Any]]]):
+        session = self.sessions[index]
+        prev = self._last_states[index]
+        info: Dict[str, Any] = {}
+
+        if actions and not session.has_crashed():
+            result = await session.send_actions(actions, wait=True, timeout=self.action_timeout)
+            info["action_result"] = result
+        if not session.has_crashed():
+            await self._wait_frames(session, self.frames_per_step)
+
+        crashed = session.has_crashed()
+        state = prev.copy() if crashed else session.state_block.snapshot()
+        events = session.drain_events()
+        if events:
+            info["events"] = [e.to_dict() for e in events]
+        game_over = (
+            crashed
+            or bool(int(state["flags"]) & FLAG_GAME_OVER)
+            or any(e.type == EventType.GAME_OVER for e in events)
+        )
+
+        reward = 0.0 if crashed else self.reward_fn(prev, state)
+        self.episode_steps[index] += 1
+        self.episode_returns[index] += reward
+        truncated = (
+            not game_over
+            and self.max_episode_steps > 0
+            and self.episode_steps[index] >= self.max_episode_steps
+        )
+        if crashed:
+            info["crashed"] = True
+            info["crash"] = session.godot.get_crash_summary()
+
+        if game_over or truncated:
+            info["final_observation"] = state
+            info["episode"] = {
+                "r": float(self.episode_returns[index]),
+                "l": int(self.episode_steps[index]),
+            }
+            state = await self._reset_one(index)
+        else:
+            self._last_states[index] = state
+
+        return state, reward, game_over, truncated, info
+
+    async def _reset_one(self, index: int) -> np.ndarray:
+        session = self.sessions[index]
+        result = await session.reset(timeout=self.action_timeout)
+        if result.get("status") != "ok":
+            raise RuntimeError(f"实例 {session.session_id} 复位失败: {result.get('error_message')}")
+        return await self._after_reset(index)
+
+    async def _after_reset(self, index: int) -> np.ndarray:
+        """执行 setup_actions，等状态块写入新的一帧后作为初始观测"""
+        session = self.sessions[index]
+        if self.setup_actions:
+            await session.send_actions(self.setup_actions, wait=True, timeout=self.action_timeout)
+        await self._wait_frames(session, 1)
+        session.drain_events()
+
+        state = session.state_block.snapshot()
+        self._last_states[index] = state
+        self.episode_steps[index] = 0
+        self.episode_returns[index] = 0.0
+        return state
+
+    async def _wait_frames(self, session: GodotSession, frames: int) -> bool:
+        """等待状态块帧号推进 frames 帧；实例崩溃或超时返回 False"""
+        view = session.state_block.view
+        target = (int(view["frame"]) + frames) & 0xFFFFFFFF
+        deadline = self._loop.time() + self.frame_timeout
+        # 帧号是 u32，按差值比较以兼容回绕
+        while ((int(view["frame"]) - target) & 0xFFFFFFFF) >= 0x80000000:
+            if session.has_crashed() or self._loop.time() > deadline:
+                return False
+            await asyncio.sleep(self.FRAME_POLL_INTERVAL)
+        return True
+
+
+def main():
+    """吞吐量基准：每个实例不操作地推进若干步，统计每秒采样数"""
+    parser = argparse.ArgumentParser(description="VectorEnv 吞吐量基准")
+    parser.add_argument("-n", "--num-envs", type=int, default=4, help="实例数 (默认: 4)")
+    parser.add_argument("--steps", type=int, default=200, help="每个实例的步数 (默认: 200)")
+    parser.add_argument("--frames-per-step", type=int, default=6, help="每步推进的帧数 (默认: 6)")
+    parser.add_argument("--fast-forward", type=float, default=8.0, help="快进倍率 (默认: 8)")
+    parser.add_argument("--totem", default="wolf_totem", help="开局选择的图腾 (默认: wolf_totem)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    with VectorEnv(
+        num_envs=args.num_envs,
+        frames_per_step=args.frames_per_step,
+        fast_forward=args.fast_forward,
+        setup_actions=[{"type": "select_totem", "totem_id": args.totem}]
+    ) as env:
+        env.reset()
+        noop = [None] * args.num_envs
+        start = time.monotonic()
+        resets = 0
+        for _ in range(args.steps):
+            _, _, terminated, truncated, _ = env.step(noop)
+            resets += int(terminated.sum() + truncated.sum())
+        elapsed = time.monotonic() - start
+
+    samples = args.steps * args.num_envs
+    print(f"{args.num_envs} 个实例，{samples} 次采样，用时 {elapsed:.2f}s，"
+          f"{samples / elapsed:.1f} 步/秒，自动复位 {resets} 次")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""网关热复用 - 在测试场景之间复用已运行的网关和 Godot 进程
+
+场景脚本原本各自 subprocess.Popen 一个网关并 sleep 十几秒等待 Godot 冷启动。
+改用 ensure_gateway() 后：端口上已有网关时只做一次 POST /sessions/<id>/reset
+（Godot 原地 reset_game），没有时才启动新网关，并在 /health 可用时立即返回。
+
+    from ai_client.warm_gateway import ensure_gateway
+
+    gateway = ensure_gateway(http_port=8080)
+    ...  # 运行场景
+    gateway.stop()  # 默认保持网关运行，留给下一个场景复用
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_SCENE = "res://src/Scenes/UI/CoreSelection.tscn"
+
+
+@dataclass
+class GatewayHandle:
+    """ensure_gateway 的返回值"""
+    http_port: int
+    # 本次新启动的网关进程；复用已有网关时为 None
+    process: Optional[subprocess.Popen] = None
+    # 复用时 POST /sessions/<id>/reset 的响应
+    reset_result: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.http_port}"
+
+    @property
+    def reused(self) -> bool:
+        return self.process is None
+
+    def stop(self, keep_warm: bool = True):
+        """结束场景；keep_warm=False 时终止本次启动的网关进程"""
+        if keep_warm or self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.process = None
+
+
+def _request(method: str, url: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """发送 HTTP 请求并解析 JSON，连接失败返回 None"""
+    req = urllib.request.Request(url, method=method, data=b"" if method == "POST" else None)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except (urllib.error.URLError, ConnectionError, TimeoutError, ValueError):
+        return None
+
+
+def ensure_gateway(
+    http_port: int,
+    scene: str = DEFAULT_SCENE,
+    session_id: str = "0",
+    extra_args: Sequence[str] = (),
+    startup_timeout: float = 60.0,
+    reset_timeout: float = 70.0
+) -> GatewayHandle:
+    """复用 http_port 上已运行的网关（并复位游戏），否则启动一个新网关
+
+    Args:
+        http_port: 网关 HTTP 端口
+        scene: 新启动网关时加载的场景
+        session_id: 复位的会话 ID
+        extra_args: 新启动网关时附加的命令行参数（如 ["--events", "--max-resets", "10"]）
+        startup_timeout: 等待新网关 /health 可用的最长时间（秒）
+        reset_timeout: 复位请求的超时（复位失败时网关会重启 Godot，需要留足时间）
+
+    Raises:
+        RuntimeError: 复位失败，或新网关启动失败/超时
+    """
+    base_url = f"http://127.0.0.1:{http_port}"
+
+    if _request("GET", f"{base_url}/health", timeout=1.0) is not None:
+        result = _request("POST", f"{base_url}/sessions/{session_id}/reset", timeout=reset_timeout)
+        if not result or result.get("status") != "ok":
+            raise RuntimeError(f"复位网关会话失败: {result}")
+        return GatewayHandle(http_port=http_port, reset_result=result)
+
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(PROJECT_DIR / "ai_client" / "ai_game_client.py"),
+            "--project", str(PROJECT_DIR),
+            "--scene", scene,
+            "--http-port", str(http_port),
+            *extra_args,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=str(PROJECT_DIR),
+        env=env
+    )
+
+    # HTTP 服务器在 Godot 就绪并连上 WebSocket 之后才启动，/health 可用即可开始场景
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"网关进程已退出 (返回码 {process.returncode})")
+        if _request("GET", f"{base_url}/health", timeout=1.0) is not None:
+            return GatewayHandle(http_port=http_port, process=process)
+        time.sleep(0.2)
+
+    process.kill()
+    raise RuntimeError(f"网关启动超时 ({startup_timeout}s)")
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+波次/敌人属性表 - 把 wave_config.json 与 enemy_variants.json 预计算为稠密 NumPy 表
+
+所有表都按 波次 × 敌人类型 排列，一次平衡扫描就是一次数组运算，
+不需要再按 WaveSystemManager / Enemy.setup 的公式逐个手算：
+- hp     = (100 + 波次 × 80) × hpMod          （Enemy.setup）
+- speed  = (40 + 波次 × 2) × spdMod           （Enemy.setup）
+- dmg    = dmg                                （DefaultBehavior 直接使用 data.dmg，不随波次缩放）
+- count  = 该类型在该波的期望生成数量          （每批从 enemy_types 中均匀选一种；Boss 波按 Boss 池均分）
+- difficulty = 波次 × 1.15^波次 × 难度系数     （calculate_wave_difficulty，不含 difficulty_multiplier）
+
+结果按两个配置文件的 SHA-256 缓存到 ai_client/.cache/*.npz；
+export 子命令写出 data/wave_tables.json，WaveSystemManager 在哈希一致时直接查表。
+
+用法:
+    # 打印每波概要
+    python ai_client/wave_tables.py
+
+    # 配置改动后重新生成 Godot 端的预计算表
+    python ai_client/wave_tables.py export
+
+    # 在 Python 中做平衡扫描
+    from ai_client.wave_tables import load_tables
+    t = load_tables()
+    total_hp = (t.hp * t.count).sum(axis=1)      # 每波敌人总血量，shape (24,)
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+WAVE_CONFIG_PATH = DATA_DIR / "wave_config.json"
+ENEMY_VARIANTS_PATH = DATA_DIR / "enemy_variants.json"
+GODOT_TABLE_PATH = DATA_DIR / "wave_tables.json"
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+TABLE_VERSION = 1
+
+# 与 WaveSystemManager.gd 保持一致
+DIFFICULTY_NORMAL = 1.0
+DIFFICULTY_ELITE = 1.5
+DIFFICULTY_BOSS = 2.0
+DEFAULT_WAVE_COUNT = 24
+SEASONS = ("spring", "summer", "autumn", "winter")
+DEFAULT_BOSS_TYPES = ["summoner", "ranger", "tank"]
+
+
+def file_sha256(path: Path) -> str:
+    """文件内容的 SHA-256（与 Godot FileAccess.get_sha256 相同）"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def fallback_wave_type(wave: int) -> str:
+    """配置中没有 wave_type 时的硬编码规则（WaveSystemManager.get_wave_type）"""
+    if wave in (6, 12, 18, 24):
+        return "season_boss"
+    if wave % 10 == 0:
+        return "boss"
+    if wave % 5 == 0:
+        return "elite"
+    if wave == 3:
+        return "healer"
+    if wave == 2:
+        return "mutant"
+    if wave % 3 == 0:
+        return "event"
+    return "normal"
+
+
+def fallback_season(wave: int) -> int:
+    """按波次推算季节编号（WaveSystemManager.get_season）"""
+    if 1 <= wave <= 24:
+        return (wave - 1) // 6
+    return 0
+
+
+@dataclass
+class WaveTables:
+    """预计算表；一维数组按波次索引（下标 0 对应第 1 波），二维数组为 (波次, 敌人类型)"""
+    waves: np.ndarray
+    enemy_types: List[str]
+    wave_type: List[str]
+    season: np.ndarray
+    difficulty: np.ndarray
+    enemy_count: np.ndarray
+    is_elite: np.ndarray
+    is_boss: np.ndarray
+    hp: np.ndarray
+    speed: np.ndarray
+    dmg: np.ndarray
+    count: np.ndarray
+    boss_type_mask: np.ndarray
+    wave_config_sha256: str = ""
+    enemy_variants_sha256: str = ""
+
+    def index(self, enemy_type: str) -> int:
+        try:
+            return self.enemy_types.index(enemy_type)
+        except ValueError:
+            raise KeyError(f"未知敌人类型: {enemy_type}") from None
+
+    def row(self, wave: int) -> int:
+        """波次 → 数组下标"""
+        if not 1 <= wave <= len(self.waves):
+            raise KeyError(f"波次超出范围: {wave}")
+        return wave - 1
+
+    def stats(self, enemy_type: str, wave: int) -> Dict[str, float]:
+        """单个敌人在指定波次生成时的属性"""
+        r, c = self.row(wave), self.index(enemy_type)
+        return {
+            "hp": float(self.hp[r, c]),
+            "speed": float(self.speed[r, c]),
+            "dmg": float(self.dmg[r, c]),
+            "count": float(self.count[r, c]),
+        }
+
+    def to_npz(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            version=np.array(TABLE_VERSION),
+            waves=self.waves,
+            enemy_types=np.array(self.enemy_types),
+            wave_type=np.array(self.wave_type),
+            season=self.season,
+            difficulty=self.difficulty,
+            enemy_count=self.enemy_count,
+            is_elite=self.is_elite,
+            is_boss=self.is_boss,
+            hp=self.hp,
+            speed=self.speed,
+            dmg=self.dmg,
+            count=self.count,
+            boss_type_mask=self.boss_type_mask,
+            wave_config_sha256=np.array(self.wave_config_sha256),
+            enemy_variants_sha256=np.array(self.enemy_variants_sha256),
+        )
+
+    @classmethod
+    def from_npz(cls, path: Path) -> "WaveTables":
+        with np.load(path) as data:
+            if int(data["version"]) != TABLE_VERSION:
+                raise ValueError(f"缓存版本不匹配: {path}")
+            return cls(
+                waves=data["waves"],
+                enemy_types=[str(x) for x in data["enemy_types"]],
+                wave_type=[str(x) for x in data["wave_type"]],
+                season=data["season"],
+                difficulty=data["difficulty"],
+                enemy_count=data["enemy_count"],
+                is_elite=data["is_elite"],
+                is_boss=data["is_boss"],
+                hp=data["hp"],
+                speed=data["speed"],
+                dmg=data["dmg"],
+                count=data["count"],
+                boss_type_mask=data["boss_type_mask"],
+                wave_config_sha256=str(data["wave_config_sha256"]),
+                enemy_variants_sha256=str(data["enemy_variants_sha256"]),
+            )
+
+    def to_godot_dict(self) -> Dict:
+        """data/wave_tables.json 的内容；Godot 按 source_sha256 判断是否可用"""
+        def per_type(table: np.ndarray) -> Dict[str, List[float]]:
+            return {
+                key: [round(float(v), 4) for v in table[:, i]]
+                for i, key in enumerate(self.enemy_types)
+            }
+
+        return {
+            "version": TABLE_VERSION,
+            "_comment": "由 ai_client/wave_tables.py export 生成，请勿手动修改",
+            "source_sha256": {
+                "wave_config": self.wave_config_sha256,
+                "enemy_variants": self.enemy_variants_sha256,
+            },
+            "waves": {
+                str(int(w)): {
+                    "wave_type": self.wave_type[i],
+                    "season": SEASONS[int(self.season[i])],
+                    "difficulty": round(float(self.difficulty[i]), 6),
+                    "enemy_count": int(self.enemy_count[i]),
+                    "is_elite": bool(self.is_elite[i]),
+                    "is_boss": bool(self.is_boss[i]),
+                }
+                for i, w in enumerate(self.waves)
+            },
+            "enemy_types": list(self.enemy_types),
+            "hp": per_type(self.hp),
+            "speed": per_type(self.speed),
+            "dmg": per_type(self.dmg),
+            "count": per_type(self.count),
+        }
+
+
+def build_tables(
+    wave_config: Dict,
+    enemy_variants: Dict,
+    wave_config_sha256: str = "",
+    enemy_variants_sha256: str = ""
+) -> WaveTables:
+    """由已解析的两份配置构建属性表"""
+    variants = enemy_variants.get("ENEMY_VARIANTS", enemy_variants)
+    # 只有带 hpMod / spdMod 的条目能被 Enemy.setup 生成
+    enemy_types = [k for k, v in variants.items() if "hpMod" in v and "spdMod" in v]
+    col = {key: i for i, key in enumerate(enemy_types)}
+
+    waves_cfg = wave_config.get("waves", {})
+    wave_count = max([int(k) for k in waves_cfg] + [DEFAULT_WAVE_COUNT])
+    waves = np.arange(1, wave_count + 1)
+
+    season_of = {}
+    for idx, name in enumerate(SEASONS):
+        for w in wave_config.get("seasons", {}).get(name, {}).get("waves", []):
+            season_of[int(w)] = idx
+
+    boss_types = wave_config.get("boss_types", DEFAULT_BOSS_TYPES)
+
+    wave_type: List[str] = []
+    season = np.zeros(wave_count, dtype=np.int64)
+    enemy_count = np.zeros(wave_count, dtype=np.int64)
+    count = np.zeros((wave_count, len(enemy_types)), dtype=np.float64)
+
+    for i, w in enumerate(waves):
+        w = int(w)
+        data = waves_cfg.get(str(w), {})
+        wtype = data.get("wave_type", fallback_wave_type(w))
+        wave_type.append(wtype)
+        season[i] = season_of.get(w, fallback_season(w))
+        enemy_count[i] = int(data.get("enemy_count", 0))
+
+        # 期望数量：每批独立均匀选类型，期望按类型数均分
+        if wtype == "season_boss":
+            pool = data.get("boss_pool") or [
+                wave_config.get("seasons", {}).get(SEASONS[season[i]], {}).get("boss_type", "boss")
+            ]
+            spawned = int(data.get("boss_count", 1))
+        elif wtype == "boss":
+            pool = boss_types
+            spawned = int(data.get("boss_count", enemy_count[i]))
+        else:
+            pool = data.get("enemy_types", [])
+            spawned = int(enemy_count[i])
+        known = [key for key in pool if key in col]
+        for key in known:
+            count[i, col[key]] += spawned / len(pool)
+
+    wave_type_arr = np.array(wave_type)
+    is_elite = wave_type_arr == "elite"
+    is_boss = np.isin(wave_type_arr, ["boss", "season_boss"])
+    coef = np.where(is_elite, DIFFICULTY_ELITE, np.where(wave_type_arr == "boss", DIFFICULTY_BOSS, DIFFICULTY_NORMAL))
+    difficulty = waves * np.power(1.15, waves) * coef
+
+    hp_mod = np.array([float(variants[k]["hpMod"]) for k in enemy_types])
+    spd_mod = np.array([float(variants[k]["spdMod"]) for k in enemy_types])
+    base_dmg = np.array([float(variants[k].get("dmg", 0)) for k in enemy_types])
+
+    hp = (100.0 + waves * 80.0)[:, None] * hp_mod[None, :]
+    speed = (40.0 + waves * 2.0)[:, None] * spd_mod[None, :]
+    dmg = np.broadcast_to(base_dmg, (wave_count, len(enemy_types))).copy()
+
+    return WaveTables(
+        waves=waves,
+        enemy_types=enemy_types,
+        wave_type=wave_type,
+        season=season,
+        difficulty=difficulty,
+        enemy_count=enemy_count,
+        is_elite=is_elite,
+        is_boss=is_boss,
+        hp=hp,
+        speed=speed,
+        dmg=dmg,
+        count=count,
+        boss_type_mask=np.array([bool(variants[k].get("is_boss", False)) for k in enemy_types]),
+        wave_config_sha256=wave_config_sha256,
+        enemy_variants_sha256=enemy_variants_sha256,
+    )
+
+
+def load_tables(
+    wave_config_path: Path = WAVE_CONFIG_PATH,
+    enemy_variants_path: Path = ENEMY_VARIANTS_PATH,
+    cache_dir: Optional[Path] = CACHE_DIR
+) -> WaveTables:
+    """加载属性表；两份配置的哈希未变时直接读取缓存，cache_dir=None 时不使用缓存"""
+    wave_hash = file_sha256(wave_config_path)
+    variants_hash = file_sha256(enemy_variants_path)
+
+    cache_path = None
+    if cache_dir is not None:
+        key = hashlib.sha256(f"{TABLE_VERSION}:{wave_hash}:{variants_hash}".encode()).hexdigest()[:16]
+        cache_path = Path(cache_dir) / f"wave_tables_{key}.npz"
+        if cache_path.exists():
+            try:
+                return WaveTables.from_npz(cache_path)
+            except (OSError, ValueError, KeyError):
+                pass  # 缓存损坏，重新计算
+
+    with open(wave_config_path, encoding="utf-8") as f:
+        wave_config = json.load(f)
+    with open(enemy_variants_path, encoding="utf-8") as f:
+        enemy_variants = json.load(f)
+
+    tables = build_tables(wave_config, enemy_variants, wave_hash, variants_hash)
+    if cache_path is not None:
+        try:
+            tables.to_npz(cache_path)
+        except OSError as e:
+            print(f"警告: 无法写入缓存 {cache_path}: {e}")
+    return tables
+
+
+_NUMBER_LIST_RE = re.compile(r"\[\s*((?:-?[\d.]+,\s*)*-?[\d.]+)\s*\]")
+
+
+def export_godot_table(tables: WaveTables, path: Path = GODOT_TABLE_PATH):
+    """写出 Godot 端使用的 data/wave_tables.json"""
+    text = json.dumps(tables.to_godot_dict(), ensure_ascii=False, indent=2)
+    # 数值列表写成一行，便于按波次对照和 diff
+    text = _NUMBER_LIST_RE.sub(lambda m: "[" + " ".join(m.group(1).split()) + "]", text)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="波次/敌人属性预计算表")
+    parser.add_argument("command", nargs="?", default="show", choices=["show", "export"],
+                        help="show: 打印每波概要；export: 写出 data/wave_tables.json")
+    parser.add_argument("--enemy", help="额外打印该敌人类型在各波的属性")
+    parser.add_argument("--no-cache", action="store_true", help="忽略磁盘缓存重新计算")
+    args = parser.parse_args()
+
+    tables = load_tables(cache_dir=None if args.no_cache else CACHE_DIR)
+
+    if args.command == "export":
+        export_godot_table(tables)
+        print(f"已写出 {GODOT_TABLE_PATH}（{len(tables.waves)} 波 × {len(tables.enemy_types)} 种敌人）")
+        return
+
+    total_hp = (tables.hp * tables.count).sum(axis=1)
+    print(f"{'波次':>4} {'类型':<12} {'季节':<7} {'难度':>9} {'数量':>5} {'总血量':>12}")
+    for i, w in enumerate(tables.waves):
+        print(f"{int(w):>4} {tables.wave_type[i]:<12} {SEASONS[int(tables.season[i])]:<7} "
+              f"{tables.difficulty[i]:>9.2f} {int(tables.enemy_count[i]):>5} {total_hp[i]:>12.0f}")
+
+    if args.enemy:
+        try:
+            c = tables.index(args.enemy)
+        except KeyError as e:
+            print(f"错误: {e.args[0]}")
+            sys.exit(1)
+        print(f"\n{args.enemy}:")
+        for i, w in enumerate(tables.waves):
+            print(f"  第{int(w):>2}波  hp={tables.hp[i, c]:>9.1f}  speed={tables.speed[i, c]:>6.1f}  "
+                  f"dmg={tables.dmg[i, c]:>6.1f}  期望数量={tables.count[i, c]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 extends Node
 
 const StatusEffect = preload("res://src/Scripts/Effects/StatusEffect.gd")
+const StateBlockWriterScript = preload("res://src/Scripts/Components/StateBlockWriter.gd")
 
 ## AI 管理器 - WebSocket 服务端
 ## 监听游戏事件，下发状态给 AI 客户端（主动推送）
@@ -20,15 +21,35 @@ var last_event_type: String = ""
 var last_event_data: Dictionary = {}
 var is_game_over: bool = false
 
+# ===== 结构化事件通道 =====
+# 开启后，每条叙事文本之外额外发送一个 {"type": "event", ...} JSON 帧
+# 通过 --ai-events 命令行参数或客户端 {"type": "subscribe_events"} 消息开启
+var structured_events_enabled: bool = false
+
+# ===== 游戏速度 / 快进 =====
+# 快进模式按倍率同步提高物理帧率，每个物理步长仍为 1/60 游戏秒，结果与常速一致；
+# headless 下同时跳过纯视觉效果（VisualController 动画、飘字、弹道外观）
+const DEFAULT_FAST_FORWARD_SCALE: float = 8.0
+const MAX_TIME_SCALE: float = 32.0
+var time_scale: float = 1.0
+var fast_forward: bool = false
+var _base_physics_ticks: int = 60
+var _base_max_physics_steps: int = 8
+
+# ===== 共享内存状态块 =====
+# 通过 --ai-state-file=<path> 开启，每帧把棋盘状态按固定布局写入该文件（见 StateBlockWriter.gd）
+var state_writer = null
+
 # ===== 心跳/保活 =====
 var _last_ping_time: float = 0.0
 const PING_INTERVAL: float = 10.0  # 每10秒发送一次ping
 
 func _parse_command_line_args():
-	"""解析命令行参数，支持 --ai-port=<port> 和 --ai-speed=<value>"""
+	"""解析命令行参数，支持 --ai-port=<port>、--ai-speed=<value>、--ai-fast-forward[=<value>]、--ai-events 和 --ai-state-file=<path>"""
 	var args = OS.get_cmdline_args()
 	var ai_mode_active = false
 	var ai_speed = 0.5 # Default speed
+	var ai_fast_forward = false
 
 	for arg in args:
 		if arg.begins_with("--ai-port="):
@@ -43,19 +64,77 @@ func _parse_command_line_args():
 		elif arg.begins_with("--ai-speed="):
 			ai_speed = float(arg.substr("--ai-speed=".length()))
 			ai_mode_active = true
+		elif arg.begins_with("--ai-fast-forward="):
+			ai_speed = float(arg.substr("--ai-fast-forward=".length()))
+			ai_fast_forward = true
+			ai_mode_active = true
+		elif arg == "--ai-fast-forward":
+			ai_speed = DEFAULT_FAST_FORWARD_SCALE
+			ai_fast_forward = true
+			ai_mode_active = true
+		elif arg == "--ai-events":
+			structured_events_enabled = true
+		elif arg.begins_with("--ai-state-file="):
+			open_state_block(arg.substr("--ai-state-file=".length()))
 
 	if ai_mode_active:
-		Engine.time_scale = ai_speed
-		AILogger.event("AI 模式已激活，设置游戏速度为: " + str(ai_speed))
+		set_game_speed(ai_speed, ai_fast_forward)
+		AILogger.event("AI 模式已激活，设置游戏速度为: " + str(time_scale) + (" (快进)" if fast_forward else ""))
+
+## 开始每帧写入共享内存状态块；path 为空时关闭
+func open_state_block(path: String) -> bool:
+	close_state_block()
+	if path == "":
+		return false
+	var writer = StateBlockWriterScript.new()
+	if not writer.open(path):
+		return false
+	state_writer = writer
+	AILogger.net_connection("状态块已开启", path)
+	return true
+
+func close_state_block():
+	if state_writer:
+		state_writer.close()
+		state_writer = null
+
+## 设置游戏速度；enable_fast_forward 时按倍率提高物理帧率，headless 下跳过视觉效果
+func set_game_speed(scale: float, enable_fast_forward: bool = false) -> Dictionary:
+	time_scale = clampf(scale, 0.1, MAX_TIME_SCALE)
+	fast_forward = enable_fast_forward
+	Engine.time_scale = time_scale
+
+	if fast_forward and time_scale > 1.0:
+		Engine.physics_ticks_per_second = int(ceil(_base_physics_ticks * time_scale))
+		Engine.max_physics_steps_per_frame = int(ceil(_base_max_physics_steps * time_scale))
+	else:
+		Engine.physics_ticks_per_second = _base_physics_ticks
+		Engine.max_physics_steps_per_frame = _base_max_physics_steps
+
+	var skip_visuals = fast_forward and DisplayServer.get_name() == "headless"
+	if GameManager.skip_visuals != skip_visuals:
+		GameManager.skip_visuals = skip_visuals
+		if is_inside_tree():
+			get_tree().call_group("visual_controllers", "set_process", not skip_visuals)
+
+	return {
+		"success": true,
+		"time_scale": time_scale,
+		"fast_forward": fast_forward,
+		"physics_ticks_per_second": Engine.physics_ticks_per_second,
+		"skip_visuals": skip_visuals
+	}
 
 # ===== 信号 =====
 signal state_sent(event_type: String, state: Dictionary)
-signal action_received(actions: Array)
+signal action_received(actions: Array, action_id: String)
 signal client_connected
 signal client_disconnected
 
 func _ready():
 	process_mode = Node.PROCESS_MODE_ALWAYS
+	_base_physics_ticks = Engine.physics_ticks_per_second
+	_base_max_physics_steps = Engine.max_physics_steps_per_frame
 	_parse_command_line_args()  # 解析命令行参数
 	# 延迟启动服务器，确保网络子系统就绪
 	call_deferred("_delayed_start_server")
@@ -67,6 +146,7 @@ func _delayed_start_server():
 
 func _exit_tree():
 	_stop_server()
+	close_state_block()
 
 # ===== 服务器管理 =====
 
@@ -94,10 +174,13 @@ func _process(_delta):
 	if tcp_server and tcp_server.is_connection_available():
 		var conn = tcp_server.take_connection()
 		if conn:
-			if websocket_peer:
+			# 尚未完成握手的旧连接（如网关的端口探测）不占用客户端名额
+			if websocket_peer and websocket_peer.get_ready_state() == WebSocketPeer.STATE_OPEN:
 				AILogger.net_connection("拒绝新连接", "已有客户端连接")
 				conn.disconnect_from_host()
 			else:
+				if websocket_peer:
+					websocket_peer.close()
 				websocket_peer = WebSocketPeer.new()
 				websocket_peer.accept_stream(conn)
 				AILogger.net_connection("收到TCP连接", "等待WebSocket握手...")
@@ -136,6 +219,9 @@ func _process(_delta):
 			is_waiting_for_action = false
 			client_disconnected.emit()
 
+	if state_writer:
+		state_writer.write_frame()
+
 # ===== 游戏信号连接 =====
 
 func _connect_game_signals():
@@ -189,14 +275,19 @@ func _on_upgrade_selection_shown():
 func _on_game_over():
 	is_game_over = true
 	AILogger.event("游戏结束，发送 GameOver 事件给 AI")
-	broadcast_text("【系统提示】游戏结束，图腾核心已被摧毁！")
+	var narrative = "【系统提示】游戏结束，图腾核心已被摧毁！"
+	broadcast_text(narrative)
+	var wave = GameManager.session_data.wave if GameManager.session_data else 1
+	broadcast_event("GameOver", {"wave": wave}, narrative)
 
 func _on_enemy_spawned(enemy: Node):
 	if enemy and "enemy_data" in enemy and enemy.enemy_data:
 		var data = enemy.enemy_data
 		if data and data.get("is_boss", false):
 			var enemy_type = enemy.type_key if "type_key" in enemy else "未知"
-			broadcast_text("【Boss出现】强大的 %s 出现了！" % enemy_type)
+			var narrative = "【Boss出现】强大的 %s 出现了！" % enemy_type
+			broadcast_text(narrative)
+			broadcast_event("BossSpawned", {"enemy_type": enemy_type}, narrative)
 
 func _on_damage_dealt(unit, amount):
 	# NarrativeLogger handles core damage
@@ -206,7 +297,9 @@ func _on_damage_dealt(unit, amount):
 		var health_percent = core_health / max_health if max_health > 0 else 1.0
 
 		if health_percent < 0.3:
-			broadcast_text("【危险警告】图腾核心血量低于30%！")
+			var narrative = "【危险警告】图腾核心血量低于30%！"
+			broadcast_text(narrative)
+			broadcast_event("CoreHealthLow", {"health": core_health, "max_health": max_health}, narrative)
 
 func _on_trap_placed(trap_type: String, position: Vector2, source_unit):
 	var unit_type = source_unit.type_key if source_unit and source_unit.has_method("get") and source_unit.get("type_key") else "未知单位"
@@ -230,6 +323,51 @@ func broadcast_text(text: String):
 	if state == WebSocketPeer.STATE_OPEN:
 		websocket_peer.send_text(text)
 
+## 发送结构化 JSON 帧（与自然语言文本流共用同一连接，客户端按首字符 "{" 区分）
+func send_json(payload: Dictionary):
+	if not is_client_connected:
+		return
+	if not websocket_peer:
+		return
+
+	var state = websocket_peer.get_ready_state()
+	if state == WebSocketPeer.STATE_OPEN:
+		websocket_peer.send_text(JSON.stringify(payload))
+
+## 发送结构化事件帧，仅在客户端订阅了事件通道时发送
+func broadcast_event(event_type: String, data: Dictionary, narrative: String = ""):
+	if not structured_events_enabled:
+		return
+	send_json({
+		"type": "event",
+		"event_type": event_type,
+		"data": _to_json_safe(data),
+		"text": narrative
+	})
+
+## 将 Vector2/Vector2i 等非 JSON 原生类型转换为可序列化的字典
+func _to_json_safe(value):
+	if value is Vector2i or value is Vector2:
+		return {"x": value.x, "y": value.y}
+	if value is Dictionary:
+		var out = {}
+		for key in value:
+			out[str(key)] = _to_json_safe(value[key])
+		return out
+	if value is Array:
+		var arr = []
+		for item in value:
+			arr.append(_to_json_safe(item))
+		return arr
+	if value is Object:
+		return str(value)
+	return value
+
+## 回传一批动作的逐条执行结果，action_id 为空时不发送
+func send_action_result(action_id: String, results: Array):
+	if action_id == "":
+		return
+	send_json({"type": "action_result", "action_id": action_id, "results": results})
 
 # ===== 客户端消息处理 =====
 
@@ -246,9 +384,31 @@ func _handle_client_message(text: String):
 		broadcast_text("【错误】消息必须是 JSON 对象")
 		return
 
+	# 订阅/取消结构化事件通道，不受游戏结束状态影响
+	if data.get("type", "") == "subscribe_events":
+		structured_events_enabled = bool(data.get("enabled", true))
+		AILogger.net_connection("结构化事件通道", "已开启" if structured_events_enabled else "已关闭")
+		return
+
+	# 可选的请求关联 ID，动作执行完毕后通过 action_result 帧回传逐条结果
+	var action_id = str(data.get("action_id", ""))
+
+	# 调整游戏速度/快进（网关按会话配置下发），不受游戏结束状态影响
+	if data.get("type", "") == "set_game_speed":
+		var result = set_game_speed(float(data.get("time_scale", 1.0)), bool(data.get("fast_forward", false)))
+		result["type"] = "set_game_speed"
+		send_action_result(action_id, [result])
+		return
+
+	# 原地复位（网关在测试场景之间复用同一个 Godot 进程），游戏结束后同样可用
+	if data.get("type", "") == "reset_game":
+		_reset_game_in_place(action_id)
+		return
+
 	if is_game_over:
 		var current_wave = GameManager.session_data.wave if GameManager.session_data else 1
 		broadcast_text("【游戏结束】当前波次：%d，核心血量：0。" % current_wave)
+		send_action_result(action_id, [{"success": false, "error_message": "游戏已结束"}])
 		return
 
 	if data.has("type") and data["type"] == "observe":
@@ -260,9 +420,19 @@ func _handle_client_message(text: String):
 		var actions = data["actions"]
 		# 安全类型检查
 		if actions is Array:
-			action_received.emit(actions)
+			action_received.emit(actions, action_id)
 		else:
 			broadcast_text("【错误】actions 必须是数组")
+			send_action_result(action_id, [{"success": false, "error_message": "actions 必须是数组"}])
+
+## 调用 GameManager.reset_game 复位到初始状态，并通过 action_result 回传结果
+func _reset_game_in_place(action_id: String):
+	var ok = GameManager.has_method("reset_game") and GameManager.reset_game()
+	if ok:
+		broadcast_text("【系统提示】游戏已重置到初始状态。")
+		send_action_result(action_id, [{"type": "reset_game", "success": true}])
+	else:
+		send_action_result(action_id, [{"type": "reset_game", "success": false, "error_message": "游戏重置失败"}])
 
 func _generate_natural_language_state() -> String:
 	var wave = GameManager.session_data.wave if GameManager.session_data else 1
@@ -337,7 +507,9 @@ func _generate_natural_language_state() -> String:
 func _send_ping():
 	var core_health = GameManager.core_health
 	var max_health = GameManager.max_core_health
-	broadcast_text("【状态同步】当前核心血量：%.1f/%.1f" % [core_health, max_health])
+	var narrative = "【状态同步】当前核心血量：%.1f/%.1f" % [core_health, max_health]
+	broadcast_text(narrative)
+	broadcast_event("StateSync", {"health": core_health, "max_health": max_health}, narrative)
 
 # ===== 公共 API =====
 
@@ -14,8 +14,10 @@ func _ready():
 		AIManager.action_received.connect(_on_actions_received)
 		AILogger.action("ActionDispatcher已连接到 AIManager")
 
-func _on_actions_received(actions: Array):
+func _on_actions_received(actions: Array, action_id: String = ""):
 	if actions.size() == 0:
+		if AIManager:
+			AIManager.send_action_result(action_id, [])
 		return
 
 	AILogger.action("ActionDispatcher 开始分发 %d 个动作" % actions.size())
@@ -23,20 +25,32 @@ func _on_actions_received(actions: Array):
 	# 使用 async 立即执行异步任务
 	var t = get_tree().create_timer(0.001)
 	t.timeout.connect(func():
-		_async_execute_actions(actions)
+		_async_execute_actions(actions, action_id)
 	)
 
-func _async_execute_actions(actions: Array):
+## 依次执行动作，收集每个动作的 success/error_message 结果
+## 若带有 action_id，执行完毕后通过 AIManager 回传给客户端
+func _async_execute_actions(actions: Array, action_id: String = "") -> Array:
+	var results: Array = []
 	for action in actions:
 		# 安全类型检查
 		if not action is Dictionary:
 			AILogger.error("动作格式错误: %s" % str(action))
+			results.append({"success": false, "error_message": "动作格式错误: %s" % str(action)})
 			continue
 
 		var result = await _execute_action(action)
 		if not result.get("success", false):
 			AILogger.error("动作执行失败: %s" % result.get("error_message", "未知错误"))
 
+		var entry = result.duplicate()
+		entry["type"] = action.get("type", "")
+		results.append(entry)
+
+	if AIManager:
+		AIManager.send_action_result(action_id, results)
+	return results
+
 func _execute_action(action: Dictionary) -> Dictionary:
 	var action_type = action.get("type", "")
 
@@ -77,6 +91,10 @@ func _execute_action(action: Dictionary) -> Dictionary:
 			return await _action_spawn_unit(action)
 		"set_core_hp":
 			return _action_set_core_hp(action)
+		"set_game_speed":
+			return _action_set_game_speed(action)
+		"set_log_level":
+			return _action_set_log_level(action)
 		_:
 			return {"success": false, "error_message": "未知动作类型: %s" % action_type}
 
@@ -352,6 +370,33 @@ func _action_set_core_hp(action: Dictionary) -> Dictionary:
 
 	return {"success": false, "error_message": "SessionData未初始化"}
 
+func _action_set_game_speed(action: Dictionary) -> Dictionary:
+	"""设置游戏速度；fast_forward=true 时同步提高物理帧率并在 headless 下跳过视觉效果"""
+	var scale = action.get("time_scale", 1.0)
+	if not (scale is int or scale is float) or scale <= 0:
+		return {"success": false, "error_message": "无效的 time_scale: %s" % str(scale)}
+	return AIManager.set_game_speed(float(scale), bool(action.get("fast_forward", false)))
+
+func _action_set_log_level(action: Dictionary) -> Dictionary:
+	"""调整 AILogger 分类级别；levels 可为 "combat:off,net:warn" 或 {"combat": "off"}，compact 切换紧凑格式"""
+	var levels = action.get("levels", "")
+	var invalid = []
+	if levels is String:
+		invalid = AILogger.set_levels_from_spec(levels)
+	elif levels is Dictionary:
+		for category in levels:
+			if not AILogger.set_level(str(category), str(levels[category])):
+				invalid.append("%s:%s" % [category, levels[category]])
+	else:
+		return {"success": false, "error_message": "无效的 levels: %s" % str(levels)}
+
+	if action.has("compact"):
+		AILogger.compact = bool(action.compact)
+
+	if not invalid.is_empty():
+		return {"success": false, "error_message": "无法识别的日志级别配置: %s" % ", ".join(invalid), "levels": AILogger.get_levels()}
+	return {"success": true, "levels": AILogger.get_levels(), "compact": AILogger.compact}
+
 # ===== Helpers =====
 
 func _parse_position(pos) -> Variant:
@@ -124,8 +124,10 @@ var main_game = null
 var reward_manager: Node = null
 var data_manager: Node = null
 var lifesteal_manager: Node = null
+var dot_scheduler: Node = null
 var summon_manager: Node = null
 var wave_system_manager: Node = null
+var swarm_manager: Node = null # 由 WaveSystemManager 创建，群体敌人不在 enemies 分组与登记表中
 
 var permanent_health_bonus: float = 0.0
 
@@ -145,6 +147,14 @@ func remove_global_buff(buff_name: String):
 func get_global_buff(buff_name: String, default_value: float = 1.0) -> float:
 	return _global_buffs.get(buff_name, default_value)
 
+# ===== 全局属性修正缓存 =====
+# get_stat_modifier 在每次攻击/伤害计算时调用，结果按 stat_type 缓存；
+# 获得遗物、图腾机制变化、核心血量变化影响 raven_feather / berserker_horn 时失效
+var _stat_modifier_cache: Dictionary = {}
+var _raven_feather_owned: bool = false
+var _berserker_horn_owned: bool = false
+var _berserker_horn_active: bool = false  # 核心血量是否低于狂战号角阈值
+
 # Relic Logic
 var indomitable_triggered: bool = false
 var indomitable_timer: float = 0.0
@@ -160,6 +170,16 @@ var cheat_fast_cooldown: bool = false
 
 var _hit_stop_end_time: int = 0
 
+# 快进模式（headless）下跳过纯视觉效果，由 AIManager.set_game_speed 设置
+var skip_visuals: bool = false
+
+# ===== 敌人登记表 =====
+# 敌人 _ready 时经 enemy_spawned 登记，离开场景树时注销；
+# 替代热路径上反复调用 get_nodes_in_group("enemies")（每次都会分配新数组）
+var _enemies: Dictionary = {}  # instance_id -> 敌人节点
+var _enemy_snapshot: Array = []
+var _enemy_snapshot_dirty: bool = false
+
 # Core Mechanics Variables
 var current_mechanic: Node = null
 var secondary_mechanic: Node = null  # 次级图腾机制实例
@@ -177,6 +197,7 @@ func _ready():
 	damage_dealt.connect(_on_damage_dealt)
 	# Connect enemy_died signal for soul_catcher
 	enemy_died.connect(_on_enemy_died)
+	enemy_spawned.connect(_register_enemy)
 
 	# Initialize DataManager and load data first
 	var DataManagerScript = load("res://src/Scripts/Managers/DataManager.gd")
@@ -195,12 +216,18 @@ func _ready():
 			reward_manager = rm_scene.new()
 			add_child(reward_manager)
 			reward_manager.sacrifice_state_changed.connect(_on_sacrifice_state_changed)
+			reward_manager.reward_added.connect(_on_reward_added_for_stats)
 
 	# Initialize LifestealManager
 	var LSManagerScript = load("res://src/Scripts/Managers/LifestealManager.gd")
 	lifesteal_manager = LSManagerScript.new()
 	add_child(lifesteal_manager)
 
+	# Initialize DotScheduler（中毒/流血按批次结算）
+	var DotSchedulerScript = load("res://src/Scripts/Managers/DotScheduler.gd")
+	dot_scheduler = DotSchedulerScript.new()
+	add_child(dot_scheduler)
+
 	# Initialize WaveSystemManager
 	var WaveSystemScript = load("res://src/Scripts/Managers/WaveSystemManager.gd")
 	wave_system_manager = WaveSystemScript.new()
@@ -218,6 +245,7 @@ func _ready():
 
 	# Connect SessionData signals to GameManager signals
 	session_data.gold_changed.connect(_on_session_gold_changed)
+	session_data.core_health_changed.connect(_on_core_health_changed_for_stats)
 
 # ===== P0批次遗物回调函数 =====
 func _setup_soul_catcher():
@@ -306,6 +334,7 @@ func _initialize_mechanic():
 	if mech_script:
 		current_mechanic = mech_script.new()
 		add_child(current_mechanic)
+	invalidate_stat_modifiers()
 
 	# 创建次级图腾机制（如果已选择）
 	if session_data and session_data.has_secondary_totem:
@@ -399,6 +428,8 @@ func use_item_effect(item_id: String, target_unit = null) -> bool:
 	return false
 
 func trigger_hit_stop(duration_sec: float, time_scale: float = 0.05):
+	if skip_visuals:
+		return
 	var current_time = Time.get_ticks_msec()
 	var duration_msec = int(duration_sec * 1000)
 	var new_end_time = current_time + duration_msec
@@ -419,7 +450,7 @@ func _on_session_gold_changed(new_amount: int):
 	resource_changed.emit()
 
 func _on_hit_stop_end():
-	Engine.time_scale = 1.0
+	Engine.time_scale = AIManager.time_scale if AIManager else 1.0
 
 func _process(delta):
 	if indomitable_timer > 0:
@@ -439,6 +470,40 @@ func get_stat_modifier(stat_type: String, context: Dictionary = {}) -> float:
 	if not reward_manager:
 		return 1.0
 
+	# 带 context 的查询可能因调用方而异，不走缓存
+	if context.is_empty():
+		var cached = _stat_modifier_cache.get(stat_type)
+		if cached != null:
+			return cached
+		var value = _compute_stat_modifier(stat_type, context)
+		_stat_modifier_cache[stat_type] = value
+		return value
+	return _compute_stat_modifier(stat_type, context)
+
+func invalidate_stat_modifiers(stat_type: String = ""):
+	"""修正来源变化后调用；不传参数时清空全部缓存（图腾机制自身的修正随状态变化时也应调用）"""
+	if stat_type.is_empty():
+		_stat_modifier_cache.clear()
+	else:
+		_stat_modifier_cache.erase(stat_type)
+
+func _on_reward_added_for_stats(id: String):
+	_raven_feather_owned = _raven_feather_owned or id == "raven_feather"
+	_berserker_horn_owned = _berserker_horn_owned or id == "berserker_horn"
+	_berserker_horn_active = core_health < max_core_health * 0.2
+	invalidate_stat_modifiers()
+
+func _on_core_health_changed_for_stats(current: float, maximum: float):
+	# 渡鸦之羽随血量比例连续变化；狂战号角只在跨过 20% 阈值时变化
+	if _raven_feather_owned:
+		_stat_modifier_cache.erase("damage")
+	if _berserker_horn_owned:
+		var active = current < maximum * 0.2
+		if active != _berserker_horn_active:
+			_berserker_horn_active = active
+			_stat_modifier_cache.erase("attack_interval")
+
+func _compute_stat_modifier(stat_type: String, context: Dictionary) -> float:
 	var modifier: float = 1.0
 
 	match stat_type:
@@ -712,7 +777,44 @@ func trigger_impact(direction: Vector2, strength: float):
 	# Notify environment
 	world_impact.emit(direction, strength)
 
+func get_enemies_near(pos: Vector2, range_val: float) -> Array:
+	"""range_val 范围内的候选敌人（经 CombatManager 空间索引），调用方仍需按距离精确判断"""
+	if combat_manager:
+		return combat_manager.get_enemy_candidates(pos, range_val)
+	return get_enemies()
+
+func get_enemy_count() -> int:
+	"""场上敌人数量（O(1)）"""
+	return _enemies.size()
+
+func get_enemies() -> Array:
+	"""场上敌人的快照
+
+	登记表变化时才重建为新数组，未变化时重复返回同一个数组；
+	已取得的快照不会因之后的生成/死亡而改变。调用方不要修改返回的数组（需要排序等请先 duplicate）
+	"""
+	if _enemy_snapshot_dirty:
+		_enemy_snapshot = _enemies.values()
+		_enemy_snapshot_dirty = false
+	return _enemy_snapshot
+
+func _register_enemy(enemy):
+	if not is_instance_valid(enemy):
+		return
+	var id = enemy.get_instance_id()
+	if _enemies.has(id):
+		return
+	_enemies[id] = enemy
+	_enemy_snapshot_dirty = true
+	enemy.tree_exiting.connect(_unregister_enemy.bind(id), CONNECT_ONE_SHOT)
+
+func _unregister_enemy(id: int):
+	if _enemies.erase(id):
+		_enemy_snapshot_dirty = true
+
 func spawn_floating_text(pos: Vector2, value: String, type_or_color: Variant, direction: Vector2 = Vector2.ZERO):
+	if skip_visuals:
+		return
 	var color = Color.WHITE
 
 	if typeof(type_or_color) == TYPE_COLOR:
@@ -780,6 +882,8 @@ func reset_game() -> bool:
 		print("[Cheat] session_data is null, initializing new session...")
 		var SessionData = load("res://src/Scripts/Data/SessionData.gd")
 		session_data = SessionData.new()
+		session_data.core_health_changed.connect(_on_core_health_changed_for_stats)
+		invalidate_stat_modifiers()
 
 	print("[Cheat] Before reset - Wave: ", session_data.wave, ", Core HP: ", session_data.core_health, ", Game Over: ", session_data.game_over)
 
@@ -812,10 +916,22 @@ func reset_game() -> bool:
 			if is_instance_valid(enemy):
 				enemy.queue_free()
 
-	# 重置波次系统
+	# 重置波次系统（同时清空场上的群体敌人与波次统计）
 	if wave_system_manager:
-		wave_system_manager.current_wave = 1
-		wave_system_manager.is_wave_active = false
+		wave_system_manager.reset()
+
+	# 清空遗物及其全局加成，否则上一局的遗物仍会影响伤害与攻速
+	if reward_manager:
+		reward_manager.reset()
+	if lifesteal_manager:
+		lifesteal_manager.reset()
+	_global_buffs.clear()
+	damage_multiplier = 1.0
+	indomitable_triggered = false
+	_raven_feather_owned = false
+	_berserker_horn_owned = false
+	_berserker_horn_active = false
+	invalidate_stat_modifiers()
 
 	# 重置AIManager的is_game_over标志
 	if AIManager:
@@ -59,15 +59,17 @@ func _on_enemy_died(enemy, _killer):
 
 func _on_shop_refreshed(shop_units: Array):
 	var shop_desc = ""
+	var shop_costs = []
 	for i in range(shop_units.size()):
 		var unit_key = shop_units[i]
+		var cost = 0
 		if unit_key:
-			var cost = 0
 			if Constants.UNIT_TYPES.has(unit_key) and Constants.UNIT_TYPES[unit_key].has("cost"):
 				cost = Constants.UNIT_TYPES[unit_key]["cost"]
 			elif Constants.UNIT_TYPES.has(unit_key) and Constants.UNIT_TYPES[unit_key].has("levels") and Constants.UNIT_TYPES[unit_key]["levels"].has("1") and Constants.UNIT_TYPES[unit_key]["levels"]["1"].has("cost"):
 				cost = Constants.UNIT_TYPES[unit_key]["levels"]["1"]["cost"]
 			shop_desc += "%s(%d金币)，" % [unit_key, cost]
+		shop_costs.append(cost)
 
 	if shop_desc == "":
 		shop_desc = "商店为空。"
@@ -75,7 +77,7 @@ func _on_shop_refreshed(shop_units: Array):
 		shop_desc = shop_desc.trim_suffix("，") + "。"
 
 	var narrative = "【商店刷新】当前商店提供: %s" % shop_desc
-	_build_and_broadcast("ShopRefreshed", narrative, {"shop_units": shop_units})
+	_build_and_broadcast("ShopRefreshed", narrative, {"shop_units": shop_units, "shop_costs": shop_costs})
 
 func _on_unit_purchased(unit_key: String, target_zone: String, target_pos: Variant):
 	var pos_str = str(target_pos)
@@ -129,3 +131,5 @@ func _build_and_broadcast(event_type: String, narrative: String, data: Dictionar
 
 	if AIManager and AIManager.has_method("broadcast_text"):
 		AIManager.broadcast_text(narrative)
+		# 订阅了结构化事件的客户端同时收到 event_type + data，无需解析叙事文本
+		AIManager.broadcast_event(event_type, data, narrative)
@@ -13,11 +13,11 @@ func _process(delta):
 			var total = GameManager.wave_system_manager.total_enemies_for_wave
 			# There is no 'enemies_killed' in WaveSystemManager. We need to calculate it or check active enemies.
 			# But WaveSystemManager has 'enemies_to_spawn' which decreases.
-			# And we can count active enemies in group "enemies".
+			# And we can count active enemies via GameManager's enemy registry.
 			# Killed = Total - (ToSpawn + Active)
 
 			var to_spawn = GameManager.wave_system_manager.enemies_to_spawn
-			var active = get_tree().get_nodes_in_group("enemies").size()
+			var active = GameManager.get_enemy_count()
 
 			# If wave just started, to_spawn is total, active is 0. Killed = 0.
 			# If wave ending, to_spawn is 0, active is 0. Killed = Total.
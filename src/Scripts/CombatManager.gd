@@ -3,12 +3,70 @@ extends Node
 const PROJECTILE_SCENE = preload("res://src/Scenes/Game/Projectile.tscn")
 const LIGHTNING_SCENE = preload("res://src/Scenes/Game/LightningArc.tscn")
 const SLASH_EFFECT_SCRIPT = preload("res://src/Scripts/Effects/SlashEffect.gd")
+const EnemySpatialIndex = preload("res://src/Scripts/Components/EnemySpatialIndex.gd")
+const NodePool = preload("res://src/Scripts/Components/NodePool.gd")
+const ProjectileScript = preload("res://src/Scripts/Projectile.gd")
+
+# 对象池：空闲上限与开局预热数量
+const PROJECTILE_POOL_SIZE = 256
+const PROJECTILE_WARM_UP = 64
+const LIGHTNING_POOL_SIZE = 32
+const LIGHTNING_WARM_UP = 8
 
 var explosion_queue: Array = []
 const MAX_EXPLOSIONS_PER_FRAME = 10
 
+# 敌人空间索引：所有按距离查找敌人的逻辑都经由它，避免每次遍历 "enemies" 分组
+var enemy_index = EnemySpatialIndex.new(Constants.TILE_SIZE)
+
+# 弹道与闪电弧对象池，避免高射速时反复 instantiate / queue_free
+var projectile_pool = NodePool.new(PROJECTILE_SCENE, PROJECTILE_POOL_SIZE)
+var lightning_pool = NodePool.new(LIGHTNING_SCENE, LIGHTNING_POOL_SIZE)
+
 func _ready():
 	GameManager.combat_manager = self
+	# 在敌人移动之后刷新索引
+	process_physics_priority = 100
+	GameManager.enemy_spawned.connect(_on_enemy_spawned)
+	for enemy in GameManager.get_enemies():
+		_on_enemy_spawned(enemy)
+	projectile_pool.warm_up(PROJECTILE_WARM_UP)
+	lightning_pool.warm_up(LIGHTNING_WARM_UP)
+
+func _exit_tree():
+	projectile_pool.clear()
+	lightning_pool.clear()
+
+func acquire_projectile(proj_type: String = "") -> Node:
+	"""取一个未加入场景树的弹道；会被长期持有引用的类型不走对象池"""
+	if proj_type in ProjectileScript.NON_POOLED_TYPES:
+		return PROJECTILE_SCENE.instantiate()
+	return projectile_pool.acquire()
+
+func spawn_lightning_arc(start_pos: Vector2, end_pos: Vector2, parent: Node = null):
+	var arc = lightning_pool.acquire()
+	(parent if parent else self).add_child(arc)
+	arc.setup(start_pos, end_pos)
+	return arc
+
+func get_pool_stats() -> Dictionary:
+	return {
+		"projectile": projectile_pool.get_stats(),
+		"lightning": lightning_pool.get_stats()
+	}
+
+func _physics_process(_delta):
+	enemy_index.refresh()
+
+func _on_enemy_spawned(enemy):
+	if not is_instance_valid(enemy) or enemy_index.has(enemy):
+		return
+	enemy_index.insert(enemy)
+	enemy.tree_exiting.connect(enemy_index.remove.bind(enemy), CONNECT_ONE_SHOT)
+
+func get_enemy_candidates(pos: Vector2, range_val: float) -> Array:
+	"""range_val 范围内的候选敌人，调用方仍需按距离精确判断"""
+	return enemy_index.query(pos, range_val)
 
 func _process(delta):
 	if explosion_queue.size() > 0:
@@ -83,7 +141,7 @@ func find_nearest_enemy(pos: Vector2, range_val: float):
 	var nearest = null
 	var min_dist = range_val
 
-	for enemy in get_tree().get_nodes_in_group("enemies"):
+	for enemy in enemy_index.query(pos, range_val):
 		# 检查敌人是否有效且已完成初始化
 		if not is_instance_valid(enemy) or not enemy.is_node_ready():
 			continue
@@ -96,7 +154,7 @@ func find_nearest_enemy(pos: Vector2, range_val: float):
 
 func get_enemies_in_range(pos: Vector2, range_val: float) -> Array:
 	var found = []
-	for enemy in get_tree().get_nodes_in_group("enemies"):
+	for enemy in enemy_index.query(pos, range_val):
 		# 检查敌人是否有效且已完成初始化
 		if is_instance_valid(enemy) and enemy.is_node_ready():
 			if pos.distance_to(enemy.global_position) <= range_val:
@@ -113,9 +171,7 @@ func perform_lightning_attack(source_unit, start_pos, target, chain_left, hit_li
 	hit_list.append(target)
 
 	# Visual
-	var arc = LIGHTNING_SCENE.instantiate()
-	add_child(arc)
-	arc.setup(start_pos, target.global_position)
+	spawn_lightning_arc(start_pos, target.global_position)
 
 	# 记录闪电链攻击日志（仅在第一次攻击时记录）
 	if AILogger and hit_list.size() == 1:
@@ -135,7 +191,7 @@ func find_nearest_enemy_excluding(pos: Vector2, range_val: float, exclude_list:
 	var nearest = null
 	var min_dist = range_val
 
-	for enemy in get_tree().get_nodes_in_group("enemies"):
+	for enemy in enemy_index.query(pos, range_val):
 		if enemy in exclude_list: continue
 
 		var dist = pos.distance_to(enemy.global_position)
@@ -145,6 +201,32 @@ func find_nearest_enemy_excluding(pos: Vector2, range_val: float, exclude_list:
 
 	return nearest
 
+func get_on_hit_effects(source_unit, data_source: Dictionary) -> Dictionary:
+	"""单位命中时附带的效果（legacy effects 格式），投射物与群体敌人命中共用"""
+	var effects = {}
+	if "active_buffs" in source_unit:
+		for buff in source_unit.active_buffs:
+			if buff == "fire": effects["burn"] = 3.0
+			if buff == "poison": effects["poison"] = 5.0
+
+	# Check native unit traits/attributes if they have intrinsic effects (Optional, based on task)
+	# But Task says "fire" buff or attribute.
+	if data_source.get("buffProvider") == "fire": # Although Torch doesn't shoot usually
+		effects["burn"] = 3.0
+	if data_source.get("buffProvider") == "poison":
+		effects["poison"] = 5.0
+
+	# New Traits Logic
+	var unit_trait = data_source.get("trait")
+	if unit_trait == "poison_touch":
+		effects["poison"] = 5.0 # Accumulates
+	elif unit_trait == "slow":
+		effects["slow"] = 2.0 # Duration
+	elif unit_trait == "freeze":
+		effects["freeze"] = 2.0 # Duration
+
+	return effects
+
 func spawn_projectile(source_unit, pos, target, extra_stats = {}):
 	return _spawn_single_projectile(source_unit, pos, target, extra_stats)
 
@@ -160,8 +242,6 @@ func _spawn_single_projectile(source_unit, pos, target, extra_stats):
 	if data_source.get("proj") == "ink" or extra_stats.has("angle"):
 		target = null
 
-	var proj = PROJECTILE_SCENE.instantiate()
-
 	# Crit Calculation
 	var crit_rate = source_unit.get("crit_rate") if source_unit.get("crit_rate") else 0.0
 	var is_critical = randf() < crit_rate
@@ -198,31 +278,12 @@ func _spawn_single_projectile(source_unit, pos, target, extra_stats):
 	}
 
 	# Merge buffs from Unit.gd (if present)
-	var effects = {}
 	if "active_buffs" in source_unit:
 		for buff in source_unit.active_buffs:
 			if buff == "bounce": stats["bounce"] += 1
 			if buff == "split": stats["split"] += 1
-			if buff == "fire": effects["burn"] = 3.0
-			if buff == "poison": effects["poison"] = 5.0
-
-	# Check native unit traits/attributes if they have intrinsic effects (Optional, based on task)
-	# But Task says "fire" buff or attribute.
-	if data_source.get("buffProvider") == "fire": # Although Torch doesn't shoot usually
-		effects["burn"] = 3.0
-	if data_source.get("buffProvider") == "poison":
-		effects["poison"] = 5.0
 
-	# New Traits Logic
-	var unit_trait = data_source.get("trait")
-	if unit_trait == "poison_touch":
-		effects["poison"] = 5.0 # Accumulates
-	elif unit_trait == "slow":
-		effects["slow"] = 2.0 # Duration
-	elif unit_trait == "freeze":
-		effects["freeze"] = 2.0 # Duration
-
-	stats["effects"] = effects
+	stats["effects"] = get_on_hit_effects(source_unit, data_source)
 
 	# Merge extra stats
 	stats.merge(extra_stats, true)
@@ -236,6 +297,9 @@ func _spawn_single_projectile(source_unit, pos, target, extra_stats):
 		proj_type = extra_stats.type
 
 	var proj_speed = stats.get("speed", data_source.get("projectile_speed", 400.0))
+	# 陨石在 setup 中可能被改写为龙息，按最终类型决定是否走对象池
+	var pool_type = "dragon_breath" if stats.has("is_meteor") and proj_type == "pinecone" else proj_type
+	var proj = acquire_projectile(pool_type)
 	proj.setup(pos, target, final_damage, proj_speed, proj_type, stats)
 	add_child(proj)
 
@@ -280,7 +344,7 @@ func trigger_poison_explosion(pos: Vector2, damage: float, stacks: int, source:
 
 func _process_burn_explosion_logic(pos: Vector2, damage: float, source: Object):
 	var radius = 120.0
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = enemy_index.query(pos, radius)
 	var burn_script = load("res://src/Scripts/Effects/BurnEffect.gd")
 	var affected_targets = []
 
@@ -299,13 +363,16 @@ func _process_burn_explosion_logic(pos: Vector2, damage: float, source: Object):
 					"stacks": 1
 				})
 
+	if GameManager.swarm_manager:
+		GameManager.swarm_manager.damage_in_radius(pos, radius, damage)
+
 	# Emit signal for test logging with affected targets
 	if GameManager.has_signal("burn_explosion"):
 		GameManager.burn_explosion.emit(pos, damage, source, affected_targets)
 
 func _process_poison_explosion_logic(pos: Vector2, damage: float, stacks: int, source: Object):
 	var radius = 100.0
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = enemy_index.query(pos, radius)
 	var poison_script = load("res://src/Scripts/Effects/PoisonEffect.gd")
 	var affected_targets = []
 
@@ -325,6 +392,9 @@ func _process_poison_explosion_logic(pos: Vector2, damage: float, stacks: int, s
 					"stacks": spread_stacks
 				})
 
+	if GameManager.swarm_manager:
+		GameManager.swarm_manager.damage_in_radius(pos, radius, damage)
+
 	# Emit signal for test logging with affected targets
 	if GameManager.has_signal("poison_explosion"):
 		GameManager.poison_explosion.emit(pos, damage, stacks, source)
@@ -341,10 +411,12 @@ func check_kill_bonuses(killer_unit, victim = null):
 
 
 func deal_global_damage(damage: float, type: String):
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = GameManager.get_enemies()
 	print("[CombatManager] Global Damage: ", damage, " Enemies found: ", enemies.size())
 	for enemy in enemies:
 		# 检查敌人是否有效且已完成初始化（避免攻击半成品敌人导致崩溃）
 		if is_instance_valid(enemy) and enemy.is_node_ready():
 			# Pass GameManager as source since it's a core effect
 			enemy.take_damage(damage, GameManager, type)
+	if GameManager.swarm_manager:
+		GameManager.swarm_manager.damage_all(damage)
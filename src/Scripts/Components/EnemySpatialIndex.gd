@@ -0,0 +1,116 @@
+extends RefCounted
+
+## 敌人空间索引
+## 以 GridManager.TILE_SIZE 为格子边长的均匀网格。敌人只在跨格时才移动桶，
+## 查询返回与圆的外接矩形相交的格子里的敌人（候选集合），调用方仍按距离精确过滤。
+
+# 查询外扩距离：索引每个物理帧刷新一次，补偿刷新之后、查询之前的位移
+const QUERY_SLACK: float = 16.0
+
+var cell_size: float
+
+var _cells: Dictionary = {}    # Vector2i -> Array[int]（格子内敌人的 instance_id）
+var _cell_of: Dictionary = {}  # instance_id -> Vector2i
+var _enemies: Dictionary = {}  # instance_id -> 敌人节点
+
+func _init(size: float = 60.0):
+	cell_size = size
+
+func cell_of(pos: Vector2) -> Vector2i:
+	return Vector2i(floori(pos.x / cell_size), floori(pos.y / cell_size))
+
+func size() -> int:
+	return _enemies.size()
+
+func has(enemy: Node) -> bool:
+	return _enemies.has(enemy.get_instance_id())
+
+func insert(enemy: Node):
+	var id = enemy.get_instance_id()
+	if _enemies.has(id):
+		return
+	var cell = cell_of(enemy.global_position)
+	_enemies[id] = enemy
+	_cell_of[id] = cell
+	_bucket(cell).append(id)
+
+func remove(enemy: Node):
+	_remove_id(enemy.get_instance_id())
+
+func clear():
+	_cells.clear()
+	_cell_of.clear()
+	_enemies.clear()
+
+func refresh():
+	"""按当前位置重新归格；只有跨格的敌人才会移动桶，失效的节点被移除"""
+	var stale = []
+	for id in _enemies:
+		var enemy = _enemies[id]
+		if not is_instance_valid(enemy):
+			stale.append(id)
+			continue
+		var cell = cell_of(enemy.global_position)
+		var old_cell = _cell_of[id]
+		if cell != old_cell:
+			_unbucket(old_cell, id)
+			_cell_of[id] = cell
+			_bucket(cell).append(id)
+
+	for id in stale:
+		_remove_id(id)
+
+func query(pos: Vector2, radius: float) -> Array:
+	"""返回 pos 周围 radius 内的候选敌人（可能包含略远的敌人，不含失效节点）"""
+	var r = radius + QUERY_SLACK
+	var lo = cell_of(pos - Vector2(r, r))
+	var hi = cell_of(pos + Vector2(r, r))
+	var result = []
+
+	var cell_count = (hi.x - lo.x + 1) * (hi.y - lo.y + 1)
+	if cell_count > _cells.size():
+		# 查询范围覆盖的格子比非空格子还多，直接遍历非空格子
+		for cell in _cells:
+			if cell.x >= lo.x and cell.x <= hi.x and cell.y >= lo.y and cell.y <= hi.y:
+				_collect(_cells[cell], result)
+	else:
+		for y in range(lo.y, hi.y + 1):
+			for x in range(lo.x, hi.x + 1):
+				var bucket = _cells.get(Vector2i(x, y))
+				if bucket:
+					_collect(bucket, result)
+	return result
+
+func all() -> Array:
+	var result = []
+	for id in _enemies:
+		var enemy = _enemies[id]
+		if is_instance_valid(enemy):
+			result.append(enemy)
+	return result
+
+func _collect(bucket: Array, result: Array):
+	for id in bucket:
+		var enemy = _enemies[id]
+		if is_instance_valid(enemy):
+			result.append(enemy)
+
+func _bucket(cell: Vector2i) -> Array:
+	if not _cells.has(cell):
+		_cells[cell] = []
+	return _cells[cell]
+
+func _unbucket(cell: Vector2i, id: int):
+	var bucket = _cells.get(cell)
+	if bucket == null:
+		return
+	bucket.erase(id)
+	if bucket.is_empty():
+		_cells.erase(cell)
+
+func _remove_id(id: int):
+	if not _enemies.has(id):
+		return
+	_unbucket(_cell_of[id], id)
+	_cell_of.erase(id)
+	_enemies.erase(id)
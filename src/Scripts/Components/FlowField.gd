@@ -0,0 +1,103 @@
+extends RefCounted
+
+## 导航流场
+## 以目标格为源，在 AStarGrid2D 上做一次反向 Dijkstra，记录每个格子到目标的代价与下一步。
+## 代价与 AStarGrid2D 一致：走进某格的代价 = 1 × 该格 weight_scale，实心格不可通行，只走四方向。
+## 所有前往同一目标的敌人共享同一张流场，查询下一步是 O(1)，取路径是 O(路径长度)。
+
+const NEIGHBORS = [Vector2i.RIGHT, Vector2i.LEFT, Vector2i.DOWN, Vector2i.UP]
+const NO_NEXT: int = -1
+
+var target: Vector2i
+var region: Rect2i
+
+var _grid: AStarGrid2D
+var _cost: PackedFloat32Array = PackedFloat32Array()
+var _next: PackedInt32Array = PackedInt32Array()
+
+func _init(grid: AStarGrid2D, target_cell: Vector2i):
+	_grid = grid
+	target = target_cell
+	build()
+
+func build():
+	"""从目标格开始反向扩展，重建整张流场"""
+	region = _grid.region
+	var count = region.size.x * region.size.y
+	_cost.resize(count)
+	_cost.fill(INF)
+	_next.resize(count)
+	_next.fill(NO_NEXT)
+
+	if not _grid.is_in_boundsv(target) or _grid.is_point_solid(target):
+		return
+
+	# 地图只有几十个格子，开放列表线性取最小值比维护堆更省事
+	var open: Array[int] = [_index(target)]
+	_cost[_index(target)] = 0.0
+	var closed = {}
+
+	while not open.is_empty():
+		var best = 0
+		for i in range(1, open.size()):
+			if _cost[open[i]] < _cost[open[best]]:
+				best = i
+		var current = open[best]
+		open.remove_at(best)
+		if closed.has(current):
+			continue
+		closed[current] = true
+
+		var cell = _cell(current)
+		# 反向扩展：邻居走进 current 的代价取 current 的权重
+		var step_cost = _grid.get_point_weight_scale(cell)
+		for offset in NEIGHBORS:
+			var neighbor = cell + offset
+			if not _grid.is_in_boundsv(neighbor) or _grid.is_point_solid(neighbor):
+				continue
+			var n = _index(neighbor)
+			var cost = _cost[current] + step_cost
+			if cost < _cost[n]:
+				_cost[n] = cost
+				_next[n] = current
+				open.append(n)
+
+func is_reachable(cell: Vector2i) -> bool:
+	return region.has_point(cell) and _cost[_index(cell)] < INF
+
+func cost_at(cell: Vector2i) -> float:
+	if not region.has_point(cell):
+		return INF
+	return _cost[_index(cell)]
+
+func next_step(cell: Vector2i) -> Vector2i:
+	"""返回从 cell 朝目标走的下一格；已在目标或不可达时返回 cell 本身"""
+	if not region.has_point(cell):
+		return cell
+	var n = _next[_index(cell)]
+	return cell if n == NO_NEXT else _cell(n)
+
+func get_id_path(from: Vector2i) -> Array[Vector2i]:
+	"""与 AStarGrid2D.get_id_path 相同的格式：包含起点与终点，不可达时为空"""
+	var result: Array[Vector2i] = []
+	if not is_reachable(from):
+		return result
+	var cell = from
+	result.append(cell)
+	while cell != target:
+		cell = _cell(_next[_index(cell)])
+		result.append(cell)
+	return result
+
+func get_point_path(from: Vector2i) -> PackedVector2Array:
+	"""与 AStarGrid2D.get_point_path 相同的格式：格子对应的点坐标"""
+	var result = PackedVector2Array()
+	for cell in get_id_path(from):
+		result.append(_grid.get_point_position(cell))
+	return result
+
+func _index(cell: Vector2i) -> int:
+	return (cell.y - region.position.y) * region.size.x + (cell.x - region.position.x)
+
+func _cell(index: int) -> Vector2i:
+	return Vector2i(index % region.size.x, index / region.size.x) + region.position
@@ -0,0 +1,105 @@
+extends RefCounted
+
+## 通用节点池
+## 复用由同一个 PackedScene 实例化的节点，避免战斗热路径上反复 instantiate / queue_free。
+## 节点归还时先隐藏并停止处理，在帧末从场景树移除、调用其 reset_for_pool() 后放回空闲列表；
+## 空闲节点数超过 max_size 时直接释放。
+
+const POOL_META = "_node_pool"
+const RELEASED_META = "_node_pool_released"
+
+var scene: PackedScene
+var max_size: int
+
+var stats: Dictionary = {
+	"created": 0,   # 新实例化的节点数
+	"reused": 0,    # 从空闲列表取出的次数
+	"released": 0,  # 归还到池中的次数
+	"dropped": 0    # 因池满而直接释放的次数
+}
+
+var _free: Array = []
+var _pending: int = 0  # 已归还、等待帧末移出场景树的节点数
+
+func _init(packed_scene: PackedScene, capacity: int = 64):
+	scene = packed_scene
+	max_size = capacity
+
+static func release_node(node: Node):
+	"""归还节点；不是从池中取出的节点直接 queue_free"""
+	if not is_instance_valid(node):
+		return
+	var pool = node.get_meta(POOL_META, null)
+	if pool:
+		pool.release(node)
+	else:
+		node.queue_free()
+
+func warm_up(count: int):
+	"""预先实例化节点放入空闲列表"""
+	for i in range(min(count, max_size) - _free.size()):
+		_free.append(_create())
+
+func acquire() -> Node:
+	"""取出一个处于初始状态、不在场景树中的节点，调用方负责 setup 与 add_child"""
+	while not _free.is_empty():
+		var node = _free.pop_back()
+		if is_instance_valid(node):
+			node.set_meta(RELEASED_META, false)
+			node.set_process(true)
+			node.set_physics_process(true)
+			node.show()
+			stats.reused += 1
+			return node
+	return _create()
+
+func release(node: Node):
+	if not is_instance_valid(node) or node.get_meta(RELEASED_META, false):
+		return
+	if _free.size() + _pending >= max_size:
+		stats.dropped += 1
+		node.remove_meta(POOL_META)
+		node.queue_free()
+		return
+
+	node.set_meta(RELEASED_META, true)
+	node.set_process(false)
+	node.set_physics_process(false)
+	node.hide()
+	stats.released += 1
+	_pending += 1
+	# 可能在物理回调中归还，移出场景树放到帧末
+	_detach.call_deferred(node)
+
+func free_count() -> int:
+	return _free.size()
+
+func get_stats() -> Dictionary:
+	var result = stats.duplicate()
+	result["free"] = _free.size()
+	return result
+
+func clear():
+	"""释放所有空闲节点（池的拥有者退出场景树时调用，避免孤儿节点泄漏）"""
+	for node in _free:
+		if is_instance_valid(node):
+			node.free()
+	_free.clear()
+
+func _create() -> Node:
+	var node = scene.instantiate()
+	node.set_meta(POOL_META, self)
+	node.set_meta(RELEASED_META, false)
+	stats.created += 1
+	return node
+
+func _detach(node: Node):
+	_pending -= 1
+	if not is_instance_valid(node):
+		return
+	var parent = node.get_parent()
+	if parent:
+		parent.remove_child(node)
+	if node.has_method("reset_for_pool"):
+		node.reset_for_pool()
+	_free.append(node)
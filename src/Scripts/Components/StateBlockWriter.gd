@@ -0,0 +1,190 @@
+extends RefCounted
+
+## 共享内存状态块写入器
+## 每帧把金币、法力、核心血量、波次、商店、备战席、网格占用和敌人数量按固定布局写入一个文件，
+## 网关把同一文件 mmap 成零拷贝的 NumPy 视图（ai_client/state_block.py，两边布局必须一致）。
+## GDScript 没有 mmap 接口，这里用 FileAccess 原地覆写，文件放在 tmpfs 上时经页缓存与读端共享。
+##
+## 布局（小端，共 SIZE 字节）：
+##   0  u32 magic "TAIS"    4  u32 version    8  u32 seq（顺序锁，写入中为奇数）   12 u32 frame
+##   16 i32 gold    20 i32 wave    24 i32 enemy_count    28 u32 flags
+##   32 f32 mana    36 f32 max_mana    40 f32 core_hp    44 f32 max_core_hp
+##   48 u16[4] 商店单位    56 u16[8] 备战席单位    72 u8[8] 备战席等级
+##   80 u16[81] 网格单位    242 u8[81] 网格单位等级    323 u8[81] 网格状态（GridCell）
+## 单位编号为 unit_keys（UNIT_TYPES 的键排序）中的下标 + 1，0 表示空，unit_keys 写入旁路文件 <路径>.json；
+## 网格按行存储，下标 = (y + 4) * 9 + (x + 4)，多格单位只记在左上角格。
+
+const MAGIC = 0x53494154 # "TAIS"
+const VERSION = 1
+const SIZE = 404
+
+const OFFSET_SEQ = 8
+const OFFSET_FRAME = 12
+const OFFSET_GOLD = 16
+const OFFSET_WAVE = 20
+const OFFSET_ENEMY_COUNT = 24
+const OFFSET_FLAGS = 28
+const OFFSET_MANA = 32
+const OFFSET_MAX_MANA = 36
+const OFFSET_CORE_HP = 40
+const OFFSET_MAX_CORE_HP = 44
+const OFFSET_SHOP = 48
+const OFFSET_BENCH_UNIT = 56
+const OFFSET_BENCH_LEVEL = 72
+const OFFSET_GRID_UNIT = 80
+const OFFSET_GRID_LEVEL = 242
+const OFFSET_GRID_STATE = 323
+
+const SHOP_SLOTS = 4
+const BENCH_SLOTS = 8
+const GRID_SIZE = 9 # 与 Constants.MAP_WIDTH / MAP_HEIGHT 一致
+
+const FLAG_WAVE_ACTIVE = 1
+const FLAG_GAME_OVER = 2
+const FLAG_SHOP_LOCKED_SHIFT = 2
+
+enum GridCell {LOCKED, EMPTY, UNIT, COVERED, SPAWN, CORE}
+
+var path: String = ""
+var unit_keys: Array = []
+
+var _file: FileAccess = null
+var _buffer: PackedByteArray = PackedByteArray()
+var _seq: int = 0
+var _unit_ids: Dictionary = {}
+var _tile_keys: PackedStringArray = PackedStringArray()
+
+func open(file_path: String) -> bool:
+	"""打开状态文件并写出单位编号表；网关预先创建的定长文件以 READ_WRITE 打开，不截断"""
+	close()
+	path = file_path
+
+	_buffer.resize(SIZE)
+	_buffer.fill(0)
+	_buffer.encode_u32(0, MAGIC)
+	_buffer.encode_u32(4, VERSION)
+
+	unit_keys = Constants.UNIT_TYPES.keys()
+	unit_keys.sort()
+	_unit_ids.clear()
+	for i in range(unit_keys.size()):
+		_unit_ids[unit_keys[i]] = i + 1
+
+	var half = GRID_SIZE / 2
+	_tile_keys.clear()
+	for gy in range(GRID_SIZE):
+		for gx in range(GRID_SIZE):
+			_tile_keys.append("%d,%d" % [gx - half, gy - half])
+
+	if not _write_sidecar():
+		return false
+
+	var mode = FileAccess.READ_WRITE if FileAccess.file_exists(path) else FileAccess.WRITE_READ
+	_file = FileAccess.open(path, mode)
+	if _file == null:
+		AILogger.error("无法打开状态文件 %s，错误码: %d" % [path, FileAccess.get_open_error()])
+		return false
+	return true
+
+func is_open() -> bool:
+	return _file != null
+
+func close():
+	if _file:
+		_file.close()
+		_file = null
+
+func write_frame():
+	"""按顺序锁写入一帧：seq 置奇数 -> 写正文 -> seq 置偶数"""
+	if _file == null:
+		return
+	build()
+	var writing = (_seq + 1) & 0xFFFFFFFF
+	_seq = (_seq + 2) & 0xFFFFFFFF
+	_buffer.encode_u32(OFFSET_SEQ, writing)
+
+	_file.seek(OFFSET_SEQ)
+	_file.store_32(writing)
+	_file.flush()
+	_file.seek(0)
+	_file.store_buffer(_buffer)
+	_file.flush()
+	_file.seek(OFFSET_SEQ)
+	_file.store_32(_seq)
+	_file.flush()
+
+func build() -> PackedByteArray:
+	"""把当前游戏状态编码进内部缓冲区（seq 字段由 write_frame 维护）"""
+	var session = GameManager.session_data
+	var flags = 0
+	if session and session.is_wave_active:
+		flags |= FLAG_WAVE_ACTIVE
+	if AIManager.is_game_over:
+		flags |= FLAG_GAME_OVER
+
+	_buffer.encode_u32(OFFSET_FRAME, Engine.get_process_frames() & 0xFFFFFFFF)
+	_buffer.encode_s32(OFFSET_GOLD, GameManager.gold)
+	_buffer.encode_s32(OFFSET_WAVE, session.wave if session else 1)
+	_buffer.encode_s32(OFFSET_ENEMY_COUNT, GameManager.get_enemy_count())
+	_buffer.encode_float(OFFSET_MANA, GameManager.mana)
+	_buffer.encode_float(OFFSET_MAX_MANA, GameManager.max_mana)
+	_buffer.encode_float(OFFSET_CORE_HP, GameManager.core_health)
+	_buffer.encode_float(OFFSET_MAX_CORE_HP, GameManager.max_core_health)
+
+	for i in range(SHOP_SLOTS):
+		var unit_key = session.get_shop_unit(i) if session else null
+		_buffer.encode_u16(OFFSET_SHOP + i * 2, _unit_ids.get(unit_key, 0))
+		if session and session.is_shop_slot_locked(i):
+			flags |= 1 << (FLAG_SHOP_LOCKED_SHIFT + i)
+	_buffer.encode_u32(OFFSET_FLAGS, flags)
+
+	for i in range(BENCH_SLOTS):
+		var unit_data = session.get_bench_unit(i) if session else null
+		var unit_id = 0
+		var level = 0
+		if unit_data is Dictionary:
+			unit_id = _unit_ids.get(unit_data.get("key", ""), 0)
+			level = int(unit_data.get("level", 1))
+		_buffer.encode_u16(OFFSET_BENCH_UNIT + i * 2, unit_id)
+		_buffer.encode_u8(OFFSET_BENCH_LEVEL + i, level)
+
+	_encode_grid()
+	return _buffer
+
+func _encode_grid():
+	var tiles = GameManager.grid_manager.tiles if GameManager.grid_manager else {}
+	for i in range(_tile_keys.size()):
+		var cell = GridCell.LOCKED
+		var unit_id = 0
+		var level = 0
+		var tile = tiles.get(_tile_keys[i])
+		if is_instance_valid(tile):
+			if is_instance_valid(tile.unit):
+				cell = GridCell.UNIT
+				unit_id = _unit_ids.get(tile.unit.type_key, 0)
+				level = tile.unit.level
+			elif tile.type == "core":
+				cell = GridCell.CORE
+			elif tile.occupied_by != Vector2i.ZERO:
+				cell = GridCell.COVERED
+			elif tile.state == "spawn":
+				cell = GridCell.SPAWN
+			elif tile.state == "unlocked":
+				cell = GridCell.EMPTY
+		_buffer.encode_u16(OFFSET_GRID_UNIT + i * 2, unit_id)
+		_buffer.encode_u8(OFFSET_GRID_LEVEL + i, level)
+		_buffer.encode_u8(OFFSET_GRID_STATE + i, cell)
+
+func _write_sidecar() -> bool:
+	var file = FileAccess.open(path + ".json", FileAccess.WRITE)
+	if file == null:
+		AILogger.error("无法写入状态块单位表 %s.json" % path)
+		return false
+	file.store_string(JSON.stringify({
+		"version": VERSION,
+		"size": SIZE,
+		"grid_size": GRID_SIZE,
+		"unit_keys": unit_keys
+	}))
+	file.close()
+	return true
@@ -6,11 +6,15 @@ signal on_death
 var base_stats: Dictionary = {}
 var modifiers: Dictionary = {}
 
+# 最终属性缓存：stat_name -> float；基础值或修正器变化（含到期）时按属性失效
+var _cache: Dictionary = {}
+
 func _ready() -> void:
 	pass
 
 func set_base_stat(stat_name: String, value: float) -> void:
 	base_stats[stat_name] = value
+	_cache.erase(stat_name)
 
 func get_base_stat(stat_name: String) -> float:
 	return base_stats.get(stat_name, 0.0)
@@ -20,6 +24,7 @@ func add_modifier(stat_name: String, modifier) -> void:
 		modifiers[stat_name] = []
 
 	var stat_modifiers: Array = modifiers[stat_name]
+	_cache.erase(stat_name)
 
 	if not modifier.source_id.is_empty():
 		for i in range(stat_modifiers.size()):
@@ -38,8 +43,24 @@ func remove_modifier(stat_name: String, source_id: String) -> void:
 	for i in range(stat_modifiers.size() - 1, -1, -1):
 		if stat_modifiers[i].source_id == source_id:
 			stat_modifiers.remove_at(i)
+			_cache.erase(stat_name)
 
 func get_stat(stat_name: String) -> float:
+	var cached = _cache.get(stat_name)
+	if cached != null:
+		return cached
+	var value: float = _resolve_stat(stat_name)
+	_cache[stat_name] = value
+	return value
+
+func invalidate(stat_name: String = "") -> void:
+	"""直接改写 base_stats / modifiers 后调用；不传参数时清空全部缓存"""
+	if stat_name.is_empty():
+		_cache.clear()
+	else:
+		_cache.erase(stat_name)
+
+func _resolve_stat(stat_name: String) -> float:
 	var value: float = get_base_stat(stat_name)
 
 	if not modifiers.has(stat_name):
@@ -70,11 +91,13 @@ func _process(delta: float) -> void:
 			mod.tick(delta)
 			if mod.is_expired():
 				stat_modifiers.remove_at(i)
+				_cache.erase(stat_name)
 			i -= 1
 
 func take_damage(amount: float) -> void:
 	var hp: float = get_stat("hp")
 	var new_hp: float = hp - amount
+	_cache.erase("hp")
 
 	if new_hp <= 0.0:
 		new_hp = 0.0
@@ -85,6 +108,7 @@ func take_damage(amount: float) -> void:
 		base_stats["hp"] -= amount
 
 func heal(amount: float) -> void:
+	_cache.erase("hp")
 	if base_stats.has("hp"):
 		base_stats["hp"] += amount
 	else:
@@ -13,6 +13,11 @@ var is_idle_enabled: bool = true
 
 var tween: Tween
 
+func _ready():
+	# 快进模式下不做待机动画，AIManager 切换时通过该分组统一开关
+	add_to_group("visual_controllers")
+	set_process(not GameManager.skip_visuals)
+
 func setup(config: Dictionary, b_speed: float, c_speed: float):
 	anim_config = config
 	base_speed = b_speed
@@ -55,6 +55,13 @@ func _on_totem_attack():
 				AILogger.bleed_effect(enemy_id, 0, bleed_stacks_per_hit, "蝙蝠图腾")
 			_play_bat_attack_effect(enemy)
 
+	# 节点敌人不足时，剩余次数落到离核心最近的群体敌人上
+	var swarm = GameManager.swarm_manager
+	if swarm and targets.size() < target_count and swarm.size() > 0:
+		var core_pos = GameManager.grid_manager.global_position if GameManager.grid_manager else Vector2.ZERO
+		for index in swarm.find_nearest_many(core_pos, target_count - targets.size()):
+			swarm.apply_debuff(index, "bleed", bleed_stacks_per_hit)
+
 func _play_bat_attack_effect(enemy):
 	# Visual effect for bleed application
 	GameManager.spawn_floating_text(enemy.global_position, "Bleed!", Color.RED, Vector2.UP)
@@ -65,7 +65,7 @@ func _on_timer_timeout():
 
 	if damage > 0:
 		if GameManager.combat_manager:
-			var enemies = GameManager.combat_manager.get_tree().get_nodes_in_group("enemies")
+			var enemies = GameManager.get_enemies()
 			var hit_count_actual = 0
 			var kill_count = 0
 			for enemy in enemies:
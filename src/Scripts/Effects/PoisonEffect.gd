@@ -32,6 +32,10 @@ func setup(target: Node, source: Object, params: Dictionary):
 		if AIManager:
 			AIManager.broadcast_text(debuff_msg)
 
+	# 跳伤由 DotScheduler 按批次推进
+	if GameManager.dot_scheduler:
+		GameManager.dot_scheduler.track_poison(self)
+
 	_call_deferred_setup_visuals()
 
 func _call_deferred_setup_visuals():
@@ -125,14 +129,16 @@ func _hide_max_stack_glow():
 
 func apply(delta: float):
 	super.apply(delta)
-
-	tick_timer += delta
-	if tick_timer >= 1.0: # Tick interval
-		tick_timer -= 1.0
-		_deal_damage()
-
 	_update_visuals()
 
+func process_tick(dt: float) -> float:
+	"""由 DotScheduler 调用：推进跳伤计时，返回本批应造成的中毒伤害（由调度器汇总后统一结算）"""
+	tick_timer += dt
+	if tick_timer < 1.0: # Tick interval
+		return 0.0
+	tick_timer -= 1.0
+	return base_damage * stacks
+
 func stack(params: Dictionary):
 	super.stack(params)
 	if stacks > MAX_STACKS:
@@ -151,27 +157,6 @@ func stack(params: Dictionary):
 			if AIManager:
 				AIManager.broadcast_text(stack_msg)
 
-func _deal_damage():
-	var host = get_parent()
-	if host and host.has_method("take_damage"):
-		var dmg = base_damage * stacks
-		host.take_damage(dmg, source_unit, "poison")
-
-		# 记录状态伤害日志
-		if AILogger:
-			var target_name = host.type_key if "type_key" in host else "目标"
-			AILogger.status_damage("中毒", target_name, dmg)
-			AILogger.mechanic_poison_damage(str(host.get_instance_id()), dmg, stacks)
-			# 同时输出[DEBUFF]伤害日志
-			var damage_msg = "[DEBUFF] Poison伤害 | 目标: %s | 层数: %d | 伤害: %.0f" % [target_name, stacks, dmg]
-			AILogger.event(damage_msg)
-			if AIManager:
-				AIManager.broadcast_text(damage_msg)
-
-		# Emit signal for test logging
-		if GameManager.has_signal("poison_damage"):
-			GameManager.poison_damage.emit(host, dmg, stacks, source_unit)
-
 func _update_visuals():
 	var host = get_parent()
 	if not host: return
@@ -64,9 +64,6 @@ var bleed_stacks: int = 0
 var max_bleed_stacks: int = 30
 var bleed_damage_per_stack: float = 3.0
 var _bleed_source_unit: Object = null
-var _bleed_display_timer: float = 0.0
-const BLEED_DISPLAY_INTERVAL: float = 0.3
-var _bleed_accumulated_damage: float = 0.0  # 累积伤害用于日志输出
 
 signal bleed_stack_changed(new_stacks: int)
 
@@ -303,7 +300,6 @@ func _physics_process(delta):
 		blind_timer -= delta
 
 	_process_effects(delta)
-	_process_bleed_damage(delta)
 
 	if visual_controller:
 		visual_controller.update_speed(speed, temp_speed_mod)
@@ -616,31 +612,13 @@ func add_bleed_stacks(stacks: int, source_unit = null):
 	if source_unit and _bleed_source_unit == null:
 		_bleed_source_unit = source_unit
 
-func _process_bleed_damage(delta: float):
-	if bleed_stacks > 0:
-		var damage = bleed_stacks * bleed_damage_per_stack * delta
-
-		# Throttle floating text display
-		_bleed_display_timer -= delta
-		var should_show_text = _bleed_display_timer <= 0
-		if should_show_text:
-			_bleed_display_timer = BLEED_DISPLAY_INTERVAL
-
-		# Accumulate damage for logging (to show meaningful numbers)
-		_bleed_accumulated_damage += damage
-
-		# Apply damage without floating text for small ticks, show text periodically
-		_take_bleed_damage(damage, _bleed_source_unit, should_show_text)
-
-		# Log accumulated damage periodically (only if meaningful damage accumulated)
-		if should_show_text and _bleed_accumulated_damage >= 0.1:
-			var enemy_name = type_key if type_key else str(get_instance_id())
-			if AILogger:
-				# 使用测试脚本可检测的格式: "流血伤害: X"
-				AILogger.event("[DAMAGE] 流血伤害: %.1f | 目标: %s | 层数: %d" % [_bleed_accumulated_damage, enemy_name, bleed_stacks])
-			if AIManager:
-				AIManager.broadcast_text("[DAMAGE] 流血伤害: %.1f | 目标: %s | 层数: %d" % [_bleed_accumulated_damage, enemy_name, bleed_stacks])
-			_bleed_accumulated_damage = 0.0
+	# 流血伤害由 DotScheduler 按批次结算
+	if bleed_stacks > 0 and GameManager.dot_scheduler:
+		GameManager.dot_scheduler.track_bleed(self)
+
+func take_bleed_damage(amount: float):
+	"""流血伤害，由 DotScheduler 按批次调用"""
+	_take_bleed_damage(amount, _bleed_source_unit)
 
 func _take_bleed_damage(amount: float, source_unit = null, show_text: bool = true):
 	if invincible_timer > 0:
@@ -661,8 +639,7 @@ func _take_bleed_damage(amount: float, source_unit = null, show_text: bool = tru
 
 	hp -= amount
 
-	# Note: Bleed damage logging is now handled in _process_bleed_damage with accumulated damage
-	# to show meaningful numbers instead of per-frame tiny amounts
+	# Note: Bleed damage logging is summarized per batch by DotScheduler
 
 	# Only show floating text periodically
 	if show_text:
@@ -739,8 +716,8 @@ func take_damage(amount: float, source_unit = null, damage_type: String = "physi
 
 	GameManager.enemy_hit.emit(self, source_unit, amount)
 
-	# 记录敌人受击日志
-	if AILogger:
+	# 记录敌人受击日志（逐次受击为 combat:debug，关闭时不拼接参数）
+	if AILogger and AILogger.is_enabled(AILogger.Category.COMBAT, AILogger.Level.DEBUG):
 		var source_name = "未知"
 		if source_unit:
 			if source_unit.has_method("get_unit_name"):
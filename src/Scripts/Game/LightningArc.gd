@@ -1,5 +1,9 @@
 extends Line2D
 
+const NodePool = preload("res://src/Scripts/Components/NodePool.gd")
+
+var _tween: Tween = null
+
 func setup(start_pos: Vector2, end_pos: Vector2):
 	points = [start_pos, end_pos]
 	width = 5.0
@@ -7,8 +11,14 @@ func setup(start_pos: Vector2, end_pos: Vector2):
 
 	modulate.a = 0.0
 
-	var tween = create_tween()
-	tween.tween_property(self, "modulate:a", 1.0, 0.05)
-	tween.tween_interval(0.1)
-	tween.tween_property(self, "modulate:a", 0.0, 0.1)
-	tween.tween_callback(queue_free)
+	_tween = create_tween()
+	_tween.tween_property(self, "modulate:a", 1.0, 0.05)
+	_tween.tween_interval(0.1)
+	_tween.tween_property(self, "modulate:a", 0.0, 0.1)
+	_tween.tween_callback(NodePool.release_node.bind(self))
+
+func reset_for_pool():
+	if _tween and _tween.is_valid():
+		_tween.kill()
+	_tween = null
+	modulate = Color.WHITE
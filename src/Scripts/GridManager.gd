@@ -6,6 +6,7 @@ const TREE_SCENE = preload("res://src/Scenes/Game/Tree.tscn")
 const ENVIRONMENT_DECORATION_SCENE = preload("res://src/Scenes/Game/EnvironmentDecoration.tscn")
 var BARRICADE_SCENE = null
 const GHOST_TILE_SCRIPT = preload("res://src/Scripts/UI/GhostTile.gd")
+const FlowField = preload("res://src/Scripts/Components/FlowField.gd")
 const TILE_SIZE = 60
 
 var tiles: Dictionary = {} # Key: "x,y", Value: Tile Instance
@@ -41,6 +42,7 @@ var interaction_highlights: Array = [] # Array[Node2D] (Visuals)
 var provider_icon_overlay: Node2D = null
 var selection_overlay: Node2D = null
 var astar_grid: AStarGrid2D
+var flow_fields: Dictionary = {} # Key: Vector2i (目标格), Value: FlowField，导航格变化时清空
 
 signal grid_updated
 
@@ -596,6 +598,7 @@ func _init_astar():
 	astar_grid.default_compute_heuristic = AStarGrid2D.HEURISTIC_MANHATTAN
 	astar_grid.default_estimate_heuristic = AStarGrid2D.HEURISTIC_MANHATTAN
 	astar_grid.update()
+	invalidate_flow_fields()
 
 	# 连接 WaveSystemManager 的波次信号
 	if GameManager.wave_system_manager:
@@ -683,9 +686,7 @@ func create_tile(x: int, y: int, type: String = "normal", state: String = "locke
 
 	tile.tile_clicked.connect(_on_tile_clicked)
 
-	var grid_pos = Vector2i(x, y)
-	if astar_grid.is_in_boundsv(grid_pos):
-		astar_grid.set_point_weight_scale(grid_pos, 1.0)
+	_set_nav_point(Vector2i(x, y), false, 1.0)
 
 func _generate_random_obstacles():
 	var candidate_tiles = []
@@ -713,9 +714,9 @@ func is_path_clear_from_spawns_to_core() -> bool:
 	var core_pos = Vector2i(0, 0)
 	if obstacles.has(core_pos): return false
 
+	var field = get_flow_field(core_pos)
 	for spawn_pos in spawn_tiles:
-		var path = astar_grid.get_id_path(spawn_pos, core_pos)
-		if path.size() == 0:
+		if not field or not field.is_reachable(spawn_pos):
 			return false
 	return true
 
@@ -746,9 +747,7 @@ func _spawn_barricade(tile, type_key):
 	register_obstacle(Vector2i(tile.x, tile.y), obstacle)
 
 func register_obstacle(grid_pos: Vector2i, node: Node):
-	if astar_grid.is_in_boundsv(grid_pos):
-		astar_grid.set_point_solid(grid_pos, false)
-		astar_grid.set_point_weight_scale(grid_pos, 1.0)
+	_set_nav_point(grid_pos, false, 1.0)
 
 	obstacle_map[node] = grid_pos
 	obstacles[grid_pos] = node
@@ -759,6 +758,30 @@ func remove_obstacle(node: Node):
 	var grid_pos = obstacle_map[node]
 	obstacles.erase(grid_pos)
 	obstacle_map.erase(node)
+	_set_nav_point(grid_pos, false, 1.0)
+
+func _set_nav_point(grid_pos: Vector2i, solid: bool, weight: float):
+	"""修改导航格；只有通行性或权重真的变化时才让流场失效"""
+	if not astar_grid.is_in_boundsv(grid_pos):
+		return
+	if astar_grid.is_point_solid(grid_pos) == solid and is_equal_approx(astar_grid.get_point_weight_scale(grid_pos), weight):
+		return
+	astar_grid.set_point_solid(grid_pos, solid)
+	astar_grid.set_point_weight_scale(grid_pos, weight)
+	invalidate_flow_fields()
+
+func invalidate_flow_fields():
+	flow_fields.clear()
+
+func get_flow_field(target_grid: Vector2i) -> FlowField:
+	"""返回前往 target_grid 的流场，首次查询或导航格变化后才重新计算"""
+	if not astar_grid.is_in_boundsv(target_grid):
+		return null
+	var field = flow_fields.get(target_grid)
+	if field == null:
+		field = FlowField.new(astar_grid, target_grid)
+		flow_fields[target_grid] = field
+	return field
 
 func get_nav_path(start_pos: Vector2, end_pos: Vector2) -> PackedVector2Array:
 	var start_grid = Vector2i(round(start_pos.x / TILE_SIZE), round(start_pos.y / TILE_SIZE))
@@ -767,7 +790,8 @@ func get_nav_path(start_pos: Vector2, end_pos: Vector2) -> PackedVector2Array:
 	if not astar_grid.is_in_boundsv(start_grid) or not astar_grid.is_in_boundsv(end_grid):
 		return PackedVector2Array()
 
-	return astar_grid.get_point_path(start_grid, end_grid)
+	# 同一目标的敌人共享一张流场，寻路开销不再随敌人数量增长
+	return get_flow_field(end_grid).get_point_path(start_grid)
 
 func get_spawn_points() -> Array[Vector2]:
 	var points: Array[Vector2] = []
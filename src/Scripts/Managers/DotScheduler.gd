@@ -0,0 +1,107 @@
+class_name DotScheduler
+extends Node
+
+## 持续伤害调度器
+## 中毒与流血不再由每个敌人、每个效果实例各自逐帧结算，而是由本节点按固定间隔批量推进：
+## 每批先按敌人汇总中毒与流血伤害，再对每个敌人各结算一次，最后只输出一条汇总日志。
+
+signal batch_processed(summary: Dictionary)
+
+# 批次间隔（秒）；中毒效果自身的 1 秒跳伤计时也以此为步长推进
+const TICK_INTERVAL = 0.5
+
+var _poison_effects: Dictionary = {}  # instance_id -> PoisonEffect
+var _bleeding: Dictionary = {}        # instance_id -> Enemy
+var _accumulator: float = 0.0
+
+func _physics_process(delta):
+	_accumulator += delta
+	while _accumulator >= TICK_INTERVAL:
+		_accumulator -= TICK_INTERVAL
+		process_batch(TICK_INTERVAL)
+
+func track_poison(effect: Node):
+	_poison_effects[effect.get_instance_id()] = effect
+
+func track_bleed(enemy: Node):
+	_bleeding[enemy.get_instance_id()] = enemy
+
+func clear():
+	_poison_effects.clear()
+	_bleeding.clear()
+	_accumulator = 0.0
+
+func process_batch(dt: float) -> Dictionary:
+	"""推进一个批次，返回本批汇总"""
+	# target_id -> {target, poison, poison_stacks, poison_source, bleed}
+	var per_target = {}
+
+	for id in _poison_effects.keys():
+		var effect = _poison_effects[id]
+		if not is_instance_valid(effect) or effect.is_queued_for_deletion():
+			_poison_effects.erase(id)
+			continue
+		var host = effect.get_parent()
+		if not host or not host.has_method("take_damage"):
+			continue
+		var dmg = effect.process_tick(dt)
+		if dmg <= 0:
+			continue
+		var entry = _entry(per_target, host)
+		entry.poison += dmg
+		entry.poison_stacks += effect.stacks
+		if entry.poison_source == null:
+			entry.poison_source = effect.source_unit
+
+	for id in _bleeding.keys():
+		var enemy = _bleeding[id]
+		if not is_instance_valid(enemy) or enemy.bleed_stacks <= 0:
+			_bleeding.erase(id)
+			continue
+		_entry(per_target, enemy).bleed += enemy.bleed_stacks * enemy.bleed_damage_per_stack * dt
+
+	var summary = {
+		"targets": per_target.size(),
+		"poison_damage": 0.0,
+		"poison_targets": 0,
+		"bleed_damage": 0.0,
+		"bleed_targets": 0,
+		"kills": 0
+	}
+
+	for id in per_target:
+		var entry = per_target[id]
+		var target = entry.target
+		if entry.poison > 0 and is_instance_valid(target):
+			target.take_damage(entry.poison, entry.poison_source, "poison")
+			summary.poison_damage += entry.poison
+			summary.poison_targets += 1
+			GameManager.poison_damage.emit(target, entry.poison, entry.poison_stacks, entry.poison_source)
+		if entry.bleed > 0 and is_instance_valid(target) and not target.get("is_dying"):
+			target.take_bleed_damage(entry.bleed)
+			summary.bleed_damage += entry.bleed
+			summary.bleed_targets += 1
+		if not is_instance_valid(target) or target.get("is_dying"):
+			summary.kills += 1
+
+	if summary.targets > 0:
+		_log_summary(summary)
+		batch_processed.emit(summary)
+	return summary
+
+func _entry(per_target: Dictionary, target: Node) -> Dictionary:
+	var id = target.get_instance_id()
+	if not per_target.has(id):
+		per_target[id] = {"target": target, "poison": 0.0, "poison_stacks": 0, "poison_source": null, "bleed": 0.0}
+	return per_target[id]
+
+func _log_summary(summary: Dictionary):
+	# 保留 "流血伤害: X" 格式，测试脚本据此检测
+	var msg = "[DOT] 持续伤害结算 | 目标: %d | 中毒伤害: %.0f (%d) | 流血伤害: %.1f (%d) | 击杀: %d" % [
+		summary.targets, summary.poison_damage, summary.poison_targets,
+		summary.bleed_damage, summary.bleed_targets, summary.kills
+	]
+	if AILogger:
+		AILogger.event(msg)
+	if AIManager:
+		AIManager.broadcast_text(msg)
@@ -3,7 +3,13 @@ extends Node
 
 signal lifesteal_occurred(source, amount)
 
-@export var lifesteal_ratio: float = 0.8
+const DEFAULT_LIFESTEAL_RATIO = 0.8
+
+@export var lifesteal_ratio: float = DEFAULT_LIFESTEAL_RATIO
+
+# 流血伤害原先逐帧触发吸血（按 60 帧/秒调校），现由 DotScheduler 每批触发一次；
+# 按批次时长折算，保持每秒吸血量不变
+const BLEED_LIFESTEAL_REFERENCE_FPS = 60.0
 
 func _ready():
 	# Connect to GameManager signals for lifesteal
@@ -21,7 +27,21 @@ func _on_damage_dealt(target, source, damage: float):
 	if not "bleed_stacks" in target:
 		return
 
-	if target.bleed_stacks <= 0:
+	var target_name = target.type_key if target.get("type_key") else "敌人"
+	_apply_lifesteal(source, target.bleed_stacks, target.global_position, target_name)
+
+func reset():
+	"""撤销吸血獠牙等遗物对吸血比例的加成"""
+	lifesteal_ratio = DEFAULT_LIFESTEAL_RATIO
+
+func on_swarm_hit(source, bleed_stacks: float, pos: Vector2):
+	"""群体敌人没有节点，不经过 enemy_hit，由 SwarmManager.hit 直接传入流血层数"""
+	if !is_instance_valid(source):
+		return
+	_apply_lifesteal(source, bleed_stacks, pos, "群体敌人")
+
+func _apply_lifesteal(source, bleed_stacks: float, pos: Vector2, target_name: String):
+	if bleed_stacks <= 0:
 		return
 
 	# Check if source is a Bat Totem unit
@@ -34,7 +54,7 @@ func _on_damage_dealt(target, source, damage: float):
 	# Risk-reward mechanism: lower core HP = stronger lifesteal
 	var risk_reward_multiplier = _calculate_risk_reward_multiplier()
 
-	var lifesteal_amount = target.bleed_stacks * 1.5 * lifesteal_ratio * multiplier * risk_reward_multiplier
+	var lifesteal_amount = bleed_stacks * 1.5 * lifesteal_ratio * multiplier * risk_reward_multiplier
 
 	# Cap lifesteal amount to 5% of max core health per hit
 	var max_heal = GameManager.max_core_health * 0.05
@@ -48,14 +68,13 @@ func _on_damage_dealt(target, source, damage: float):
 			GameManager.damage_core(-lifesteal_amount)
 
 		lifesteal_occurred.emit(source, lifesteal_amount)
-		_show_lifesteal_effect(target.global_position, lifesteal_amount)
-		print("[LifestealManager] Bleed stacks: ", target.bleed_stacks, ", Lifesteal: ", lifesteal_amount)
+		_show_lifesteal_effect(pos, lifesteal_amount)
+		print("[LifestealManager] Bleed stacks: ", bleed_stacks, ", Lifesteal: ", lifesteal_amount)
 
 		# 记录[TOTEM_HEAL]蝙蝠图腾吸血治疗日志
 		if AILogger:
 			var source_name = source.type_key if source and source.get("type_key") else "蝙蝠单位"
-			var target_name = target.type_key if target and target.get("type_key") else "敌人"
-			AILogger.event("[TOTEM_HEAL] 蝙蝠图腾吸血治疗 | 来源: %s | 目标: %s | 流血层数: %d | 治疗量: %.0f | 核心HP: %.0f/%.0f" % [source_name, target_name, target.bleed_stacks, lifesteal_amount, GameManager.core_health, GameManager.max_core_health])
+			AILogger.event("[TOTEM_HEAL] 蝙蝠图腾吸血治疗 | 来源: %s | 目标: %s | 流血层数: %d | 治疗量: %.0f | 核心HP: %.0f/%.0f" % [source_name, target_name, bleed_stacks, lifesteal_amount, GameManager.core_health, GameManager.max_core_health])
 			if AIManager:
 				AIManager.broadcast_text("[TOTEM_HEAL] 蝙蝠图腾吸血治疗 %.0f HP，来源: %s攻击%s" % [lifesteal_amount, source_name, target_name])
 
@@ -202,11 +221,12 @@ func _on_bleed_damage(target, damage, stacks, source):
 	# Calculate lifesteal amount based on bleed stacks
 	var multiplier = GameManager.get_global_buff("lifesteal_multiplier", 1.0)
 	var risk_reward_multiplier = _calculate_risk_reward_multiplier()
+	var frames_per_batch = DotScheduler.TICK_INTERVAL * BLEED_LIFESTEAL_REFERENCE_FPS
 	var lifesteal_amount = stacks * 1.5 * lifesteal_ratio * multiplier * risk_reward_multiplier
 
 	# Cap lifesteal amount to 5% of max core health per hit
 	var max_heal = GameManager.max_core_health * 0.05
-	lifesteal_amount = min(lifesteal_amount, max_heal)
+	lifesteal_amount = min(lifesteal_amount, max_heal) * frames_per_batch
 
 	if lifesteal_amount > 0:
 		var old_hp = GameManager.core_health
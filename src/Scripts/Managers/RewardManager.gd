@@ -310,6 +310,15 @@ func _apply_immediate_effects(id: String):
 				gm.apply_global_buff("core_damage_reduction", 0.1)
 				print("[RewardManager] 要塞化生效: 核心受到伤害 -10%")
 
+func reset():
+	"""清空已获得的遗物与属性奖励（原地重置游戏时调用）"""
+	acquired_artifacts.clear()
+	active_buffs.clear()
+	if is_sacrifice_active:
+		is_sacrifice_active = false
+		sacrifice_state_changed.emit(false)
+	sacrifice_cooldown = 0.0
+
 func activate_sacrifice():
 	if not "sacrifice_protocol" in acquired_artifacts:
 		return
@@ -0,0 +1,407 @@
+class_name SwarmManager
+extends Node2D
+
+## 群体敌人管理器
+## 史莱姆这类简单、低血量的群体敌人不再各自实例化 Enemy 节点，而是以结构数组（Packed*Array）保存，
+## 每个物理帧在一个循环里统一完成移动、持续伤害、攻击核心与死亡处理，并通过一个 MultiMesh 一次性绘制。
+## 移动沿 GridManager 指向核心的流场走，单位与范围伤害通过按格分桶的索引查询。
+
+signal swarm_enemy_died(type_key: String, pos: Vector2)
+
+# 可以用群体形式生成的敌人类型
+const SWARM_TYPES = ["slime", "mutant_slime"]
+const MAX_SWARM_SIZE = 8192
+
+# 与 Enemy.gd / PoisonEffect.gd 中的数值保持一致
+const BLEED_DAMAGE_PER_STACK = 3.0
+const MAX_BLEED_STACKS = 30.0
+const POISON_DAMAGE_PER_STACK = 20.0
+const POISON_DURATION = 5.0
+const MAX_POISON_STACKS = 25.0
+
+# 无 GridManager 时，进入核心该距离内即开始攻击
+const CORE_REACH = 60.0
+# MultiMesh 2D 每个实例：Transform2D 8 个 float + Color 4 个 float
+const INSTANCE_STRIDE = 12
+
+# ===== 结构数组（下标 i 为同一个敌人） =====
+var positions: PackedVector2Array = PackedVector2Array()
+var hp: PackedFloat32Array = PackedFloat32Array()
+var max_hp: PackedFloat32Array = PackedFloat32Array()
+var speed: PackedFloat32Array = PackedFloat32Array()
+var dmg: PackedFloat32Array = PackedFloat32Array()
+var atk_speed: PackedFloat32Array = PackedFloat32Array()
+var radius: PackedFloat32Array = PackedFloat32Array()
+var attack_timer: PackedFloat32Array = PackedFloat32Array()
+var bleed_stacks: PackedFloat32Array = PackedFloat32Array()
+var poison_stacks: PackedFloat32Array = PackedFloat32Array()
+var poison_time: PackedFloat32Array = PackedFloat32Array()
+var poison_tick: PackedFloat32Array = PackedFloat32Array()
+var type_ids: PackedInt32Array = PackedInt32Array()
+var generations: PackedInt32Array = PackedInt32Array()
+
+# 类型表：type_id -> 配置
+var _type_keys: Array[String] = []
+var _type_ids: Dictionary = {}  # type_key -> type_id
+var _type_data: Array[Dictionary] = []
+var _type_colors: Array[Color] = []
+
+# 按格分桶：每个物理帧重建一次，Vector2i -> Array[int]
+var _cells: Dictionary = {}
+var _cell_size: float = Constants.TILE_SIZE
+
+var _multimesh_instance: MultiMeshInstance2D
+var _draw_buffer: PackedFloat32Array = PackedFloat32Array()
+
+func _ready():
+	_multimesh_instance = MultiMeshInstance2D.new()
+	_multimesh_instance.name = "SwarmMultiMesh"
+	var multimesh = MultiMesh.new()
+	multimesh.transform_format = MultiMesh.TRANSFORM_2D
+	multimesh.use_colors = true
+	var quad = QuadMesh.new()
+	quad.size = Vector2.ONE
+	multimesh.mesh = quad
+	_multimesh_instance.multimesh = multimesh
+	add_child(_multimesh_instance)
+
+func _physics_process(delta):
+	if positions.is_empty():
+		return
+	step(delta)
+
+func _process(_delta):
+	_update_multimesh()
+
+# ===== 生成 =====
+static func is_swarm_type(type_key: String) -> bool:
+	return type_key in SWARM_TYPES
+
+func size() -> int:
+	return positions.size()
+
+func spawn(type_key: String, pos: Vector2, wave: int, generation: int = 0, hp_override: float = -1.0) -> int:
+	"""生成一个群体敌人，返回其下标；超出上限或类型未知时返回 -1
+
+	属性公式与 Enemy.setup 相同
+	"""
+	if positions.size() >= MAX_SWARM_SIZE:
+		return -1
+	var type_id = _get_type_id(type_key)
+	if type_id < 0:
+		return -1
+	var data = _type_data[type_id]
+
+	var health = (100 + wave * 80) * data.hpMod if hp_override < 0 else hp_override
+	positions.append(pos)
+	hp.append(health)
+	max_hp.append(health)
+	speed.append((40 + wave * 2) * data.spdMod)
+	dmg.append(data.get("dmg", 10))
+	atk_speed.append(data.get("atkSpeed", 1.0))
+	radius.append(data.get("radius", 10))
+	attack_timer.append(0.0)
+	bleed_stacks.append(0.0)
+	poison_stacks.append(0.0)
+	poison_time.append(0.0)
+	poison_tick.append(0.0)
+	type_ids.append(type_id)
+	generations.append(generation)
+	return positions.size() - 1
+
+func clear():
+	positions.clear()
+	hp.clear()
+	max_hp.clear()
+	speed.clear()
+	dmg.clear()
+	atk_speed.clear()
+	radius.clear()
+	attack_timer.clear()
+	bleed_stacks.clear()
+	poison_stacks.clear()
+	poison_time.clear()
+	poison_tick.clear()
+	type_ids.clear()
+	generations.clear()
+	_cells.clear()
+	_update_multimesh()
+
+func _get_type_id(type_key: String) -> int:
+	if _type_ids.has(type_key):
+		return _type_ids[type_key]
+	if not Constants.ENEMY_VARIANTS.has(type_key):
+		push_warning("[SwarmManager] Unknown enemy type: %s" % type_key)
+		return -1
+	var data = Constants.ENEMY_VARIANTS[type_key]
+	var type_id = _type_keys.size()
+	_type_keys.append(type_key)
+	_type_data.append(data)
+	_type_colors.append(Color(data.get("color", "#ffffff")))
+	_type_ids[type_key] = type_id
+	return type_id
+
+# ===== 伤害与状态 =====
+func damage(index: int, amount: float):
+	"""扣血；死亡在下一个物理帧统一结算"""
+	if index >= 0 and index < hp.size():
+		hp[index] -= amount
+
+func apply_debuff(index: int, type: String, stacks: int = 1):
+	if index < 0 or index >= hp.size():
+		return
+	match type:
+		"bleed":
+			bleed_stacks[index] = min(bleed_stacks[index] + stacks, MAX_BLEED_STACKS)
+		"poison":
+			poison_stacks[index] = min(poison_stacks[index] + stacks, MAX_POISON_STACKS)
+			poison_time[index] = POISON_DURATION
+
+func find_nearest(pos: Vector2, range_val: float) -> int:
+	"""range_val 内最近的存活群体敌人下标，没有时返回 -1"""
+	var nearest = -1
+	var min_dist = range_val
+	for i in _query(pos, range_val):
+		if hp[i] <= 0:
+			continue
+		var dist = pos.distance_to(positions[i])
+		if dist <= min_dist:
+			min_dist = dist
+			nearest = i
+	return nearest
+
+func hit(index: int, amount: float, source_unit = null, effects: Dictionary = {}):
+	"""单位命中群体敌人：扣血、施加命中效果，并像 Enemy.take_damage 一样发出 enemy_hit / damage_dealt
+
+	群体敌人没有节点，enemy_hit 的 enemy 参数为 null；蝙蝠吸血按该敌人的流血层数直接结算。
+	"""
+	if index < 0 or index >= hp.size():
+		return
+	hp[index] -= amount
+	if effects.get("poison", 0.0) > 0.0:
+		apply_debuff(index, "poison", effects.get("poison_stacks", 1))
+	if effects.get("bleed", 0.0) > 0.0:
+		apply_debuff(index, "bleed")
+
+	GameManager.enemy_hit.emit(null, source_unit, amount)
+	if source_unit:
+		GameManager.damage_dealt.emit(source_unit, amount)
+		if GameManager.lifesteal_manager:
+			GameManager.lifesteal_manager.on_swarm_hit(source_unit, bleed_stacks[index], positions[index])
+
+func find_nearest_many(pos: Vector2, count: int) -> PackedInt32Array:
+	"""离 pos 最近的 count 个存活群体敌人下标（不限距离，按距离升序）"""
+	var result = PackedInt32Array()
+	var dists = PackedFloat32Array()
+	if count <= 0:
+		return result
+	for i in range(hp.size()):
+		if hp[i] <= 0:
+			continue
+		var dist = pos.distance_squared_to(positions[i])
+		if result.size() == count and dist >= dists[count - 1]:
+			continue
+		# count 很小，插入排序即可
+		var j = result.size()
+		while j > 0 and dists[j - 1] > dist:
+			j -= 1
+		result.insert(j, i)
+		dists.insert(j, dist)
+		if result.size() > count:
+			result.resize(count)
+			dists.resize(count)
+	return result
+
+func damage_in_radius(pos: Vector2, radius_val: float, amount: float) -> int:
+	"""范围伤害，返回命中数量"""
+	var hit = 0
+	for i in _query(pos, radius_val):
+		if hp[i] > 0 and pos.distance_to(positions[i]) <= radius_val:
+			hp[i] -= amount
+			hit += 1
+	return hit
+
+func damage_all(amount: float) -> int:
+	for i in range(hp.size()):
+		hp[i] -= amount
+	return hp.size()
+
+# ===== 每帧模拟 =====
+func step(delta: float):
+	var count = positions.size()
+	var core_pos = Vector2.ZERO
+	var grid = GameManager.grid_manager
+	var field = null
+	var territory = {}
+	if grid:
+		core_pos = grid.global_position
+		field = grid.get_flow_field(Vector2i.ZERO)
+		for tile in grid.active_territory_tiles:
+			if is_instance_valid(tile):
+				territory[Vector2i(tile.x, tile.y)] = true
+
+	var is_wave_active = GameManager.session_data.is_wave_active if GameManager.session_data else true
+	# 同一帧内同类型攻击核心的伤害合并为一次 damage_core
+	var core_damage = {}
+
+	for i in range(count):
+		# 持续伤害：流血逐帧结算，中毒每秒一跳
+		if bleed_stacks[i] > 0:
+			hp[i] -= bleed_stacks[i] * BLEED_DAMAGE_PER_STACK * delta
+		if poison_stacks[i] > 0:
+			poison_time[i] -= delta
+			poison_tick[i] += delta
+			if poison_tick[i] >= 1.0:
+				poison_tick[i] -= 1.0
+				hp[i] -= poison_stacks[i] * POISON_DAMAGE_PER_STACK
+			if poison_time[i] <= 0:
+				poison_stacks[i] = 0.0
+				poison_tick[i] = 0.0
+
+		if hp[i] <= 0 or not is_wave_active:
+			continue
+
+		var pos = positions[i]
+		var target = core_pos
+		var reached = pos.distance_to(core_pos) <= CORE_REACH + radius[i]
+		if field:
+			var cell = Vector2i(roundi(pos.x / _cell_size), roundi(pos.y / _cell_size))
+			if territory.has(cell):
+				reached = true
+			elif field.is_reachable(cell):
+				var next = field.next_step(cell)
+				target = Vector2(next) * _cell_size
+				if territory.has(next) and pos.distance_to(target) <= _cell_size * 0.5 + radius[i] + 10.0:
+					reached = true
+
+		if reached:
+			attack_timer[i] -= delta
+			if attack_timer[i] <= 0:
+				attack_timer[i] = atk_speed[i]
+				var type_id = type_ids[i]
+				core_damage[type_id] = core_damage.get(type_id, 0.0) + dmg[i]
+		else:
+			var to_target = target - pos
+			var move = speed[i] * delta
+			positions[i] = target if to_target.length() <= move else pos + to_target.normalized() * move
+
+	for type_id in core_damage:
+		var type_name = _type_data[type_id].get("name", _type_keys[type_id])
+		GameManager.damage_core(core_damage[type_id], type_name + "攻击")
+
+	_remove_dead()
+	_rebuild_cells()
+
+func _remove_dead():
+	# 从后往前扫描，用末尾元素覆盖死亡元素，下标之外的顺序不保证
+	var splits = []
+	var i = positions.size() - 1
+	while i >= 0:
+		if hp[i] <= 0:
+			var type_key = _type_keys[type_ids[i]]
+			var data = _type_data[type_ids[i]]
+			if generations[i] < data.get("split_limit", 0):
+				splits.append([type_key, positions[i], generations[i] + 1, max_hp[i] / 2.0])
+			swarm_enemy_died.emit(type_key, positions[i])
+			_swap_remove(i)
+		i -= 1
+
+	# 变异史莱姆死亡时分裂为两个半血量的子代
+	var wave = GameManager.session_data.wave if GameManager.session_data else 1
+	for split in splits:
+		for n in range(2):
+			var offset = Vector2(randf_range(-20, 20), randf_range(-20, 20))
+			spawn(split[0], split[1] + offset, wave, split[2], split[3])
+
+func _swap_remove(index: int):
+	# Packed 数组是值类型，不能放进临时 Array 里循环处理，只能逐个字段操作
+	var last = positions.size() - 1
+	if index != last:
+		positions[index] = positions[last]
+		hp[index] = hp[last]
+		max_hp[index] = max_hp[last]
+		speed[index] = speed[last]
+		dmg[index] = dmg[last]
+		atk_speed[index] = atk_speed[last]
+		radius[index] = radius[last]
+		attack_timer[index] = attack_timer[last]
+		bleed_stacks[index] = bleed_stacks[last]
+		poison_stacks[index] = poison_stacks[last]
+		poison_time[index] = poison_time[last]
+		poison_tick[index] = poison_tick[last]
+		type_ids[index] = type_ids[last]
+		generations[index] = generations[last]
+	positions.resize(last)
+	hp.resize(last)
+	max_hp.resize(last)
+	speed.resize(last)
+	dmg.resize(last)
+	atk_speed.resize(last)
+	radius.resize(last)
+	attack_timer.resize(last)
+	bleed_stacks.resize(last)
+	poison_stacks.resize(last)
+	poison_time.resize(last)
+	poison_tick.resize(last)
+	type_ids.resize(last)
+	generations.resize(last)
+
+func _rebuild_cells():
+	_cells.clear()
+	for i in range(positions.size()):
+		var cell = Vector2i(floori(positions[i].x / _cell_size), floori(positions[i].y / _cell_size))
+		var bucket = _cells.get(cell)
+		if bucket == null:
+			bucket = []
+			_cells[cell] = bucket
+		bucket.append(i)
+
+func _query(pos: Vector2, range_val: float) -> Array:
+	var lo = Vector2i(floori((pos.x - range_val) / _cell_size), floori((pos.y - range_val) / _cell_size))
+	var hi = Vector2i(floori((pos.x + range_val) / _cell_size), floori((pos.y + range_val) / _cell_size))
+	var result = []
+	for y in range(lo.y, hi.y + 1):
+		for x in range(lo.x, hi.x + 1):
+			var bucket = _cells.get(Vector2i(x, y))
+			if bucket:
+				result.append_array(bucket)
+	return result
+
+# ===== 绘制 =====
+func _update_multimesh():
+	if not _multimesh_instance:
+		return
+	var multimesh = _multimesh_instance.multimesh
+	var count = positions.size()
+	if GameManager.skip_visuals:
+		multimesh.visible_instance_count = 0
+		return
+
+	if multimesh.instance_count < count:
+		# 容量按 2 的幂增长，避免每次生成都重新分配
+		var capacity = max(64, nearest_po2(count))
+		multimesh.instance_count = capacity
+		_draw_buffer.resize(capacity * INSTANCE_STRIDE)
+
+	for i in range(count):
+		var o = i * INSTANCE_STRIDE
+		var s = radius[i] * 2.0
+		var color = _type_colors[type_ids[i]]
+		# 血量越低颜色越暗
+		var shade = 0.5 + 0.5 * clamp(hp[i] / max_hp[i], 0.0, 1.0)
+		_draw_buffer[o] = s
+		_draw_buffer[o + 1] = 0.0
+		_draw_buffer[o + 2] = 0.0
+		_draw_buffer[o + 3] = positions[i].x
+		_draw_buffer[o + 4] = 0.0
+		_draw_buffer[o + 5] = s
+		_draw_buffer[o + 6] = 0.0
+		_draw_buffer[o + 7] = positions[i].y
+		_draw_buffer[o + 8] = color.r * shade
+		_draw_buffer[o + 9] = color.g * shade
+		_draw_buffer[o + 10] = color.b * shade
+		_draw_buffer[o + 11] = 1.0 if bleed_stacks[i] <= 0 else 0.8
+
+	if count > 0:
+		multimesh.buffer = _draw_buffer
+	multimesh.visible_instance_count = count
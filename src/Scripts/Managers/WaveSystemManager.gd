@@ -60,6 +60,20 @@ const SPAWN_INTERVAL = 0.1        # 敌人生成间隔
 const MIN_BATCH_DELAY = 2.0       # 最小批次间隔
 const MAX_BATCH_DELAY = 4.0       # 最大批次间隔
 
+# ===== 预计算波次表 =====
+# 由 ai_client/wave_tables.py export 生成；源配置哈希一致时直接查表，不再逐次计算
+const WAVE_TABLES_PATH = "res://data/wave_tables.json"
+const WAVE_TABLES_VERSION = 1
+const WAVE_TYPE_BY_NAME = {
+	"normal": WaveType.NORMAL,
+	"elite": WaveType.ELITE,
+	"boss": WaveType.BOSS,
+	"event": WaveType.EVENT,
+	"healer": WaveType.HEALER,
+	"mutant": WaveType.MUTANT,
+	"season_boss": WaveType.SEASON_BOSS
+}
+
 # ===== 波次状态 =====
 var current_wave: int = 1
 var current_wave_type: WaveType = WaveType.NORMAL
@@ -78,6 +92,13 @@ var total_batches: int = 0
 # ===== 配置数据 =====
 var wave_config: Dictionary = {}
 var enemy_variants: Dictionary = {}
+var wave_tables: Dictionary = {}  # 预计算表的 waves 部分（键为波次字符串），未加载时为空
+
+# ===== 群体敌人 =====
+# swarm_mode 为 true 时，SwarmManager.SWARM_TYPES 中的类型一律以群体形式生成；
+# 也可以在单个波次配置里写 "swarm": true 只对该波生效（压力测试波次）
+var swarm_mode: bool = false
+var _swarm_wave: bool = false
 
 # ===== 运行时统计 =====
 var wave_stats: Dictionary = {
@@ -99,12 +120,18 @@ var healer_script: Script = preload("res://src/Scripts/Enemies/HealerEnemy.gd")
 var boss_selection_manager: Node = null
 var BossSelectionManagerScript: Script = preload("res://src/Scripts/Managers/BossSelectionManager.gd")
 
+# ===== 群体敌人管理器 =====
+var swarm_manager: Node = null
+var SwarmManagerScript: Script = preload("res://src/Scripts/Managers/SwarmManager.gd")
+
 # ===== 初始化 =====
 func _ready():
 	process_mode = Node.PROCESS_MODE_ALWAYS
 	_load_wave_config()
+	_load_wave_tables()
 	_load_enemy_variants()
 	_init_boss_selection_manager()
+	_init_swarm_manager()
 	_connect_signals()
 
 func _connect_signals():
@@ -131,6 +158,14 @@ func _init_boss_selection_manager():
 	# 连接信号
 	boss_selection_manager.boss_selected.connect(_on_boss_selected)
 
+func _init_swarm_manager():
+	"""初始化群体敌人管理器"""
+	swarm_manager = SwarmManagerScript.new()
+	swarm_manager.name = "SwarmManager"
+	add_child(swarm_manager)
+	GameManager.swarm_manager = swarm_manager
+	swarm_manager.swarm_enemy_died.connect(_on_swarm_enemy_died)
+
 # ===== 配置加载 =====
 func _load_wave_config():
 	"""从JSON文件加载波次配置"""
@@ -152,6 +187,31 @@ func _load_wave_config():
 		push_warning("[WaveSystemManager] Wave config file not found, using defaults")
 		_use_default_config()
 
+func _load_wave_tables():
+	"""加载预计算波次表；文件缺失或与当前配置的哈希不一致时回退到实时计算"""
+	wave_tables = {}
+	if not FileAccess.file_exists(WAVE_TABLES_PATH):
+		return
+
+	var file = FileAccess.open(WAVE_TABLES_PATH, FileAccess.READ)
+	if not file:
+		return
+	var json = JSON.new()
+	if json.parse(file.get_as_text()) != OK or not json.data is Dictionary:
+		push_warning("[WaveSystemManager] Failed to parse wave tables, computing at runtime")
+		return
+
+	var data: Dictionary = json.data
+	var hashes = data.get("source_sha256", {})
+	if int(data.get("version", 0)) != WAVE_TABLES_VERSION \
+			or hashes.get("wave_config", "") != FileAccess.get_sha256("res://data/wave_config.json") \
+			or hashes.get("enemy_variants", "") != FileAccess.get_sha256("res://data/enemy_variants.json"):
+		push_warning("[WaveSystemManager] Wave tables are stale, run: python ai_client/wave_tables.py export")
+		return
+
+	wave_tables = data.get("waves", {})
+	print("[WaveSystemManager] Wave tables loaded (%d waves)" % wave_tables.size())
+
 func _use_default_config():
 	"""使用内置默认配置"""
 	wave_config = _generate_default_wave_config()
@@ -311,10 +371,13 @@ func _check_season_change(wave: int):
 func get_wave_type(wave: int) -> WaveType:
 	"""获取波次类型
 
-	优先从wave_config.json配置中读取wave_type，如果没有配置则使用硬编码逻辑
+	优先使用预计算表，其次从wave_config.json配置中读取wave_type，如果没有配置则使用硬编码逻辑
 	"""
-	# 首先尝试从配置文件中读取wave_type
 	var key = str(wave)
+	if wave_tables.has(key):
+		return WAVE_TYPE_BY_NAME.get(wave_tables[key].get("wave_type", ""), WaveType.NORMAL)
+
+	# 其次尝试从配置文件中读取wave_type
 	if wave_config.has("waves") and wave_config.waves.has(key):
 		var wave_data = wave_config.waves[key]
 		if wave_data.has("wave_type"):
@@ -447,7 +510,12 @@ func calculate_wave_difficulty(wave: int) -> float:
 	"""
 	计算波次难度
 	公式：波次基础难度 = 波次编号 × 1.15^波次编号 × 难度系数
+	预计算表中的难度不含 difficulty_multiplier
 	"""
+	var key = str(wave)
+	if wave_tables.has(key):
+		return float(wave_tables[key].difficulty) * difficulty_multiplier
+
 	var base_difficulty = wave * pow(1.15, wave)
 	var difficulty_coefficient = _get_difficulty_coefficient(wave)
 	return base_difficulty * difficulty_coefficient * difficulty_multiplier
@@ -505,6 +573,7 @@ func start_wave(wave: int = -1) -> bool:
 	defeated_enemies_count = 0
 	current_batch = 0
 	total_batches = wave_data.batch_count
+	_swarm_wave = swarm_mode or wave_data.get("swarm", false)
 
 	# 先生成第一批敌人（无时序延迟），确保信号发射时场上已有敌人
 	# 这修复了CRASH-002：避免单位/图腾在wave_started信号后获取空敌人列表
@@ -770,6 +839,10 @@ func _spawn_batch(type_key: String, count: int):
 	if spawn_points.is_empty():
 		spawn_points = [Vector2.ZERO]
 
+	if _use_swarm(type_key):
+		_spawn_swarm_batch(type_key, count, spawn_points)
+		return
+
 	for i in range(count):
 		if !is_wave_active:
 			break
@@ -777,10 +850,9 @@ func _spawn_batch(type_key: String, count: int):
 			break
 
 		# 检查并发敌人上限
-		var current_enemies = get_tree().get_nodes_in_group("enemies").size()
-		if current_enemies >= MAX_CONCURRENT_ENEMIES:
+		if GameManager.get_enemy_count() >= MAX_CONCURRENT_ENEMIES:
 			# 等待直到敌人数量下降
-			while get_tree().get_nodes_in_group("enemies").size() >= MAX_CONCURRENT_ENEMIES:
+			while GameManager.get_enemy_count() >= MAX_CONCURRENT_ENEMIES:
 				await get_tree().create_timer(0.5).timeout
 			if !is_wave_active:
 				break
@@ -796,8 +868,33 @@ func _spawn_batch(type_key: String, count: int):
 
 		await get_tree().create_timer(SPAWN_INTERVAL).timeout
 
+func _spawn_swarm_batch(type_key: String, count: int, spawn_points: Array):
+	"""群体敌人整批在同一帧生成：不受并发上限与逐个生成间隔限制"""
+	var spawned = 0
+	for i in range(min(count, enemies_to_spawn)):
+		var pos = spawn_points.pick_random() + Vector2(randf_range(-20, 20), randf_range(-20, 20))
+		if swarm_manager.spawn(type_key, pos, current_wave) < 0:
+			break
+		spawned += 1
+
+	enemies_to_spawn -= spawned
+	spawned_enemies_count += spawned
+	wave_stats.enemies_spawned += spawned
+
+	# 群体敌人只记录一条汇总日志
+	print("[SWARM_SPAWNED] 群体敌人生成 | 类型: %s | 数量: %d | 场上群体: %d | 波次: %d" % [type_key, spawned, swarm_manager.size(), current_wave])
+	if AILogger:
+		AILogger.event("[SWARM_SPAWNED] 群体敌人生成 | 类型: %s | 数量: %d | 波次: %d" % [type_key, spawned, current_wave])
+
+func _use_swarm(type_key: String) -> bool:
+	return _swarm_wave and swarm_manager != null and SwarmManager.is_swarm_type(type_key)
+
 func _spawn_enemy_at_pos(pos: Vector2, type_key: String):
 	"""在指定位置生成单个敌人"""
+	if _use_swarm(type_key):
+		swarm_manager.spawn(type_key, pos, current_wave)
+		return
+
 	if !enemy_scene:
 		push_error("[WaveSystemManager] Enemy scene not loaded")
 		return
@@ -848,12 +945,12 @@ func _spawn_enemy_at_pos(pos: Vector2, type_key: String):
 			AILogger.enemy_spawned(current_wave, type_key, enemy.hp if "hp" in enemy else 0, pos)
 
 func _apply_difficulty_scaling(enemy: Node):
-	"""应用难度缩放到敌人"""
-	var difficulty = calculate_wave_difficulty(current_wave)
-	var wave_type = get_wave_type(current_wave)
+	"""应用难度缩放到敌人
 
+	波次类型在 start_wave 中已确定，这里直接使用 current_wave_type，避免每个敌人重复计算
+	"""
 	# 根据波次类型应用额外加成
-	match wave_type:
+	match current_wave_type:
 		WaveType.ELITE:
 			if enemy.has_method("set_elite_modifiers"):
 				enemy.set_elite_modifiers(1.3, 1.2)  # HP+30%, Speed+20%
@@ -880,7 +977,7 @@ func _get_spawn_points() -> Array:
 func _start_win_check():
 	"""开始胜利条件检测"""
 	while is_wave_active:
-		var active_enemies = get_tree().get_nodes_in_group("enemies").size()
+		var active_enemies = get_active_enemy_count()
 
 		if enemies_to_spawn <= 0 and active_enemies == 0:
 			_end_wave()
@@ -951,6 +1048,11 @@ func _on_enemy_died(enemy: Node = null, killer_unit = null):
 	wave_stats.enemies_defeated += 1
 	wave_stats.gold_earned += 1  # 基础金币奖励
 
+func _on_swarm_enemy_died(_type_key: String, _pos: Vector2):
+	"""群体敌人死亡处理：奖励与普通敌人相同"""
+	GameManager.add_gold(1)
+	_on_enemy_died()
+
 func _on_enemy_hit(enemy: Node, source_unit, amount: float):
 	"""敌人受伤处理"""
 	if !is_wave_active:
@@ -980,7 +1082,7 @@ func get_wave_progress() -> Dictionary:
 	"""获取当前波次进度"""
 	var active_enemies = 0
 	if is_inside_tree():
-		active_enemies = get_tree().get_nodes_in_group("enemies").size()
+		active_enemies = get_active_enemy_count()
 
 	return {
 		"wave": current_wave,
@@ -995,6 +1097,13 @@ func get_wave_progress() -> Dictionary:
 		"progress_percent": (float(defeated_enemies_count) / max(1, total_enemies_for_wave)) * 100.0
 	}
 
+func get_active_enemy_count() -> int:
+	"""场上敌人数量（节点敌人 + 群体敌人）"""
+	var count = GameManager.get_enemy_count()
+	if swarm_manager:
+		count += swarm_manager.size()
+	return count
+
 func force_end_wave():
 	"""强制结束当前波次"""
 	_end_wave()
@@ -1006,6 +1115,11 @@ func reset():
 	enemies_to_spawn = 0
 	spawned_enemies_count = 0
 	defeated_enemies_count = 0
+	current_batch = 0
+	total_batches = 0
+	_swarm_wave = false
+	if swarm_manager:
+		swarm_manager.clear()
 	_reset_wave_stats()
 
 	# 同步到 SessionData (Source of Truth)
@@ -1073,3 +1187,17 @@ func spawn_test_enemy(type_key: String = "slime"):
 		print("[WaveSystemManager] 波次状态已激活，以便生成测试敌人")
 
 	_spawn_enemy_at_pos(pos, type_key)
+
+func spawn_test_swarm(type_key: String = "slime", count: int = 1000):
+	"""生成一批群体敌人（压力测试用）"""
+	var spawn_points = _get_spawn_points()
+
+	if !is_wave_active:
+		is_wave_active = true
+		print("[WaveSystemManager] 波次状态已激活，以便生成测试敌人")
+
+	for i in range(count):
+		var pos = spawn_points.pick_random() + Vector2(randf_range(-20, 20), randf_range(-20, 20))
+		if swarm_manager.spawn(type_key, pos, current_wave) < 0:
+			break
+	print("[WaveSystemManager] 测试群体敌人: %s x%d" % [type_key, swarm_manager.size()])
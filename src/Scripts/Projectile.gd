@@ -36,6 +36,12 @@ var feather_stuck_pos: Vector2 = Vector2.ZERO
 var target = null # Enemy node
 
 const PROJECTILE_VISUALS_SCRIPT = preload("res://src/Scripts/Projectiles/ProjectileVisuals.gd")
+const NodePool = preload("res://src/Scripts/Components/NodePool.gd")
+
+# 这些类型的弹道会被单位/图腾长期持有引用（羽毛回收、黑洞、龙息、蝴蝶光球），不进入对象池
+const NON_POOLED_TYPES = ["feather", "black_hole_field", "dragon_breath", "orb"]
+
+var _fade_tween: Tween = null
 
 func _ready():
 	super._ready()
@@ -129,8 +135,8 @@ func setup(start_pos, target_node, dmg, proj_speed, proj_type, incoming_stats =
 	if is_critical:
 		scale *= 1.2
 
-	# Visual Setup
-	if visual_node:
+	# Visual Setup（快进模式下跳过弹道外观）
+	if visual_node and not GameManager.skip_visuals:
 		visual_node.update_visuals(type, stats)
 		if stats.get("hide_visuals", false):
 			visual_node.hide()
@@ -187,14 +193,63 @@ func fade_out():
 	set_deferred("monitoring", false)
 	set_deferred("monitorable", false)
 
-	var tween = create_tween()
-	tween.set_parallel(true)
-	tween.tween_property(self, "modulate:a", 0.0, 0.2)
+	_fade_tween = create_tween()
+	_fade_tween.set_parallel(true)
+	_fade_tween.tween_property(self, "modulate:a", 0.0, 0.2)
 
 	if type != "swarm_wave" and type != "roar":
-		tween.tween_property(self, "scale", scale * 1.5, 0.2)
+		_fade_tween.tween_property(self, "scale", scale * 1.5, 0.2)
 
-	tween.chain().tween_callback(queue_free)
+	_fade_tween.chain().tween_callback(_release)
+
+func _release():
+	"""弹道生命周期结束：可复用的类型归还对象池，其余直接释放"""
+	if type in NON_POOLED_TYPES:
+		queue_free()
+		return
+	# 归还后到帧末移出场景树前不再结算命中
+	is_fading = true
+	NodePool.release_node(self)
+
+func reset_for_pool():
+	"""由 NodePool 在节点移出场景树后调用，恢复到刚实例化时的状态"""
+	if _fade_tween and _fade_tween.is_valid():
+		_fade_tween.kill()
+	_fade_tween = null
+
+	type = "pinecone"
+	hit_list = []
+	shared_hit_list_ref = []
+	effects = {}
+	payload_effects = []
+	stats = {}
+	pierce = 0
+	bounce = 0
+	split = 0
+	chain = 0
+	damage_type = "physical"
+	is_critical = false
+	life = 2.0
+	is_fading = false
+	state = State.MOVING
+	dragon_breath_timer = 0.0
+	is_meteor_falling = false
+	meteor_target = Vector2.ZERO
+	feather_original_target_pos = Vector2.ZERO
+	feather_stuck_pos = Vector2.ZERO
+	target = null
+	source_unit = null
+	speed = 400.0
+	damage = 10.0
+
+	rotation = 0.0
+	scale = Vector2.ONE
+	modulate = Color.WHITE
+	monitoring = true
+	monitorable = true
+	if visual_node:
+		visual_node.show()
+		visual_node.rotation = 0.0
 
 func _process(delta):
 	if is_fading: return
@@ -225,7 +280,7 @@ func _process(delta):
 
 		if state == State.RETURNING and source_unit and is_instance_valid(source_unit):
 			if global_position.distance_to(source_unit.global_position) < 15.0:
-				queue_free()
+				_release()
 				return
 
 	if type == "black_hole_field":
@@ -261,7 +316,7 @@ func _process(delta):
 			var enemy_name = source_unit.type_key if source_unit.has_method("type_key") else "远程敌人"
 			GameManager.damage_core(damage, enemy_name + "远程攻击")
 			_spawn_hit_visual(global_position)
-			queue_free()
+			_release()
 			return
 
 	if visual_node:
@@ -272,7 +327,7 @@ func _process_black_hole(delta):
 	var pull_strength = stats.get("skillStrength", 3000.0)
 	var black_hole_center = global_position
 
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = GameManager.get_enemies_near(black_hole_center, pull_radius)
 	for enemy in enemies:
 		var dist = black_hole_center.distance_to(enemy.global_position)
 		if dist < pull_radius:
@@ -316,7 +371,7 @@ func _process_dragon_breath(delta):
 			return
 
 		var pull_radius = 150.0
-		var enemies = get_tree().get_nodes_in_group("enemies")
+		var enemies = GameManager.get_enemies_near(global_position, pull_radius)
 		for enemy in enemies:
 			var dist = global_position.distance_to(enemy.global_position)
 			if dist < pull_radius:
@@ -419,11 +474,11 @@ func _handle_hit(target_node):
 
 				_spawn_hit_visual(target_node.global_position)
 				if type != "feather":
-					queue_free()
+					_release()
 
 func _process_feather(delta):
 	if (state == State.STUCK or state == State.RETURNING or state == State.MOVING) and (!source_unit or !is_instance_valid(source_unit)):
-		queue_free()
+		_release()
 		return
 
 	if state == State.MOVING:
@@ -541,10 +596,8 @@ func _on_meteor_hit():
 
 func perform_split():
 	var angles = [rotation + 0.5, rotation - 0.5]
-	var proj_scene = load("res://src/Scenes/Game/Projectile.tscn")
-
 	for angle in angles:
-		var proj = proj_scene.instantiate()
+		var proj = GameManager.combat_manager.acquire_projectile(type)
 		var new_stats = {
 			"pierce": 0,
 			"bounce": 0,
@@ -562,7 +615,7 @@ func perform_bounce(current_hit_enemy):
 	var nearest = null
 	var min_dist = search_range
 
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = GameManager.get_enemies_near(global_position, search_range)
 	for enemy in enemies:
 		if enemy == current_hit_enemy or enemy in hit_list:
 			continue
@@ -624,7 +677,7 @@ func _apply_splash_damage(center_pos: Vector2, base_damage: float, source):
 	var splash_radius = 80.0
 	var splash_damage = base_damage * 0.5  # 50% splash damage
 
-	var enemies = get_tree().get_nodes_in_group("enemies")
+	var enemies = GameManager.get_enemies_near(center_pos, splash_radius)
 	var affected_targets = []
 
 	for enemy in enemies:
@@ -662,7 +715,7 @@ func trigger_eagle_echo(target_node, multiplier: float):
 
 ## 中文战斗日志 - 记录攻击命中
 func _log_combat_hit(source, target, dmg: float, dmg_type: String, is_crit: bool):
-	if not AILogger: return
+	if not AILogger or not AILogger.is_enabled(AILogger.Category.ACTION): return
 
 	var source_name = "未知"
 	var target_name = "未知"
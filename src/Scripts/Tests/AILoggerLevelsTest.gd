@@ -0,0 +1,49 @@
+extends SceneTree
+
+func _init():
+	print("=== Starting AILoggerLevelsTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 3
+
+	var logger = root.get_node("AILogger")
+	var saved = logger.get_levels()
+
+	# Test 1: 按分类设置级别
+	var invalid = logger.set_levels_from_spec("combat:off,net:warn")
+	var combat = AILogger.Category.COMBAT
+	var net = AILogger.Category.NET
+	if invalid.is_empty() \
+			and not logger.is_enabled(combat, AILogger.Level.ERROR) \
+			and logger.is_enabled(net, AILogger.Level.WARN) \
+			and not logger.is_enabled(net, AILogger.Level.DEBUG) \
+			and logger.is_enabled(AILogger.Category.EVENT, AILogger.Level.DEBUG):
+		print("✅ PASS: per-category levels from spec")
+		pass_count += 1
+	else:
+		print("❌ FAIL: levels after spec ", logger.get_levels())
+
+	# Test 2: "*" 作用于全部分类，后续条目覆盖
+	logger.set_levels_from_spec("*:warn,event:info")
+	var levels = logger.get_levels()
+	if levels.combat == "warn" and levels.mechanic == "warn" and levels.event == "info":
+		print("✅ PASS: wildcard applies to every category")
+		pass_count += 1
+	else:
+		print("❌ FAIL: wildcard levels ", levels)
+
+	# Test 3: 无法识别的条目被报告且不影响其它条目
+	invalid = logger.set_levels_from_spec("combat:loud,unknown:off,buff:off")
+	if invalid.size() == 2 and logger.get_levels().buff == "off" and logger.get_levels().combat == "warn":
+		print("✅ PASS: invalid entries are reported")
+		pass_count += 1
+	else:
+		print("❌ FAIL: invalid entries ", invalid)
+
+	for category in saved:
+		logger.set_level(category, saved[category])
+
+	print("=== AILoggerLevelsTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
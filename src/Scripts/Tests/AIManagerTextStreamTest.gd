@@ -103,6 +103,52 @@ func _run_tests():
 		print("✅ PASS: _handle_client_message handles error with natural text")
 		pass_count += 1
 
+	# Test 5: reset_game control message works after game over and reports an action_result
+	mock_peer.last_sent_text = ""
+	total_count += 1
+	ai_manager.is_game_over = true
+	# 上一个场景遗留的遗物与波次计数不应带入下一个场景
+	var game_manager = self.root.get_node("GameManager")
+	var wave_system = game_manager.wave_system_manager
+	game_manager.reward_manager.add_reward("raven_feather")
+	game_manager.get_stat_modifier("damage")
+	wave_system.enemies_to_spawn = 12
+	wave_system.defeated_enemies_count = 5
+	wave_system.wave_stats.enemies_defeated = 5
+	ai_manager._handle_client_message('{"type": "reset_game", "action_id": "reset-1"}')
+
+	if ai_manager.is_game_over:
+		print("❌ FAIL: reset_game did not clear is_game_over")
+	elif not game_manager.reward_manager.acquired_artifacts.is_empty() or game_manager._raven_feather_owned \
+			or not game_manager._stat_modifier_cache.is_empty():
+		print("❌ FAIL: reset_game kept artifacts: ", game_manager.reward_manager.acquired_artifacts)
+	elif wave_system.enemies_to_spawn != 0 or wave_system.defeated_enemies_count != 0 or wave_system.wave_stats.enemies_defeated != 0:
+		print("❌ FAIL: reset_game kept wave counters")
+	elif not '"action_result"' in mock_peer.last_sent_text or not '"reset-1"' in mock_peer.last_sent_text:
+		print("❌ FAIL: reset_game did not send action_result. Got: ", mock_peer.last_sent_text)
+	else:
+		print("✅ PASS: reset_game resets in place and reports action_result")
+		pass_count += 1
+
+	# Test 6: set_game_speed fast-forward raises time scale and physics ticks together
+	mock_peer.last_sent_text = ""
+	total_count += 1
+	var base_ticks = Engine.physics_ticks_per_second
+	ai_manager._handle_client_message('{"type": "set_game_speed", "time_scale": 4, "fast_forward": true, "action_id": "speed-1"}')
+	var ff_ticks = Engine.physics_ticks_per_second
+	var ff_scale = Engine.time_scale
+	ai_manager.set_game_speed(1.0, false)
+
+	if not is_equal_approx(ff_scale, 4.0) or ff_ticks != base_ticks * 4:
+		print("❌ FAIL: set_game_speed did not scale time and physics ticks. time_scale=%s ticks=%d" % [ff_scale, ff_ticks])
+	elif Engine.physics_ticks_per_second != base_ticks:
+		print("❌ FAIL: set_game_speed did not restore physics ticks")
+	elif not '"speed-1"' in mock_peer.last_sent_text:
+		print("❌ FAIL: set_game_speed did not send action_result. Got: ", mock_peer.last_sent_text)
+	else:
+		print("✅ PASS: set_game_speed fast-forward scales time and physics ticks")
+		pass_count += 1
+
 	print("\n=== AIManagerTextStreamTest Results ===")
 	print("Total: %d/%d passed" % [pass_count, total_count])
 
@@ -23,13 +23,14 @@ func _init():
 func _run_tests():
 	var tests = [
 		{"name": "ActionDispatcher exists", "fn": _test_exists},
-		{"name": "No AIActionExecutor wait logic", "fn": _test_no_execution_status}
+		{"name": "No AIActionExecutor wait logic", "fn": _test_no_execution_status},
+		{"name": "Action results reported with action_id", "fn": _test_action_result_reported}
 	]
 
 	var passed_count = 0
 	for test in tests:
 		print("Running test: ", test.name)
-		var result = test.fn.call()
+		var result = await test.fn.call()
 		if result:
 			print("✅ PASS: ", test.name)
 			passed_count += 1
@@ -48,3 +49,25 @@ func _test_exists() -> bool:
 func _test_no_execution_status() -> bool:
 	# ActionDispatcher should not have the stateful get_execution_status of AIActionExecutor
 	return not action_dispatcher.has_method("get_execution_status")
+
+func _test_action_result_reported() -> bool:
+	var ai_manager = root.get_node("AIManager")
+	var MockPeer = load("res://src/Scripts/Tests/AIManagerTextStreamTest.gd").MockWebSocketPeer
+	var mock_peer = MockPeer.new()
+	ai_manager.is_client_connected = true
+	ai_manager.websocket_peer = mock_peer
+
+	var results = await action_dispatcher._async_execute_actions([{"type": "no_such_action"}, 42], "req-1")
+
+	ai_manager.websocket_peer = null
+	ai_manager.is_client_connected = false
+
+	if results.size() != 2 or results[0].get("success", true) or results[0].get("type") != "no_such_action":
+		print("Unexpected results: ", results)
+		return false
+
+	var frame = JSON.parse_string(mock_peer.last_sent_text)
+	if not frame is Dictionary:
+		print("action_result frame is not JSON: ", mock_peer.last_sent_text)
+		return false
+	return frame.get("type") == "action_result" and frame.get("action_id") == "req-1" and frame.get("results", []).size() == 2
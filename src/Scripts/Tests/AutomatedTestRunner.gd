@@ -150,6 +150,9 @@ func _on_enemy_spawned(enemy):
 	_apply_debuffs_to_enemy(enemy)
 
 func _on_enemy_hit(enemy, source, amount):
+	# 群体敌人没有节点（enemy 为 null），不计入逐帧事件
+	if not is_instance_valid(enemy):
+		return
 	var source_id = "unknown"
 	if source:
 		# 安全类型检查：避免 Node 类为 null 时崩溃
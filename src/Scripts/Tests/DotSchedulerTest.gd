@@ -0,0 +1,88 @@
+extends SceneTree
+
+const DotSchedulerScript = preload("res://src/Scripts/Managers/DotScheduler.gd")
+const PoisonEffectScript = preload("res://src/Scripts/Effects/PoisonEffect.gd")
+
+class MockEnemy extends Node2D:
+	var type_key = "slime"
+	var hp: float = 10000.0
+	var is_dying: bool = false
+	var bleed_stacks: int = 0
+	var bleed_damage_per_stack: float = 3.0
+	var damage_calls: int = 0
+	var bleed_calls: int = 0
+
+	func take_damage(amount: float, _source = null, _damage_type: String = "physical"):
+		damage_calls += 1
+		hp -= amount
+
+	func take_bleed_damage(amount: float):
+		bleed_calls += 1
+		hp -= amount
+
+func _init():
+	print("=== Starting DotSchedulerTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 4
+
+	var scheduler = DotSchedulerScript.new()
+	root.add_child(scheduler)
+
+	var poisoned = MockEnemy.new()
+	root.add_child(poisoned)
+	var poison = PoisonEffectScript.new()
+	poisoned.add_child(poison)
+	poison.setup(poisoned, null, {"duration": 10.0, "damage": 10.0, "stacks": 3})
+	poisoned.bleed_stacks = 4
+	scheduler.track_poison(poison)
+	scheduler.track_bleed(poisoned)
+
+	var bleeding = MockEnemy.new()
+	root.add_child(bleeding)
+	bleeding.bleed_stacks = 2
+	scheduler.track_bleed(bleeding)
+
+	# Test 1: 中毒按 1 秒跳伤，两个批次只结算一次
+	var first = scheduler.process_batch(0.5)
+	var second = scheduler.process_batch(0.5)
+	if first.poison_damage == 0.0 and is_equal_approx(second.poison_damage, 30.0) and poisoned.damage_calls == 1:
+		print("✅ PASS: poison ticks once per second inside batches")
+		pass_count += 1
+	else:
+		print("❌ FAIL: poison damage %s / %s, calls %d" % [first.poison_damage, second.poison_damage, poisoned.damage_calls])
+
+	# Test 2: 流血每批每个敌人只结算一次，伤害按批次时长累计
+	var expected_bleed = (4 + 2) * 3.0 * 0.5
+	if poisoned.bleed_calls == 2 and bleeding.bleed_calls == 2 and is_equal_approx(second.bleed_damage, expected_bleed):
+		print("✅ PASS: bleed is aggregated once per enemy per batch")
+		pass_count += 1
+	else:
+		print("❌ FAIL: bleed calls %d/%d, damage %s" % [poisoned.bleed_calls, bleeding.bleed_calls, second.bleed_damage])
+
+	# Test 3: 汇总按敌人计数
+	if second.targets == 2 and second.poison_targets == 1 and second.bleed_targets == 2:
+		print("✅ PASS: batch summary counts targets")
+		pass_count += 1
+	else:
+		print("❌ FAIL: unexpected summary ", second)
+
+	# Test 4: 层数清零或节点释放后不再跟踪
+	bleeding.bleed_stacks = 0
+	poison.queue_free()
+	scheduler.process_batch(0.5)
+	var third = scheduler.process_batch(0.5)
+	if third.targets == 1 and third.poison_damage == 0.0 and bleeding.bleed_calls == 2:
+		print("✅ PASS: expired effects leave the scheduler")
+		pass_count += 1
+	else:
+		print("❌ FAIL: stale effects still ticking ", third)
+
+	scheduler.queue_free()
+	poisoned.queue_free()
+	bleeding.queue_free()
+
+	print("=== DotSchedulerTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
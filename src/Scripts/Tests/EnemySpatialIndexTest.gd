@@ -0,0 +1,64 @@
+extends SceneTree
+
+const EnemySpatialIndex = preload("res://src/Scripts/Components/EnemySpatialIndex.gd")
+
+func _init():
+	print("=== Starting EnemySpatialIndexTest ===")
+	call_deferred("_run_tests")
+
+func _make_enemy(pos: Vector2) -> Node2D:
+	var enemy = Node2D.new()
+	root.add_child(enemy)
+	enemy.global_position = pos
+	return enemy
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 4
+
+	var index = EnemySpatialIndex.new(60.0)
+	var near = _make_enemy(Vector2(10, 10))
+	var far = _make_enemy(Vector2(1000, 1000))
+	var edge = _make_enemy(Vector2(-95, 0))
+	for enemy in [near, far, edge]:
+		index.insert(enemy)
+
+	# Test 1: 候选集合包含范围内的敌人，不包含远处的敌人
+	var found = index.query(Vector2.ZERO, 100.0)
+	if near in found and edge in found and not far in found:
+		print("✅ PASS: query returns nearby enemies only")
+		pass_count += 1
+	else:
+		print("❌ FAIL: query returned ", found.size(), " enemies")
+
+	# Test 2: 移动后 refresh 重新归格
+	far.global_position = Vector2(20, -20)
+	index.refresh()
+	if far in index.query(Vector2.ZERO, 50.0):
+		print("✅ PASS: refresh moves enemies to their new cell")
+		pass_count += 1
+	else:
+		print("❌ FAIL: moved enemy not found after refresh")
+
+	# Test 3: 大范围查询走非空格子遍历，结果与全量一致
+	if index.query(Vector2.ZERO, 5000.0).size() == 3:
+		print("✅ PASS: wide query returns every enemy")
+		pass_count += 1
+	else:
+		print("❌ FAIL: wide query missed enemies")
+
+	# Test 4: 移除与失效节点清理
+	index.remove(edge)
+	near.free()
+	index.refresh()
+	if index.size() == 1 and index.query(Vector2.ZERO, 100.0) == [far]:
+		print("✅ PASS: removed and freed enemies leave the index")
+		pass_count += 1
+	else:
+		print("❌ FAIL: index size after removal: ", index.size())
+
+	far.free()
+	edge.free()
+
+	print("=== EnemySpatialIndexTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
@@ -0,0 +1,78 @@
+extends SceneTree
+
+const FlowField = preload("res://src/Scripts/Components/FlowField.gd")
+
+func _init():
+	print("=== Starting FlowFieldTest ===")
+	call_deferred("_run_tests")
+
+func _make_grid() -> AStarGrid2D:
+	var grid = AStarGrid2D.new()
+	grid.region = Rect2i(-4, -4, 9, 9)
+	grid.cell_size = Vector2(60, 60)
+	grid.diagonal_mode = AStarGrid2D.DIAGONAL_MODE_NEVER
+	grid.default_compute_heuristic = AStarGrid2D.HEURISTIC_MANHATTAN
+	grid.default_estimate_heuristic = AStarGrid2D.HEURISTIC_MANHATTAN
+	grid.update()
+	return grid
+
+func _path_cost(grid: AStarGrid2D, path: Array) -> float:
+	var cost = 0.0
+	for i in range(1, path.size()):
+		cost += grid.get_point_weight_scale(path[i])
+	return cost
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 4
+
+	var grid = _make_grid()
+	grid.set_point_solid(Vector2i(1, 0), true)
+	grid.set_point_solid(Vector2i(1, 1), true)
+	grid.set_point_weight_scale(Vector2i(-1, 0), 5.0)
+	var field = FlowField.new(grid, Vector2i.ZERO)
+
+	# Test 1: 每个格子的流场代价与 AStarGrid2D 最短路径代价一致
+	var mismatches = []
+	for y in range(-4, 5):
+		for x in range(-4, 5):
+			var cell = Vector2i(x, y)
+			if grid.is_point_solid(cell):
+				continue
+			var expected = _path_cost(grid, grid.get_id_path(cell, Vector2i.ZERO))
+			if not is_equal_approx(field.cost_at(cell), expected):
+				mismatches.append(cell)
+	if mismatches.is_empty():
+		print("✅ PASS: flow field costs match AStarGrid2D")
+		pass_count += 1
+	else:
+		print("❌ FAIL: flow field cost differs on cells ", mismatches)
+
+	# Test 2: 路径格式与 get_point_path 相同（含起终点，点坐标）
+	var path = field.get_point_path(Vector2i(4, 4))
+	if path.size() == 9 and path[0] == Vector2(240, 240) and path[path.size() - 1] == Vector2.ZERO:
+		print("✅ PASS: point path runs from start to target")
+		pass_count += 1
+	else:
+		print("❌ FAIL: unexpected point path ", path)
+
+	# Test 3: 被完全围住的格子不可达，返回空路径
+	for offset in [Vector2i(-3, -4), Vector2i(-4, -3)]:
+		grid.set_point_solid(offset, true)
+	field.build()
+	if not field.is_reachable(Vector2i(-4, -4)) and field.get_point_path(Vector2i(-4, -4)).is_empty():
+		print("✅ PASS: enclosed cell is unreachable")
+		pass_count += 1
+	else:
+		print("❌ FAIL: enclosed cell still has a path")
+
+	# Test 4: next_step 指向代价更低的相邻格，目标格指向自身
+	var step = field.next_step(Vector2i(0, 3))
+	if step == Vector2i(0, 2) and field.next_step(Vector2i.ZERO) == Vector2i.ZERO:
+		print("✅ PASS: next_step walks toward the target")
+		pass_count += 1
+	else:
+		print("❌ FAIL: next_step returned ", step)
+
+	print("=== FlowFieldTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
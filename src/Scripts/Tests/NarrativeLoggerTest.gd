@@ -47,8 +47,22 @@ func _run_tests():
 			quit(1)
 			return
 
+		# Test structured event frame sent alongside the narrative when subscribed
+		ai_manager.structured_events_enabled = true
+		narrative_logger._on_unit_sold("grid", Vector2i(1, 2), 3)
+		ai_manager.structured_events_enabled = false
+
+		var frame = JSON.parse_string(mock_peer.last_sent_text)
+		if frame is Dictionary and frame.get("type") == "event" and frame.get("event_type") == "UnitSold" \
+				and frame.get("data", {}).get("pos", {}).get("x") == 1 and frame.get("data", {}).get("gold_refund") == 3:
+			print("✅ PASS: NarrativeLogger broadcasts structured event frame")
+		else:
+			print("❌ FAIL: NarrativeLogger did not broadcast valid event frame. Got: ", mock_peer.last_sent_text)
+			quit(1)
+			return
+
 		print("\n=== NarrativeLoggerTest Results ===")
-		print("Total: 1/1 passed")
+		print("Total: 2/2 passed")
 		quit(0)
 	else:
 		print("❌ FAIL: AIManager not found, cannot test NarrativeLogger integration")
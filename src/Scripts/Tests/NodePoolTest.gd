@@ -0,0 +1,91 @@
+extends SceneTree
+
+const NodePoolScript = preload("res://src/Scripts/Components/NodePool.gd")
+const LIGHTNING_SCENE = preload("res://src/Scenes/Game/LightningArc.tscn")
+const FLOATING_TEXT_SCENE = preload("res://src/Scenes/UI/FloatingText.tscn")
+
+func _init():
+	print("=== Starting NodePoolTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 5
+
+	var pool = NodePoolScript.new(LIGHTNING_SCENE, 2)
+
+	# Test 1: 预热不超过容量上限
+	pool.warm_up(5)
+	if pool.free_count() == 2 and pool.stats.created == 2:
+		print("✅ PASS: warm_up respects capacity")
+		pass_count += 1
+	else:
+		print("❌ FAIL: warm_up produced %d free nodes" % pool.free_count())
+
+	# Test 2: 归还的节点在帧末移出场景树、重置后被复用
+	var arc = pool.acquire()
+	root.add_child(arc)
+	arc.setup(Vector2.ZERO, Vector2(100, 0))
+	arc.modulate.a = 0.3
+	pool.release(arc)
+	pool.release(arc) # 重复归还应被忽略
+	await process_frame
+	var stats = pool.get_stats()
+	if arc.get_parent() == null and is_equal_approx(arc.modulate.a, 1.0) and stats.released == 1 and stats.free == 2:
+		print("✅ PASS: released node is detached, reset and returned once")
+		pass_count += 1
+	else:
+		print("❌ FAIL: release stats ", stats)
+
+	# Test 3: 空闲节点（含待回收的）达到上限后，再归还的节点直接释放
+	var a = pool.acquire()
+	var b = pool.acquire()
+	var c = pool.acquire()
+	for node in [a, b, c]:
+		root.add_child(node)
+	pool.release(a)
+	pool.release(b)
+	pool.release(c)
+	await process_frame
+	stats = pool.get_stats()
+	if stats.reused == 3 and stats.free == 2 and stats.dropped == 1 and not is_instance_valid(c):
+		print("✅ PASS: nodes beyond capacity are freed")
+		pass_count += 1
+	else:
+		print("❌ FAIL: capacity stats ", stats)
+
+	# Test 4: 非池化节点经 release_node 直接释放
+	var loose = LIGHTNING_SCENE.instantiate()
+	root.add_child(loose)
+	NodePoolScript.release_node(loose)
+	await process_frame
+	if not is_instance_valid(loose):
+		print("✅ PASS: release_node frees nodes that do not belong to a pool")
+		pass_count += 1
+	else:
+		print("❌ FAIL: unpooled node still alive")
+
+	# Test 5: 金币飘字回收后复用为伤害数字，恢复默认的物理与淡出参数
+	var text_pool = NodePoolScript.new(FLOATING_TEXT_SCENE, 1)
+	var text = text_pool.acquire()
+	root.add_child(text)
+	text.setup("+5G", Color.GOLD)
+	text_pool.release(text)
+	await process_frame
+	var reused = text_pool.acquire()
+	root.add_child(reused)
+	reused.setup("12", Color.WHITE)
+	if reused == text and is_equal_approx(reused.fade_speed, 3.0) and reused.mode == "float" \
+			and reused.gravity == 0.0 and reused.floor_y == 0.0:
+		print("✅ PASS: reused floating text drops resource-mode settings")
+		pass_count += 1
+	else:
+		print("❌ FAIL: reused text fade_speed %.1f, mode %s" % [reused.fade_speed, reused.mode])
+	text_pool.release(reused)
+	await process_frame
+	text_pool.clear()
+
+	pool.clear()
+
+	print("=== NodePoolTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
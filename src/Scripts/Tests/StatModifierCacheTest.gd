@@ -0,0 +1,54 @@
+extends SceneTree
+
+func _init():
+	print("=== Starting StatModifierCacheTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 3
+
+	var gm = root.get_node("GameManager")
+	var session = gm.session_data
+	var saved_hp = session.core_health
+	session.core_health = session.max_core_health
+
+	# Test 1: 无遗物时结果被缓存
+	var first = gm.get_stat_modifier("damage")
+	if is_equal_approx(first, 1.0) and gm._stat_modifier_cache.has("damage"):
+		print("✅ PASS: damage modifier is cached")
+		pass_count += 1
+	else:
+		print("❌ FAIL: damage modifier %s, cache %s" % [first, gm._stat_modifier_cache])
+
+	# Test 2: 获得渡鸦之羽后，缓存随核心血量比例失效
+	gm.reward_manager.add_reward("raven_feather")
+	session.core_health = session.max_core_health * 0.5
+	var raven = gm.get_stat_modifier("damage")
+	session.core_health = session.max_core_health * 0.25
+	var raven_low = gm.get_stat_modifier("damage")
+	if is_equal_approx(raven, 1.5) and is_equal_approx(raven_low, 1.75):
+		print("✅ PASS: raven_feather follows core HP")
+		pass_count += 1
+	else:
+		print("❌ FAIL: raven_feather modifiers %s / %s" % [raven, raven_low])
+
+	# Test 3: 狂战号角只在跨过 20% 阈值时刷新
+	gm.reward_manager.add_reward("berserker_horn")
+	var above = gm.get_stat_modifier("attack_interval")
+	session.core_health = session.max_core_health * 0.1
+	var below = gm.get_stat_modifier("attack_interval")
+	session.core_health = session.max_core_health * 0.15
+	var still_cached = gm._stat_modifier_cache.has("attack_interval")
+	session.core_health = session.max_core_health * 0.5
+	var recovered = gm.get_stat_modifier("attack_interval")
+	if is_equal_approx(above, 1.0) and is_equal_approx(below, 0.5) and still_cached and is_equal_approx(recovered, 1.0):
+		print("✅ PASS: berserker_horn invalidates only on threshold crossings")
+		pass_count += 1
+	else:
+		print("❌ FAIL: berserker_horn modifiers %s / %s / %s, cached %s" % [above, below, recovered, still_cached])
+
+	session.core_health = saved_hp
+
+	print("=== StatModifierCacheTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
@@ -0,0 +1,69 @@
+extends SceneTree
+
+const StateBlockWriterScript = preload("res://src/Scripts/Components/StateBlockWriter.gd")
+const STATE_PATH = "user://state_block_test.state"
+
+func _init():
+	print("=== Starting StateBlockWriterTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 3
+
+	var game_manager = root.get_node("GameManager")
+	var session = game_manager.session_data
+	var saved_gold = session.gold
+	var saved_shop = session.shop_units.duplicate()
+	session.gold = 321
+	session.shop_units[1] = "wolf"
+
+	# 网关预先创建的定长文件
+	var pre = FileAccess.open(STATE_PATH, FileAccess.WRITE)
+	var zeros = PackedByteArray()
+	zeros.resize(StateBlockWriterScript.SIZE)
+	pre.store_buffer(zeros)
+	pre.close()
+
+	var writer = StateBlockWriterScript.new()
+	var opened = writer.open(STATE_PATH)
+	writer.write_frame()
+	var data = FileAccess.get_file_as_bytes(STATE_PATH)
+
+	# Test 1: 按固定布局写入，且不改变文件长度
+	if opened and data.size() == StateBlockWriterScript.SIZE \
+			and data.decode_u32(0) == StateBlockWriterScript.MAGIC \
+			and data.decode_s32(StateBlockWriterScript.OFFSET_GOLD) == 321 \
+			and is_equal_approx(data.decode_float(StateBlockWriterScript.OFFSET_CORE_HP), game_manager.core_health):
+		print("✅ PASS: header and scalars follow the fixed layout")
+		pass_count += 1
+	else:
+		print("❌ FAIL: unexpected block of %d bytes" % data.size())
+
+	# Test 2: 商店单位编号可通过旁路文件的 unit_keys 还原
+	var sidecar = JSON.parse_string(FileAccess.get_file_as_string(STATE_PATH + ".json"))
+	var shop_id = data.decode_u16(StateBlockWriterScript.OFFSET_SHOP + 2)
+	if sidecar is Dictionary and shop_id > 0 and sidecar.unit_keys[shop_id - 1] == "wolf":
+		print("✅ PASS: shop slots encode unit ids from the sidecar table")
+		pass_count += 1
+	else:
+		print("❌ FAIL: shop id %d, sidecar %s" % [shop_id, sidecar])
+
+	# Test 3: 每帧写完后 seq 为偶数且递增
+	var first_seq = data.decode_u32(StateBlockWriterScript.OFFSET_SEQ)
+	writer.write_frame()
+	var second_seq = FileAccess.get_file_as_bytes(STATE_PATH).decode_u32(StateBlockWriterScript.OFFSET_SEQ)
+	if first_seq == 2 and second_seq == 4:
+		print("✅ PASS: sequence counter is even between frames")
+		pass_count += 1
+	else:
+		print("❌ FAIL: seq %d -> %d" % [first_seq, second_seq])
+
+	writer.close()
+	session.gold = saved_gold
+	session.shop_units = saved_shop
+	DirAccess.remove_absolute(ProjectSettings.globalize_path(STATE_PATH))
+	DirAccess.remove_absolute(ProjectSettings.globalize_path(STATE_PATH + ".json"))
+
+	print("=== StateBlockWriterTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
@@ -0,0 +1,123 @@
+extends SceneTree
+
+const SwarmManagerScript = preload("res://src/Scripts/Managers/SwarmManager.gd")
+
+func _init():
+	print("=== Starting SwarmManagerTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 8
+
+	var gm = root.get_node("GameManager")
+	var was_active = gm.session_data.is_wave_active
+	gm.session_data.is_wave_active = true
+
+	var swarm = SwarmManagerScript.new()
+	root.add_child(swarm)
+	var deaths = []
+	swarm.swarm_enemy_died.connect(func(type_key, _pos): deaths.append(type_key))
+
+	# 远离核心，避免测试期间触发核心攻击
+	for i in range(3000):
+		swarm.spawn("slime", Vector2(2000 + (i % 50) * 4, 2000 + (i / 50) * 4), 1)
+
+	# Test 1: 属性与 Enemy.setup 公式一致
+	var expected_hp = (100 + 80) * Constants.ENEMY_VARIANTS["slime"].hpMod
+	if swarm.size() == 3000 and is_equal_approx(swarm.hp[0], expected_hp) and swarm.hp.size() == swarm.type_ids.size():
+		print("✅ PASS: spawned 3000 swarm enemies with Enemy.setup stats")
+		pass_count += 1
+	else:
+		print("❌ FAIL: swarm size %d, hp %s" % [swarm.size(), swarm.hp[0] if swarm.size() > 0 else 0])
+
+	# Test 2: 一次模拟步内全部敌人朝核心移动，且单步耗时可接受
+	var before = swarm.positions[0]
+	var start = Time.get_ticks_usec()
+	swarm.step(1.0 / 60.0)
+	var elapsed_ms = (Time.get_ticks_usec() - start) / 1000.0
+	if swarm.positions[0].length() < before.length():
+		print("✅ PASS: swarm moves toward the core (step took %.2f ms)" % elapsed_ms)
+		pass_count += 1
+	else:
+		print("❌ FAIL: swarm did not move toward the core")
+
+	# Test 3: 范围伤害只命中范围内的敌人，死亡在下一步结算并从数组中移除
+	var center = swarm.positions[0]
+	var hit = swarm.damage_in_radius(center, 10.0, 99999.0)
+	swarm.step(0.0)
+	if hit > 0 and swarm.size() == 3000 - hit and deaths.size() == hit:
+		print("✅ PASS: area damage kills %d enemies and compacts arrays" % hit)
+		pass_count += 1
+	else:
+		print("❌ FAIL: hit %d, size %d, deaths %d" % [hit, swarm.size(), deaths.size()])
+
+	# Test 4: 流血层数按秒造成持续伤害
+	var hp_before = swarm.hp[0]
+	swarm.apply_debuff(0, "bleed", 10)
+	swarm.step(1.0)
+	var bleed_loss = hp_before - swarm.hp[0]
+	if is_equal_approx(bleed_loss, 10 * SwarmManagerScript.BLEED_DAMAGE_PER_STACK):
+		print("✅ PASS: bleed stacks tick damage")
+		pass_count += 1
+	else:
+		print("❌ FAIL: bleed dealt %.2f damage" % bleed_loss)
+
+	# Test 5: 命中效果写入中毒列，并像节点敌人一样发出 damage_dealt
+	var dealt = []
+	var on_dealt = func(_unit, amount): dealt.append(amount)
+	gm.damage_dealt.connect(on_dealt)
+	var source = Node2D.new()
+	swarm.hit(1, 5.0, source, {"poison": 5.0})
+	gm.damage_dealt.disconnect(on_dealt)
+	source.free()
+	if swarm.poison_stacks[1] == 1.0 and is_equal_approx(swarm.poison_time[1], SwarmManagerScript.POISON_DURATION) and dealt == [5.0]:
+		print("✅ PASS: hit applies on-hit poison and emits damage_dealt")
+		pass_count += 1
+	else:
+		print("❌ FAIL: poison stacks %.0f, damage_dealt %s" % [swarm.poison_stacks[1], dealt])
+
+	# Test 6: find_nearest_many 按距离升序返回
+	var origin = Vector2(2100, 2100)
+	var nearest = swarm.find_nearest_many(origin, 3)
+	var ordered = nearest.size() == 3
+	for k in range(1, nearest.size()):
+		if swarm.positions[nearest[k - 1]].distance_to(origin) > swarm.positions[nearest[k]].distance_to(origin):
+			ordered = false
+	if ordered:
+		print("✅ PASS: find_nearest_many returns the closest enemies in order")
+		pass_count += 1
+	else:
+		print("❌ FAIL: find_nearest_many returned %s" % nearest)
+
+	# Test 7: 变异史莱姆死亡后分裂为两个半血子代
+	swarm.clear()
+	deaths.clear()
+	swarm.spawn("mutant_slime", Vector2(2000, 2000), 1)
+	var parent_hp = swarm.max_hp[0]
+	swarm.damage(0, parent_hp)
+	swarm.step(0.0)
+	if swarm.size() == 2 and swarm.generations[0] == 1 and is_equal_approx(swarm.max_hp[0], parent_hp / 2.0):
+		print("✅ PASS: mutant slime splits into two half-hp children")
+		pass_count += 1
+	else:
+		print("❌ FAIL: mutant slime split produced %d children" % swarm.size())
+
+	swarm.queue_free()
+
+	# Test 8: GameManager.reset_game 清空波次系统持有的群体敌人
+	var game_swarm = gm.swarm_manager
+	gm.wave_system_manager._swarm_wave = true
+	for i in range(10):
+		game_swarm.spawn("slime", Vector2(2000 + i * 4, 2000), 1)
+	gm.reset_game()
+	if game_swarm.size() == 0 and not gm.wave_system_manager._swarm_wave:
+		print("✅ PASS: reset_game clears the swarm")
+		pass_count += 1
+	else:
+		print("❌ FAIL: %d swarm enemies survived reset_game" % game_swarm.size())
+
+	gm.session_data.is_wave_active = was_active
+
+	print("=== SwarmManagerTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
@@ -12,6 +12,7 @@ func _ready() -> void:
 	passed_all = passed_all and test_mixed_modifiers()
 	passed_all = passed_all and test_hp_logic()
 	passed_all = passed_all and test_floating_point_precision()
+	passed_all = passed_all and test_cached_stat_invalidation()
 
 	if passed_all:
 		print("All UnitStats tests passed! 100% green.")
@@ -165,3 +166,35 @@ func test_floating_point_precision() -> bool:
 
 	print("Passed test_floating_point_precision")
 	return true
+
+func test_cached_stat_invalidation() -> bool:
+	var stats = UnitStatsClass.new()
+	stats.set_base_stat("damage", 10.0)
+
+	# 首次读取后结果被缓存，修正器增删、到期与基础值变化都应使缓存失效
+	stats.get_stat("damage")
+	var mod = StatModifierClass.new(StatModifierClass.Type.PERCENT, 1.0, 1.0, "cache_buff")
+	stats.add_modifier("damage", mod)
+	if not is_equal_approx(stats.get_stat("damage"), 20.0):
+		print("Failed test_cached_stat_invalidation: add_modifier did not invalidate cache")
+		return false
+
+	stats._process(1.5)
+	if not is_equal_approx(stats.get_stat("damage"), 10.0):
+		print("Failed test_cached_stat_invalidation: expired modifier still cached")
+		return false
+
+	stats.add_modifier("damage", StatModifierClass.new(StatModifierClass.Type.FLAT, 5.0, 0.0, "cache_flat"))
+	stats.get_stat("damage")
+	stats.remove_modifier("damage", "cache_flat")
+	if not is_equal_approx(stats.get_stat("damage"), 10.0):
+		print("Failed test_cached_stat_invalidation: remove_modifier did not invalidate cache")
+		return false
+
+	stats.set_base_stat("damage", 12.0)
+	if not is_equal_approx(stats.get_stat("damage"), 12.0):
+		print("Failed test_cached_stat_invalidation: set_base_stat did not invalidate cache")
+		return false
+
+	print("Passed test_cached_stat_invalidation")
+	return true
@@ -0,0 +1,70 @@
+extends SceneTree
+
+# 校验 data/wave_tables.json 与当前配置一致，且查表结果与实时计算公式相同
+const WaveSystemManagerScript = preload("res://src/Scripts/Managers/WaveSystemManager.gd")
+
+func _init():
+	print("=== Starting WaveTablesTest ===")
+	call_deferred("_run_tests")
+
+func _run_tests():
+	var pass_count = 0
+	var total_count = 3
+
+	var wsm = WaveSystemManagerScript.new()
+	wsm._load_wave_config()
+	wsm._load_wave_tables()
+
+	# Test 1: 预计算表存在且未过期
+	if wsm.wave_tables.is_empty():
+		print("❌ FAIL: wave_tables.json missing or stale, run: python ai_client/wave_tables.py export")
+	else:
+		print("✅ PASS: wave tables loaded (%d waves)" % wsm.wave_tables.size())
+		pass_count += 1
+
+	# Test 2: 查表与实时计算一致
+	var tables = wsm.wave_tables
+	var mismatches = []
+	for key in tables:
+		var wave = int(key)
+		var from_table = wsm.calculate_wave_difficulty(wave)
+		var wave_type = wsm.get_wave_type(wave)
+		wsm.wave_tables = {}
+		var computed = wsm.calculate_wave_difficulty(wave)
+		var computed_type = wsm.get_wave_type(wave)
+		wsm.wave_tables = tables
+		if abs(from_table - computed) > 0.001 * max(1.0, computed) or wave_type != computed_type:
+			mismatches.append(wave)
+	if tables.is_empty() or not mismatches.is_empty():
+		print("❌ FAIL: table lookup differs from runtime formula on waves ", mismatches)
+	else:
+		print("✅ PASS: table lookup matches runtime formula")
+		pass_count += 1
+
+	# Test 3: 敌人属性表与 Enemy.setup 公式一致
+	var file = FileAccess.open(WaveSystemManagerScript.WAVE_TABLES_PATH, FileAccess.READ)
+	var data = JSON.parse_string(file.get_as_text()) if file else null
+	var variants = self.root.get_node("Constants").ENEMY_VARIANTS if self.root.has_node("Constants") else {}
+	var stat_ok = data is Dictionary and not variants.is_empty()
+	if stat_ok:
+		for type_key in data.enemy_types:
+			if not variants.has(type_key):
+				continue
+			var hp_row = data.hp[type_key]
+			var speed_row = data.speed[type_key]
+			for i in range(hp_row.size()):
+				var wave = i + 1
+				var hp = (100 + wave * 80) * variants[type_key].hpMod
+				var speed = (40 + wave * 2) * variants[type_key].spdMod
+				if abs(hp_row[i] - hp) > 0.01 or abs(speed_row[i] - speed) > 0.01:
+					stat_ok = false
+	if stat_ok:
+		print("✅ PASS: enemy stat tables match Enemy.setup")
+		pass_count += 1
+	else:
+		print("❌ FAIL: enemy stat tables differ from Enemy.setup")
+
+	wsm.free()
+
+	print("=== WaveTablesTest: %d/%d passed ===" % [pass_count, total_count])
+	quit(0 if pass_count == total_count else 1)
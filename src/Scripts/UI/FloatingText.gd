@@ -1,5 +1,7 @@
 extends Node2D
 
+const NodePool = preload("res://src/Scripts/Components/NodePool.gd")
+
 @onready var label = $Label
 
 # 物理属性
@@ -14,6 +16,8 @@ var is_crit_hit: bool = false
 var shake_amount: float = 2.0
 var fade_speed: float = 3.0 # 默认淡出速度
 
+var _tweens: Array = []
+
 func setup(value_str: String, color: Color, is_crit: bool = false, value_num: float = 0.0, direction: Vector2 = Vector2.ZERO):
 	label.text = value_str
 	label.modulate = color
@@ -92,6 +96,7 @@ func setup(value_str: String, color: Color, is_crit: bool = false, value_num: fl
 	scale = Vector2(0.1, 0.1)
 
 	var tween = create_tween()
+	_tweens.append(tween)
 	# 阶段1: 弹出
 	tween.tween_property(self, "scale", Vector2(base_scale * 1.2, base_scale * 1.2), 0.05)\
 		.set_trans(Tween.TRANS_CUBIC).set_ease(Tween.EASE_OUT)
@@ -103,6 +108,7 @@ func setup(value_str: String, color: Color, is_crit: bool = false, value_num: fl
 	if not is_resource:
 		label.modulate = Color(2.0, 2.0, 2.0)
 		var color_tween = create_tween()
+		_tweens.append(color_tween)
 		color_tween.tween_property(label, "modulate", color, 0.15)
 
 func _process(delta):
@@ -147,4 +153,21 @@ func _process(delta):
 	if start_fade:
 		modulate.a -= delta * fade_speed
 		if modulate.a <= 0:
-			queue_free()
+			NodePool.release_node(self)
+
+func reset_for_pool():
+	"""由 NodePool 回收时调用"""
+	for tween in _tweens:
+		if tween.is_valid():
+			tween.kill()
+	_tweens.clear()
+	# setup 只在部分分支里改写物理与淡出参数，这里恢复为声明处的默认值
+	velocity = Vector2.ZERO
+	gravity = 0.0
+	friction = 0.0
+	floor_y = 0.0
+	mode = "impact"
+	is_crit_hit = false
+	fade_speed = 3.0
+	modulate = Color.WHITE
+	scale = Vector2.ONE
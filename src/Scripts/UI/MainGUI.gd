@@ -25,6 +25,11 @@ signal sacrifice_requested
 
 const FLOATING_TEXT_SCENE = preload("res://src/Scenes/UI/FloatingText.tscn")
 const TOOLTIP_SCENE = preload("res://src/Scenes/UI/Tooltip.tscn")
+const NodePool = preload("res://src/Scripts/Components/NodePool.gd")
+
+# 飘字对象池：空闲上限与开局预热数量
+const FLOATING_TEXT_POOL_SIZE = 128
+const FLOATING_TEXT_WARM_UP = 32
 
 var damage_stats = {} # unit_id -> {name, icon, amount, node}
 var last_sort_time: float = 0.0
@@ -32,6 +37,7 @@ var tooltip_instance = null
 var sort_interval: float = 1.0
 var sidebar_tween: Tween
 var shop_node: Control = null
+var ftext_pool = NodePool.new(FLOATING_TEXT_SCENE, FLOATING_TEXT_POOL_SIZE)
 
 # New Combat Gold Label
 var combat_gold_label: Label
@@ -74,6 +80,8 @@ func _ready():
 	GameManager.damage_dealt.connect(_on_damage_dealt)
 	GameManager.skill_activated.connect(_on_skill_activated)
 	GameManager.ftext_spawn_requested.connect(_on_ftext_spawn_requested)
+	if not GameManager.skip_visuals:
+		ftext_pool.warm_up(FLOATING_TEXT_WARM_UP)
 
 	# Connect risk-reward warning signal
 	GameManager.risk_reward_warning_changed.connect(_on_risk_reward_warning_changed)
@@ -454,8 +462,11 @@ func _get_amount_from_row(row):
 func _on_skill_activated(unit):
 	if cutin_manager: cutin_manager.trigger_cutin(unit)
 
+func _exit_tree():
+	ftext_pool.clear()
+
 func _on_ftext_spawn_requested(pos, value, color, direction):
-	var ftext = FLOATING_TEXT_SCENE.instantiate()
+	var ftext = ftext_pool.acquire()
 	var offset = Vector2(randf_range(-10, 10), randf_range(-10, 10))
 	var world_pos = pos + offset
 	var screen_pos = get_viewport().canvas_transform * world_pos
@@ -380,14 +380,43 @@ func _process(delta):
 		combat.process_tick(delta)
 
 	if !behavior.on_combat_tick(delta) and combat and unit_data.has("attackType") and unit_data.attackType != "none":
-		var enemies = get_tree().get_nodes_in_group("enemies")
-		combat.process_combat(delta, global_position, enemies, GameManager.mana)
+		# 冷却中不会索敌，无需查询候选敌人
+		var enemies = GameManager.get_enemies_near(global_position, combat.stats.get("range_val", 0.0)) if combat.cooldown <= 0 else []
+		var result = combat.process_combat(delta, global_position, enemies, GameManager.mana)
+		if result.action == "none" and combat.cooldown <= 0 and not combat.is_no_mana:
+			_strike_swarm()
 
 	if combat and combat.is_no_mana and unit_data.has("skill"):
 		modulate = Color(0.7, 0.7, 1.0, 1.0)
 	else:
 		modulate = Color.WHITE
 
+func _strike_swarm():
+	"""没有常规敌人可打时攻击最近的群体敌人：群体敌人没有节点，直接结算伤害，不生成投射物
+
+	伤害加成、暴击与命中效果和 CombatManager 生成投射物时一致
+	"""
+	var swarm = GameManager.swarm_manager
+	if not swarm or swarm.size() == 0:
+		return
+	var index = swarm.find_nearest(global_position, combat.stats.get("range_val", 0.0))
+	if index < 0:
+		return
+
+	var is_critical = randf() < crit_rate
+	if guaranteed_crit_stacks > 0:
+		is_critical = true
+		guaranteed_crit_stacks -= 1
+	var amount = damage * GameManager.get_stat_modifier("damage")
+	if is_critical:
+		amount *= crit_dmg
+	var effects = GameManager.combat_manager.get_on_hit_effects(self, unit_data) if GameManager.combat_manager else {}
+	swarm.hit(index, amount, self, effects)
+
+	combat.cooldown = combat.stats.get("atk_speed", 1.0) * combat.stats.get("attack_interval_modifier", 1.0)
+	if attack_cost_mana > 0:
+		GameManager.consume_resource("mana", attack_cost_mana)
+
 func _on_combat_attack_performed(target):
 	if unit_data.attackType == "melee":
 		_do_melee_attack(target)
@@ -410,7 +439,7 @@ func _do_melee_attack(target):
 		_spawn_melee_projectiles(target)
 		attack_performed.emit(target)
 		# 记录近战攻击日志
-		if AILogger:
+		if AILogger and AILogger.is_enabled(AILogger.Category.COMBAT, AILogger.Level.DEBUG):
 			var target_name = target.type_key if target and "type_key" in target else "目标"
 			var damage = unit_data.get("damage", 0)
 			var wave_info = GameManager.session_data.wave if GameManager.session_data else 1
@@ -518,7 +547,7 @@ func _do_standard_ranged_attack(target):
 	attack_performed.emit(target)
 
 	# 记录单位攻击日志（包含波次信息）
-	if AILogger:
+	if AILogger and AILogger.is_enabled(AILogger.Category.COMBAT, AILogger.Level.DEBUG):
 		var target_name = target.type_key if target and "type_key" in target else "目标"
 		var damage = unit_data.get("damage", 0)
 		var wave_info = GameManager.session_data.wave if GameManager.session_data else 1
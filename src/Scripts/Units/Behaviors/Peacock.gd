@@ -104,7 +104,7 @@ func _do_bow_attack(target):
 		print("[PEACOCK DEBUG] 单位等级不足2级，无法施加易伤debuff")
 
 	# 记录攻击日志
-	if AILogger:
+	if AILogger and AILogger.is_enabled(AILogger.Category.COMBAT, AILogger.Level.DEBUG):
 		var target_name = target.name if "name" in target else "敌人"
 		var damage = unit.unit_data.get("damage", 0)
 		var wave_info = GameManager.session_data.wave if GameManager.session_data else 1
@@ -86,11 +86,7 @@ func _spawn_lightning_on_enemy(enemy: Node2D) -> float:
 			dmg *= unit.crit_dmg
 
 		# 创建闪电弧效果
-		var lightning_scene = load("res://src/Scenes/Game/LightningArc.tscn")
-		if lightning_scene:
-			var arc = lightning_scene.instantiate()
-			unit.get_parent().add_child(arc)
-			arc.setup(start_pos, enemy.global_position)
+		GameManager.combat_manager.spawn_lightning_arc(start_pos, enemy.global_position, unit.get_parent())
 
 		# 造成伤害
 		enemy.take_damage(dmg, unit, "lightning")